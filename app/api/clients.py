@@ -1,88 +1,298 @@
+from datetime import date, datetime
 from decimal import Decimal
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
-from app.services.person_service import delete_person
+from app.core.database import AsyncSessionLocal
+from app.core.etag import etag_matches, not_modified
+from app.api.transactions import transaction_filters
+from app.schemas.batch import BatchMode, BatchOperation, BatchResult
+from app.schemas.client_import import ClientImportResult
+from app.schemas.payroll import PayrollResult
+from app.schemas.client import (
+    BalanceAsOf,
+    ClientOut,
+    ClientPage,
+    ClientSearchFilters,
+    ClientSummary,
+)
+from app.schemas.person import DeleteResult
+from app.schemas.transaction import (
+    DailyRollupOut,
+    ReversalResult,
+    TransactionFilters,
+    TransactionOut,
+    TransactionPage,
+    TransferReversalResult,
+)
+from app.services.checkpoint_service import balance_as_of_async
+from app.services.export_service import export_clients
+from app.services.rollup_service import daily_rollups_async
+from app.services.summary_service import (
+    all_client_summaries_async,
+    client_summary_async,
+)
+from app.services.batch_service import apply_batch_async
+from app.services.client_import_service import (
+    DEFAULT_CHUNK_SIZE as IMPORT_CHUNK_SIZE,
+    import_clients_async,
+)
+from app.services.payroll_service import (
+    DEFAULT_CHUNK_SIZE as PAYROLL_CHUNK_SIZE,
+    run_payroll_async,
+)
+from app.services.person_service import delete_person_async
 from app.services.client_service import (
-    create_transfer,
-    deposit,
-    generate_client_statement_pdf,
-    withdraw,
-    transactions,
-    personal_data,
-    get_all_clients,
-    create_client,
+    create_transfer_async,
+    deposit_async,
+    statement_pdf_if_modified_async,
+    withdraw_async,
+    transactions_with_etag_async,
+    personal_data_async,
+    get_all_clients_async,
+    search_clients_async,
+    create_client_async,
+)
+from app.services.transaction_service import (
+    list_client_transactions_page_async,
+    reverse_transaction_async,
 )
-from app.services.transaction_service import reverse_transaction
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@router.post("/add")
-def add_client(
+def get_session_factory():
+    return AsyncSessionLocal
+
+
+@router.post("/add", response_model=ClientOut)
+async def add_client(
     id: str,
     name: str,
     surname: str,
     email: str,
     balance: Decimal = Decimal("0.00"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    return create_client(
+    return await create_client_async(
         db, id=id, name=name, surname=surname, email=email, initial_balance=balance
     )
 
 
-@router.post("/{client_id}/deposit")
-def deposite_money(client_id: str, amount: Decimal, db: Session = Depends(get_db)):
-    return deposit(db, client_id, amount)
+@router.post("/batch", response_model=BatchResult)
+async def batch_operations(
+    operations: list[BatchOperation],
+    mode: BatchMode = BatchMode.ATOMIC,
+    chunk_size: int | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return await apply_batch_async(db, operations, mode, chunk_size)
 
 
-@router.post("/{client_id}/withdrawal")
-def withdraw_money(client_id: str, amount: Decimal, db: Session = Depends(get_db)):
-    return withdraw(db, client_id, amount)
+@router.post(
+    "/import",
+    response_model=ClientImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_clients(
+    request: Request,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    db: AsyncSession = Depends(get_db),
+):
+    # The body is CSV (id,name,surname,email[,balance]) and is read as a
+    # stream, so uploads of any size are parsed and written chunk by chunk.
+    return await import_clients_async(db, request.stream(), chunk_size)
 
 
-@router.post("/{client_id}/{receiver_id}/transfer")
-def transfer_money(
-    client_id: str, receiver_id: str, amount: Decimal, db: Session = Depends(get_db)
+@router.post(
+    "/{client_id}/payroll",
+    response_model=PayrollResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def run_payroll(
+    client_id: str,
+    request: Request,
+    reference: str,
+    chunk_size: int = PAYROLL_CHUNK_SIZE,
+    db: AsyncSession = Depends(get_db),
 ):
-    return create_transfer(db, client_id, receiver_id, amount)
+    # The body is CSV (receiver_id,amount). Re-uploading the same file with
+    # the same reference resumes an interrupted run.
+    return await run_payroll_async(
+        db, client_id, reference, request.stream(), chunk_size
+    )
 
 
-@router.post("/transactions/{transaction_id}/reverse")
-def reverse_tx(transaction_id: int, db: Session = Depends(get_db)):
-    return reverse_transaction(db, transaction_id)
+@router.post("/{client_id}/deposit", response_model=ClientOut)
+async def deposite_money(
+    client_id: str, amount: Decimal, db: AsyncSession = Depends(get_db)
+):
+    return await deposit_async(db, client_id, amount)
+
+
+@router.post("/{client_id}/withdrawal", response_model=ClientOut)
+async def withdraw_money(
+    client_id: str, amount: Decimal, db: AsyncSession = Depends(get_db)
+):
+    return await withdraw_async(db, client_id, amount)
+
+
+@router.post("/{client_id}/{receiver_id}/transfer", response_model=ClientOut)
+async def transfer_money(
+    client_id: str,
+    receiver_id: str,
+    amount: Decimal,
+    db: AsyncSession = Depends(get_db),
+):
+    return await create_transfer_async(db, client_id, receiver_id, amount)
+
 
+@router.post(
+    "/transactions/{transaction_id}/reverse",
+    response_model=ReversalResult | TransferReversalResult,
+)
+async def reverse_tx(transaction_id: int, db: AsyncSession = Depends(get_db)):
+    return await reverse_transaction_async(db, transaction_id)
 
-@router.get("/{client_id}/transactions")
-def get_transactions(client_id: str, db: Session = Depends(get_db)):
-    return transactions(db, client_id)
 
+@router.get("/{client_id}/transactions", response_model=list[TransactionOut])
+async def get_transactions(
+    client_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    etag, rows = await transactions_with_etag_async(db, client_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return rows
 
-@router.delete("/delete/{person_id}")
-def remove_person(person_id: str, db: Session = Depends(get_db)):
-    return delete_person(db, person_id)
 
+@router.get("/{client_id}/transactions/page", response_model=TransactionPage)
+async def get_transactions_page(
+    client_id: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+    filters: TransactionFilters = Depends(transaction_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    return await list_client_transactions_page_async(
+        db, client_id, filters, limit, cursor, sort_desc
+    )
 
-@router.get("/{client_id}/personal_data")
-def get_data(client_id: str, db: Session = Depends(get_db)):
-    return personal_data(db, client_id)
 
+@router.delete("/delete/{person_id}", response_model=DeleteResult)
+async def remove_person(person_id: str, db: AsyncSession = Depends(get_db)):
+    return await delete_person_async(db, person_id)
 
-@router.get("/clients")
-def get_clients(db: Session = Depends(get_db)):
-    return get_all_clients(db)
+
+@router.get("/{client_id}/personal_data", response_model=ClientOut)
+async def get_data(client_id: str, db: AsyncSession = Depends(get_db)):
+    return await personal_data_async(db, client_id)
+
+
+@router.get("/clients", response_model=list[ClientOut])
+async def get_clients(db: AsyncSession = Depends(get_db)):
+    return await get_all_clients_async(db)
+
+
+def client_search_filters(
+    id: str | None = None,
+    name: str | None = None,
+    surname: str | None = None,
+    email: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    balance_min: Decimal | None = None,
+    balance_max: Decimal | None = None,
+) -> ClientSearchFilters:
+    return ClientSearchFilters(
+        id=id,
+        name=name,
+        surname=surname,
+        email=email,
+        date_from=date_from,
+        date_to=date_to,
+        balance_min=balance_min,
+        balance_max=balance_max,
+    )
+
+
+@router.get("/search", response_model=ClientPage)
+async def search(
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+    filters: ClientSearchFilters = Depends(client_search_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    return await search_clients_async(db, filters, limit, cursor, sort_desc)
+
+
+@router.get("/export")
+def export(
+    format: str = "ndjson",
+    filters: ClientSearchFilters = Depends(client_search_filters),
+    session_factory=Depends(get_session_factory),
+):
+    return export_clients(session_factory, filters, format)
+
+
+@router.get("/summaries", response_model=list[ClientSummary])
+async def get_client_summaries(db: AsyncSession = Depends(get_db)):
+    return await all_client_summaries_async(db)
+
+
+@router.get("/{client_id}/summary", response_model=ClientSummary)
+async def get_client_summary(client_id: str, db: AsyncSession = Depends(get_db)):
+    return await client_summary_async(db, client_id)
+
+
+@router.get("/{client_id}/balance", response_model=BalanceAsOf)
+async def get_balance_as_of(
+    client_id: str, as_of: datetime | None = None, db: AsyncSession = Depends(get_db)
+):
+    return await balance_as_of_async(db, client_id, as_of)
+
+
+@router.get("/{client_id}/rollups/daily", response_model=list[DailyRollupOut])
+async def get_client_daily_rollups(
+    client_id: str,
+    type: list[str] | None = Query(None),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return await daily_rollups_async(db, client_id, type, date_from, date_to)
 
 
 @router.get("/{client_id}/statement")
-def get_client_statement_pdf(client_id: str, db: Session = Depends(get_db)):
-    return generate_client_statement_pdf(db, client_id)
+async def get_client_statement_pdf(
+    client_id: str, request: Request, db: AsyncSession = Depends(get_db)
+):
+    # The PDF is rendered from the same history, so it shares the validator
+    # and a matching request skips the render entirely.
+    etag, response = await statement_pdf_if_modified_async(
+        db, client_id, lambda etag: etag_matches(request, etag)
+    )
+    if response is None:
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return response
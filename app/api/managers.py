@@ -1,33 +1,37 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal
+from app.schemas.person import ManagerOut
 
-from app.services.manager_service import personal_data, get_all_managers, create_manager
+from app.services.manager_service import (
+    personal_data_async,
+    get_all_managers_async,
+    create_manager_async,
+)
 
 router = APIRouter(prefix="/managers", tags=["managers"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@router.post("/add")
-def add_manager(
-    id: str, name: str, surname: str, email: str, db: Session = Depends(get_db)
+@router.post("/add", response_model=ManagerOut)
+async def add_manager(
+    id: str, name: str, surname: str, email: str, db: AsyncSession = Depends(get_db)
 ):
-    return create_manager(db, id=id, name=name, surname=surname, email=email)
+    return await create_manager_async(
+        db, id=id, name=name, surname=surname, email=email
+    )
 
 
-@router.get("/{manager_id}/personal_data")
-def get_data(manager_id: str, db: Session = Depends(get_db)):
-    return personal_data(db, manager_id)
+@router.get("/{manager_id}/personal_data", response_model=ManagerOut)
+async def get_data(manager_id: str, db: AsyncSession = Depends(get_db)):
+    return await personal_data_async(db, manager_id)
 
 
-@router.get("/managers")
-def get_managers(db: Session = Depends(get_db)):
-    return get_all_managers(db)
+@router.get("/managers", response_model=list[ManagerOut])
+async def get_managers(db: AsyncSession = Depends(get_db)):
+    return await get_all_managers_async(db)
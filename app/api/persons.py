@@ -1,20 +1,18 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
-from app.services.person_service import get_all_persons
+from app.core.database import AsyncSessionLocal
+from app.schemas.person import PersonOut
+from app.services.person_service import get_all_persons_async
 
 router = APIRouter(prefix="/persons", tags=["persons"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@router.get("/persons")
-def get_persons(db: Session = Depends(get_db)):
-    return get_all_persons(db)
+@router.get("/persons", response_model=list[PersonOut])
+async def get_persons(db: AsyncSession = Depends(get_db)):
+    return await get_all_persons_async(db)
@@ -1,25 +1,113 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import date
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
-from app.services.transaction_service import get_all_transactions, reverse_transaction
+from app.core.database import AsyncSessionLocal
+from app.core.etag import etag_matches, not_modified
+from app.schemas.transaction import (
+    DailyRollupOut,
+    ReversalResult,
+    TransactionFilters,
+    TransactionOut,
+    TransactionPage,
+    TransferReversalResult,
+)
+from app.services.columnar_export_service import export_transactions_columnar
+from app.services.export_service import export_transactions
+from app.services.rollup_service import daily_rollups_async
+from app.services.transaction_service import (
+    all_transactions_with_etag_async,
+    list_transactions_page_async,
+    reverse_transaction_async,
+)
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@router.get("/transactions")
-def get_transactions(db: Session = Depends(get_db)):
-    return get_all_transactions(db)
+def get_session_factory():
+    return AsyncSessionLocal
 
 
-@router.post("/transactions/{transaction_id}/reverse")
-def reverse_tx(transaction_id: int, db: Session = Depends(get_db)):
-    return reverse_transaction(db, transaction_id)
+def transaction_filters(
+    client_id: str | None = None,
+    type: list[str] | None = Query(None),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    amount_min: Decimal | None = None,
+    amount_max: Decimal | None = None,
+    is_reversed: bool | None = None,
+) -> TransactionFilters:
+    return TransactionFilters(
+        client_id=client_id,
+        types=type,
+        date_from=date_from,
+        date_to=date_to,
+        amount_min=amount_min,
+        amount_max=amount_max,
+        is_reversed=is_reversed,
+    )
+
+
+@router.get("/transactions", response_model=list[TransactionOut])
+async def get_transactions(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    etag, rows = await all_transactions_with_etag_async(db)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return rows
+
+
+@router.post(
+    "/transactions/{transaction_id}/reverse",
+    response_model=ReversalResult | TransferReversalResult,
+)
+async def reverse_tx(transaction_id: int, db: AsyncSession = Depends(get_db)):
+    return await reverse_transaction_async(db, transaction_id)
+
+
+@router.get("/page", response_model=TransactionPage)
+async def get_transactions_page(
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+    filters: TransactionFilters = Depends(transaction_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    return await list_transactions_page_async(db, filters, limit, cursor, sort_desc)
+
+
+@router.get("/rollups/daily", response_model=list[DailyRollupOut])
+async def get_daily_rollups(
+    client_id: str | None = None,
+    type: list[str] | None = Query(None),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return await daily_rollups_async(db, client_id, type, date_from, date_to)
+
+
+@router.get("/export")
+def export(
+    format: str = "ndjson",
+    filters: TransactionFilters = Depends(transaction_filters),
+    session_factory=Depends(get_session_factory),
+):
+    return export_transactions(session_factory, filters, format)
+
+
+@router.get("/export/columnar")
+def export_columnar(
+    format: str = "parquet",
+    filters: TransactionFilters = Depends(transaction_filters),
+    session_factory=Depends(get_session_factory),
+):
+    return export_transactions_columnar(session_factory, filters, format)
@@ -0,0 +1,25 @@
+import argparse
+import time
+
+from app.core.database import SessionLocal
+from app.services.rollup_service import rebuild_rollups
+
+
+def main():
+    argparse.ArgumentParser(
+        description="Rebuild the daily_rollups table from the full transaction history."
+    ).parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        buckets = rebuild_rollups(db)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Rebuilt {buckets} daily rollup bucket(s) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+import time
+from datetime import date
+
+from app.core.database import SessionLocal
+from app.services.checkpoint_service import build_checkpoints
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write end-of-day balance checkpoints from the daily rollups."
+    )
+    parser.add_argument(
+        "--through",
+        type=date.fromisoformat,
+        default=None,
+        help="last day to checkpoint (YYYY-MM-DD, default: yesterday)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="drop existing checkpoints and rebuild them from scratch",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        written = build_checkpoints(db, args.through, args.rebuild)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {written} balance checkpoint(s) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
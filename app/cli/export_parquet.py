@@ -0,0 +1,42 @@
+import argparse
+import os
+import time
+
+from app.core.database import SessionLocal
+from app.services.columnar_export_service import (
+    ROW_GROUP_SIZE,
+    write_clients_parquet,
+    write_transactions_dataset,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write transactions (partitioned by month) and clients as Parquet."
+    )
+    parser.add_argument("out_dir")
+    parser.add_argument("--chunk-size", type=int, default=ROW_GROUP_SIZE)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        months = write_transactions_dataset(
+            db, os.path.join(args.out_dir, "transactions"), args.chunk_size
+        )
+        clients = write_clients_parquet(
+            db, os.path.join(args.out_dir, "clients.parquet"), args.chunk_size
+        )
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Wrote {sum(months.values())} transactions in {len(months)} month(s) "
+        f"and {clients} clients in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import sys
+
+from sqlalchemy.orm import Session
+
+from app.core.database import DATABASE_URL, Base, make_engine
+from app.services.payroll_service import (
+    COMPLETED,
+    DEFAULT_CHUNK_SIZE,
+    file_digest,
+    run_payroll,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pay a payroll CSV (receiver_id,amount) from one sender."
+    )
+    parser.add_argument("sender", help="id of the paying client")
+    parser.add_argument("file", help="CSV file with a receiver_id,amount header")
+    parser.add_argument(
+        "--reference",
+        required=True,
+        help="payroll reference; running it again resumes an interrupted run",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with open(args.file, "rb") as file, Session(bind=engine) as db:
+            try:
+                report = run_payroll(
+                    db,
+                    args.sender,
+                    args.reference,
+                    file,
+                    file_digest(file),
+                    args.chunk_size,
+                )
+            except ValueError as e:
+                parser.exit(2, f"{e}\n")
+    finally:
+        engine.dispose()
+
+    print(
+        f"Payroll '{report['reference']}' {report['status']}: "
+        f"{report['processed_rows']}/{report['rows']} rows, "
+        f"{report['paid_amount']} of {report['total_amount']} paid"
+    )
+    if report.get("detail"):
+        print(report["detail"])
+    for error in report.get("errors", []):
+        print(f"line {error['line']}: {error['detail']}", file=sys.stderr)
+    if report["status"] != COMPLETED:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+
+from app.core.database import DATABASE_URL
+from app.services.reconciliation_service import (
+    DEFAULT_PARTITIONS,
+    run_reconciliation,
+    write_report,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check every client balance against its transaction history."
+    )
+    parser.add_argument("--report", default="reconciliation_report.json")
+    parser.add_argument("--partitions", type=int, default=DEFAULT_PARTITIONS)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="worker processes (1 runs every partition in this process)",
+    )
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    args = parser.parse_args()
+
+    report = run_reconciliation(args.database_url, args.partitions, args.workers)
+    write_report(report, args.report)
+
+    print(
+        f"Checked {report['clients']} clients and {report['transactions']} "
+        f"transactions in {report['elapsed_seconds']:.1f}s "
+        f"({report['transactions_per_second'] or 0} tx/s); "
+        f"{report['mismatch_count']} mismatch(es), report: {args.report}"
+    )
+    sys.exit(1 if report["mismatch_count"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+from decimal import Decimal
+
+from app.core.database import DATABASE_URL, Base, make_engine
+from app.services.seed_service import DEFAULT_CHUNK_SIZE, SeedConfig, generate
+
+
+def _mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def main():
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(
+        description="Bulk-load synthetic clients, managers and transactions."
+    )
+    parser.add_argument("--clients", type=int, default=defaults.clients)
+    parser.add_argument("--managers", type=int, default=defaults.managers)
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        default=defaults.transactions,
+        help="transaction rows to write, opening deposits included",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--prefix", default=defaults.prefix, help="person ids are PREFIX-c<n>/-m<n>"
+    )
+    parser.add_argument(
+        "--days", type=int, default=defaults.days, help="history length, up to today"
+    )
+    parser.add_argument(
+        "--mix",
+        type=_mix,
+        default=defaults.mix,
+        help="operation weights, e.g. deposit=30,withdrawal=15,transfer=50,reversal=5",
+    )
+    parser.add_argument("--initial-min", type=Decimal, default=defaults.initial_min)
+    parser.add_argument("--initial-max", type=Decimal, default=defaults.initial_max)
+    parser.add_argument(
+        "--amount-median",
+        type=Decimal,
+        default=defaults.amount_median,
+        help="median of the log-normal amount distribution",
+    )
+    parser.add_argument("--amount-sigma", type=float, default=defaults.amount_sigma)
+    parser.add_argument("--amount-max", type=Decimal, default=defaults.amount_max)
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=defaults.skew,
+        help="Zipf exponent of client activity (0 = uniform)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--skip-derived",
+        action="store_true",
+        help="do not rebuild daily rollups and balance checkpoints afterwards",
+    )
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        clients=args.clients,
+        managers=args.managers,
+        transactions=args.transactions,
+        seed=args.seed,
+        prefix=args.prefix,
+        days=args.days,
+        mix=args.mix,
+        initial_min=args.initial_min,
+        initial_max=args.initial_max,
+        amount_median=args.amount_median,
+        amount_sigma=args.amount_sigma,
+        amount_max=args.amount_max,
+        skew=args.skew,
+        chunk_size=args.chunk_size,
+    )
+
+    engine = make_engine(args.database_url)
+    try:
+        Base.metadata.create_all(bind=engine)
+        try:
+            report = generate(engine, config, derive=not args.skip_derived)
+        except ValueError as e:
+            parser.exit(2, f"{e}\n")
+    finally:
+        engine.dispose()
+
+    print(
+        f"Wrote {report['clients']} clients, {report['managers']} managers and "
+        f"{report['transactions']} transactions in {report['elapsed_seconds']:.1f}s "
+        f"({report['transactions'] / report['elapsed_seconds']:.0f} tx/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+# Upper bound on staleness only where no database version is watched
+# (non-SQLite or in-memory URLs): there, writes made by other processes
+# (other uvicorn workers, app.cli.payroll, app.cli.seed_data) become visible
+# once the entry expires. With a watched SQLite file every lookup checks
+# PRAGMA data_version, so such writes are seen on the next request.
+CACHE_TTL_SECONDS = float(os.getenv("BANK_CACHE_TTL", "5"))
+CACHE_MAX_ENTRIES = int(os.getenv("BANK_CACHE_SIZE", "1024"))
+
+_PENDING_KEY = "cache_invalidations"
+
+
+class DatabaseVersion:
+    # PRAGMA data_version on a connection that never writes changes whenever
+    # any other connection commits, in this process or another one. Reading
+    # it is a lock check, not a query over data.
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @classmethod
+    def for_url(cls, url: str | None):
+        if not url:
+            return None
+        parsed = make_url(url)
+        if parsed.get_backend_name() != "sqlite" or parsed.database in (
+            None,
+            "",
+            ":memory:",
+        ):
+            return None
+        return cls(parsed.database)
+
+
+class ResponseCache:
+    # In-process TTL + LRU cache for read endpoints. Entries carry tags
+    # ("person:<id>", "clients", "transactions:<id>", ...) and writes
+    # invalidate by tag. Every tag has a generation counter, so a load that
+    # raced with an invalidation is returned but never stored. Entries are
+    # also stamped with the watched database version, so commits made outside
+    # this process turn them into misses as well.
+
+    def __init__(
+        self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._tagged: dict[str, set] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.version = None
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "stale": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def watch(self, url: str | None):
+        # Points the version check at the database the app serves from.
+        previous, self.version = self.version, DatabaseVersion.for_url(url)
+        if previous is not None:
+            previous.close()
+        self.clear()
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics["misses"] += 1
+                return False, None
+            value, tags, expires_at, stored_version = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.metrics["expirations"] += 1
+                self.metrics["misses"] += 1
+                return False, None
+            if stored_version != version:
+                self._drop(key)
+                self.metrics["stale"] += 1
+                self.metrics["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return True, value
+
+    def generations(self, tags) -> tuple:
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key, value, tags, generations: tuple | None = None, version=None):
+        with self._lock:
+            if generations is not None and generations != tuple(
+                self._generations.get(tag, 0) for tag in tags
+            ):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (
+                value,
+                tuple(tags),
+                time.monotonic() + self.ttl,
+                version,
+            )
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.metrics["evictions"] += 1
+
+    async def get_or_load(self, key, tags, loader):
+        if not self.enabled:
+            return await loader()
+        try:
+            version = self.version() if self.version is not None else None
+        except sqlite3.Error:
+            return await loader()
+        hit, value = self.get(key, version)
+        if hit:
+            return value
+        # Both are taken before loading, so a write that lands while the
+        # loader runs leaves the stored entry already stale.
+        generations = self.generations(tags)
+        value = await loader()
+        self.set(key, value, tags, generations, version)
+        return value
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in list(self._tagged.get(tag, ())):
+                    self._drop(key)
+                    self.metrics["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+            self._generations.clear()
+            for key in self.metrics:
+                self.metrics[key] = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.metrics["hits"] + self.metrics["misses"]
+            return {
+                **self.metrics,
+                "entries": len(self._entries),
+                "hit_ratio": self.metrics["hits"] / lookups if lookups else 0.0,
+            }
+
+    def _drop(self, key):
+        tags = self._entries.pop(key)[1]
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_on_commit(db: Session, *tags):
+    # Writes only record their tags; they are applied once the outer
+    # transaction commits. Tags left over from a rolled-back write just cause
+    # a harmless extra invalidation on the session's next commit.
+    db.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+CLIENTS_TAG = "clients"
+MANAGERS_TAG = "managers"
+TRANSACTIONS_TAG = "transactions"
+
+
+def person_tag(person_id: str) -> str:
+    return f"person:{person_id}"
+
+
+def client_transactions_tag(client_id: str) -> str:
+    return f"transactions:{client_id}"
@@ -1,9 +1,154 @@
-from sqlalchemy import create_engine
+import os
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./bank.db"
+from app.core.metrics import install_pool_metrics
+from app.core.profiler import install_query_profiler
+
+DATABASE_URL = os.getenv("BANK_DATABASE_URL", "sqlite:///./bank.db")
+DB_PROFILE = os.getenv("BANK_DB_PROFILE", "wal")
+SINGLE_WRITER = os.getenv("BANK_SINGLE_WRITER", "0") == "1"
+
+
+@dataclass(frozen=True)
+class SqliteProfile:
+    journal_mode: str | None = None
+    synchronous: str | None = None
+    mmap_size: int | None = None
+    cache_size: int | None = None
+    temp_store: str | None = None
+    busy_timeout_ms: int | None = None
+
+    def pragmas(self) -> list[str]:
+        statements = []
+        if self.busy_timeout_ms is not None:
+            statements.append(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.journal_mode is not None:
+            statements.append(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous is not None:
+            statements.append(f"PRAGMA synchronous = {self.synchronous}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.cache_size is not None:
+            statements.append(f"PRAGMA cache_size = {int(self.cache_size)}")
+        if self.temp_store is not None:
+            statements.append(f"PRAGMA temp_store = {self.temp_store}")
+        return statements
+
+
+# "legacy" keeps the stock SQLite settings (rollback journal, FULL sync, no
+# busy timeout). "wal" lets readers run alongside the single writer and makes
+# writers wait for the lock instead of failing with "database is locked".
+SQLITE_PROFILES = {
+    "legacy": SqliteProfile(),
+    "wal": SqliteProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64 * 1024,
+        temp_store="MEMORY",
+        busy_timeout_ms=5000,
+    ),
+}
+
+
+def get_sqlite_profile(profile: str | SqliteProfile) -> SqliteProfile:
+    if isinstance(profile, SqliteProfile):
+        return profile
+    try:
+        return SQLITE_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown database profile: {profile}")
+
+
+def install_sqlite_pragmas(engine, profile: str | SqliteProfile):
+    statements = get_sqlite_profile(profile).pragmas()
+    if not statements or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def install_query_only(engine):
+    if engine.dialect.name != "sqlite":
+        return
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    @event.listens_for(engine, "connect")
+    def _set_query_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
+
+
+def begin_outer_transaction(db):
+    # pysqlite sends no BEGIN before a SAVEPOINT, so the first SAVEPOINT would
+    # open the transaction and its RELEASE would commit it. An explicit BEGIN
+    # keeps every savepoint nested in one transaction that db.commit() ends.
+    connection = db.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN")
+
+
+def make_engine(url: str = DATABASE_URL, profile=DB_PROFILE, **kwargs):
+    connect_args = kwargs.pop("connect_args", {})
+    if url.startswith("sqlite"):
+        connect_args.setdefault("check_same_thread", False)
+    engine = create_engine(url, connect_args=connect_args, **kwargs)
+    install_sqlite_pragmas(engine, profile)
+    install_query_profiler(engine)
+    install_pool_metrics(engine)
+    return engine
+
+
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:") :]
+    return url
+
+
+def make_async_engine(
+    url: str = DATABASE_URL, profile=DB_PROFILE, read_only: bool = False, **kwargs
+):
+    engine = create_async_engine(to_async_url(url), **kwargs)
+    install_sqlite_pragmas(engine.sync_engine, profile)
+    install_query_profiler(engine.sync_engine)
+    install_pool_metrics(engine.sync_engine)
+    if read_only:
+        install_query_only(engine.sync_engine)
+    return engine
+
+
+engine = make_engine(DATABASE_URL, DB_PROFILE)
 SessionLocal = sessionmaker(bind=engine)
 
+# In single-writer mode request sessions only read; every mutation goes
+# through the ledger writer, which owns the only read-write connection.
+async_engine = make_async_engine(DATABASE_URL, DB_PROFILE, read_only=SINGLE_WRITER)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+writer_engine = make_async_engine(DATABASE_URL, DB_PROFILE, pool_size=1, max_overflow=0)
+WriterSessionLocal = async_sessionmaker(bind=writer_engine, expire_on_commit=False)
+
 Base = declarative_base()
+
+
+def ensure_indexes(connection):
+    # create_all only creates indexes together with their table; indexes
+    # declared later are added to existing tables here.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, begin_outer_transaction
+from app.core.metrics import (
+    WRITER_GROUPS,
+    WRITER_QUEUE_DEPTH,
+    WRITER_QUEUE_WAIT_SECONDS,
+    WRITER_REJECTED,
+    WRITER_WRITES,
+)
+from app.core.profiler import current_stats, record_into
+
+logger = logging.getLogger("uvicorn.error")
+
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("BANK_GROUP_COMMIT_MS", "0"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("BANK_GROUP_COMMIT_MAX_BATCH", "256"))
+WRITER_MAX_QUEUE = int(os.getenv("BANK_WRITER_MAX_QUEUE", "1000"))
+
+
+class WriterQueueFullError(Exception):
+    pass
+
+
+def snapshot(result):
+    # Later writes in the same group share the identity map, so ORM results
+    # are copied out as plain column dicts the moment their write finishes.
+    if isinstance(result, Base):
+        return {
+            attr.key: getattr(result, attr.key)
+            for attr in inspect(result).mapper.column_attrs
+        }
+    return result
+
+
+def apply_group(db: Session, writes) -> list[tuple[bool, object]]:
+    outcomes = []
+    begin_outer_transaction(db)
+    for fn, args, stats in writes:
+        with record_into(stats):
+            savepoint = db.begin_nested()
+            try:
+                result = snapshot(fn(db, *args))
+                savepoint.commit()
+            except Exception as exc:
+                savepoint.rollback()
+                outcomes.append((False, exc))
+                continue
+        outcomes.append((True, result))
+    db.commit()
+    return outcomes
+
+
+def apply_exclusive(db: Session, fn, args, stats) -> list[tuple[bool, object]]:
+    with record_into(stats):
+        try:
+            return [(True, snapshot(fn(db, *args)))]
+        except Exception as exc:
+            db.rollback()
+            return [(False, exc)]
+
+
+class GroupCommitter:
+    # A single task applies every queued write. With window_ms > 0 concurrent
+    # writes are coalesced into one commit; with window_ms == 0 each write is
+    # committed on its own, but still strictly one at a time.
+
+    def __init__(
+        self,
+        session_factory,
+        window_ms: float = GROUP_COMMIT_WINDOW_MS,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        max_queue: int = 0,
+    ):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max(max_batch, 1)
+        self.max_queue = max_queue
+        self.metrics = {
+            "groups": 0,
+            "writes": 0,
+            "failed_writes": 0,
+            "rejected": 0,
+            "queue_wait_seconds_total": 0.0,
+            "queue_wait_seconds_max": 0.0,
+        }
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._held = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        pending = [self._held] if self._held else []
+        self._held = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        WRITER_QUEUE_DEPTH.set(0)
+        for item in pending:
+            future = item[2]
+            if not future.done():
+                future.set_exception(RuntimeError("Group commit stopped"))
+
+    def _enqueue(self, fn, args, exclusive: bool):
+        if self._worker is None:
+            raise RuntimeError("Group commit is not running")
+        future = asyncio.get_running_loop().create_future()
+        # The item carries the submitter's query stats; the worker task has
+        # none of its own.
+        try:
+            self._queue.put_nowait(
+                (fn, args, future, time.perf_counter(), exclusive, current_stats())
+            )
+        except asyncio.QueueFull:
+            self.metrics["rejected"] += 1
+            WRITER_REJECTED.inc()
+            raise WriterQueueFullError("Write queue is full, please retry later.")
+        WRITER_QUEUE_DEPTH.set(self._queue.qsize())
+        return future
+
+    async def submit(self, fn, *args):
+        return await self._enqueue(fn, args, exclusive=False)
+
+    async def submit_exclusive(self, fn, *args):
+        # For work that manages its own transactions (e.g. batches); it runs
+        # alone on the write session instead of inside a shared group.
+        return await self._enqueue(fn, args, exclusive=True)
+
+    async def _next(self, timeout: float | None = None):
+        if self._held is not None:
+            item, self._held = self._held, None
+            return item
+        if timeout is None:
+            item = await self._queue.get()
+        else:
+            item = await asyncio.wait_for(self._queue.get(), timeout)
+        WRITER_QUEUE_DEPTH.set(self._queue.qsize())
+        return item
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._next()]
+        if batch[0][4]:
+            return batch
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await self._next(timeout)
+            except asyncio.TimeoutError:
+                break
+            if item[4]:
+                self._held = item
+                break
+            batch.append(item)
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            self._record_queue_wait(batch)
+            await self._flush(batch)
+
+    def _record_queue_wait(self, batch: list):
+        now = time.perf_counter()
+        for item in batch:
+            wait = now - item[3]
+            WRITER_QUEUE_WAIT_SECONDS.observe(wait)
+            self.metrics["queue_wait_seconds_total"] += wait
+            if wait > self.metrics["queue_wait_seconds_max"]:
+                self.metrics["queue_wait_seconds_max"] = wait
+
+    async def _flush(self, batch: list):
+        try:
+            async with self.session_factory() as db:
+                if batch[0][4]:
+                    fn, args, *_, stats = batch[0]
+                    outcomes = await db.run_sync(apply_exclusive, fn, args, stats)
+                else:
+                    writes = [(item[0], item[1], item[5]) for item in batch]
+                    outcomes = await db.run_sync(apply_group, writes)
+        except Exception as exc:
+            logger.exception("Group commit failed")
+            self.metrics["failed_writes"] += len(batch)
+            WRITER_WRITES.labels("failed").inc(len(batch))
+            for item in batch:
+                if not item[2].done():
+                    item[2].set_exception(exc)
+            return
+
+        self.metrics["groups"] += 1
+        WRITER_GROUPS.inc()
+        for item, (ok, value) in zip(batch, outcomes):
+            self.metrics["writes" if ok else "failed_writes"] += 1
+            WRITER_WRITES.labels("ok" if ok else "failed").inc()
+            future = item[2]
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+group_committer: GroupCommitter | None = None
+
+
+def get_group_committer() -> GroupCommitter | None:
+    return group_committer
+
+
+async def start_group_commit(
+    session_factory, window_ms: float, max_batch: int, max_queue: int = 0
+):
+    global group_committer
+    group_committer = GroupCommitter(session_factory, window_ms, max_batch, max_queue)
+    await group_committer.start()
+
+
+async def stop_group_commit():
+    global group_committer
+    if group_committer is not None:
+        await group_committer.stop()
+        group_committer = None
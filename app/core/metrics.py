@@ -0,0 +1,201 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# With PROMETHEUS_MULTIPROC_DIR set (before the app is imported) every
+# uvicorn worker writes its samples to files in that directory and /metrics
+# aggregates them, whichever worker serves the scrape.
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+_PENDING_KEY = "metrics_operations"
+
+REQUEST_LATENCY = Histogram(
+    "bank_http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "bank_http_requests_in_flight",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_CHECKOUT_SECONDS = Histogram(
+    "bank_db_connection_checkout_seconds",
+    "How long pooled connections stay checked out.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_ACQUIRE_SECONDS = Histogram(
+    "bank_db_connection_acquire_seconds",
+    "Time a session waits for a connection, pool wait included.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+DB_CONNECTIONS_CHECKED_OUT = Gauge(
+    "bank_db_connections_checked_out",
+    "Pooled connections currently checked out.",
+    multiprocess_mode="livesum",
+)
+DB_COMMIT_SECONDS = Histogram(
+    "bank_db_commit_seconds",
+    "Session commit latency, flush included.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+LEDGER_OPERATIONS = Counter(
+    "bank_ledger_operations_total",
+    "Committed ledger operations.",
+    ["operation"],
+)
+INSUFFICIENT_FUNDS = Counter(
+    "bank_insufficient_funds_total",
+    "Debits rejected for insufficient funds.",
+)
+
+WRITER_QUEUE_DEPTH = Gauge(
+    "bank_writer_queue_depth",
+    "Writes waiting for the group committer / single writer.",
+    multiprocess_mode="livesum",
+)
+WRITER_QUEUE_WAIT_SECONDS = Histogram(
+    "bank_writer_queue_wait_seconds",
+    "Time a write waits in the writer queue before it is applied.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+WRITER_REJECTED = Counter(
+    "bank_writer_rejected_total",
+    "Writes rejected because the writer queue was full.",
+)
+WRITER_GROUPS = Counter(
+    "bank_writer_groups_total",
+    "Commits made by the group committer / single writer.",
+)
+WRITER_WRITES = Counter(
+    "bank_writer_writes_total",
+    "Writes applied by the group committer / single writer, by outcome.",
+    ["outcome"],
+)
+
+VERSION_CONFLICTS = Counter(
+    "bank_version_conflicts_total",
+    "Optimistic-lock conflicts on versioned client rows, by outcome.",
+    ["outcome"],
+)
+
+LEDGER_OPERATION_NAMES = ("deposit", "withdrawal", "transfer", "reversal")
+for _operation in LEDGER_OPERATION_NAMES:
+    LEDGER_OPERATIONS.labels(_operation)
+for _outcome in ("ok", "failed"):
+    WRITER_WRITES.labels(_outcome)
+for _outcome in ("conflicts", "retries", "exhausted"):
+    VERSION_CONFLICTS.labels(_outcome)
+
+
+def route_template(scope) -> str:
+    # Labels use the matched route template, never the raw path, so the
+    # series count stays bounded.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def observe_request(request, call_next):
+    # The route is only known once routing has run, so the in-flight gauge
+    # is labelled by method alone.
+    in_flight = REQUESTS_IN_FLIGHT.labels(request.method)
+    in_flight.inc()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        in_flight.dec()
+        REQUEST_LATENCY.labels(
+            request.method, route_template(request.scope), str(status)
+        ).observe(time.perf_counter() - started)
+
+
+def record_on_commit(db: Session, operation: str, count: int = 1):
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    pending[operation] = pending.get(operation, 0) + count
+
+
+def record_insufficient_funds():
+    INSUFFICIENT_FUNDS.inc()
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _start_acquire_timer(session, transaction):
+    if transaction.parent is None:
+        session.info["acquire_started"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_begin")
+def _finish_acquire_timer(session, transaction, connection):
+    started = session.info.pop("acquire_started", None)
+    if started is not None:
+        DB_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Session, "before_commit")
+def _start_commit_timer(session):
+    session.info["commit_started"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _finish_commit(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - started)
+    for operation, count in session.info.pop(_PENDING_KEY, {}).items():
+        LEDGER_OPERATIONS.labels(operation).inc(count)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_operations(session, previous_transaction):
+    # Savepoint rollbacks (group commit, best-effort batches) keep what the
+    # other writes in the transaction recorded.
+    if not previous_transaction.nested:
+        session.info.pop("commit_started", None)
+        session.info.pop(_PENDING_KEY, None)
+
+
+def install_pool_metrics(engine):
+    # Accepts a sync Engine; for an AsyncEngine pass engine.sync_engine.
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        DB_CONNECTIONS_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            DB_CONNECTIONS_CHECKED_OUT.dec()
+            DB_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int | None = None):
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,23 @@
+import base64
+from datetime import datetime
+
+MAX_PAGE_SIZE = 500
+
+
+def check_limit(limit: int):
+    if limit <= 0 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def encode_cursor(timestamp: datetime, key) -> str:
+    raw = f"{timestamp.isoformat()}|{key}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, key = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), key
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
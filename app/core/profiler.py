@@ -0,0 +1,111 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger("uvicorn.error")
+
+DEBUG = os.getenv("BANK_DEBUG", "0") == "1"
+SLOW_QUERY_MS = float(os.getenv("BANK_SLOW_QUERY_MS", "100"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("BANK_N_PLUS_ONE_THRESHOLD", "5"))
+
+MAX_LOGGED_PARAMS = 500
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "X-DB-Queries": str(self.count),
+            "X-DB-Time-Ms": f"{self.seconds * 1000:.2f}",
+            "X-DB-Repeated-Statements": str(len(self.repeated())),
+        }
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def profile_queries():
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def record_into(stats: QueryStats | None):
+    # Work handed to another task (e.g. the group committer) records its
+    # queries into the stats of the request that submitted it.
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _short(params) -> str:
+    text = repr(params)
+    if len(text) > MAX_LOGGED_PARAMS:
+        return text[:MAX_LOGGED_PARAMS] + "..."
+    return text
+
+
+def install_query_profiler(engine):
+    # Accepts a sync Engine; for an AsyncEngine pass engine.sync_engine.
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.record(statement, elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms): {statement} "
+                f"params={_short(parameters)}"
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        conn = context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+def report_request(method: str, path: str, stats: QueryStats):
+    for statement, count in stats.repeated().items():
+        logger.warning(
+            f"{method} {path}: statement ran {count} times (possible N+1): "
+            f"{statement}"
+        )
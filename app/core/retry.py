@@ -0,0 +1,97 @@
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import threading
+import time
+
+from fastapi import HTTPException
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.metrics import VERSION_CONFLICTS
+
+logger = logging.getLogger("uvicorn.error")
+
+MAX_ATTEMPTS = 5
+BASE_DELAY = 0.005
+MAX_DELAY = 0.2
+
+_lock = threading.Lock()
+conflict_metrics = {"conflicts": 0, "retries": 0, "exhausted": 0}
+
+
+def _record(key: str):
+    VERSION_CONFLICTS.labels(key).inc()
+    with _lock:
+        conflict_metrics[key] += 1
+
+
+def get_conflict_metrics() -> dict:
+    with _lock:
+        return dict(conflict_metrics)
+
+
+def reset_conflict_metrics():
+    with _lock:
+        for key in conflict_metrics:
+            conflict_metrics[key] = 0
+
+
+def _backoff(attempt: int, base_delay: float, max_delay: float) -> float:
+    # "Full jitter": a random delay up to the exponential cap.
+    return random.uniform(0, min(max_delay, base_delay * (2**attempt)))
+
+
+def _give_up(func, attempts: int):
+    _record("exhausted")
+    logger.warning(f"{func.__name__}: gave up after {attempts} version conflicts")
+    return HTTPException(409, "Concurrent update conflict, please retry.")
+
+
+def retry_on_conflict(
+    func=None,
+    *,
+    attempts: int = MAX_ATTEMPTS,
+    base_delay: float = BASE_DELAY,
+    max_delay: float = MAX_DELAY,
+):
+    if func is None:
+        return functools.partial(
+            retry_on_conflict,
+            attempts=attempts,
+            base_delay=base_delay,
+            max_delay=max_delay,
+        )
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(db, *args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return await func(db, *args, **kwargs)
+                except StaleDataError:
+                    _record("conflicts")
+                    await db.rollback()
+                    if attempt + 1 == attempts:
+                        raise _give_up(func, attempts)
+                    _record("retries")
+                    await asyncio.sleep(_backoff(attempt, base_delay, max_delay))
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(db, *args, **kwargs):
+        for attempt in range(attempts):
+            try:
+                return func(db, *args, **kwargs)
+            except StaleDataError:
+                _record("conflicts")
+                db.rollback()
+                if attempt + 1 == attempts:
+                    raise _give_up(func, attempts)
+                _record("retries")
+                time.sleep(_backoff(attempt, base_delay, max_delay))
+
+    return wrapper
@@ -1,16 +1,77 @@
 import logging
-from fastapi import FastAPI, Request, logger
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, logger
 from fastapi.responses import JSONResponse
-from app.core.database import Base, engine
+from app.core.cache import response_cache
+from app.core import metrics, profiler
+from app.core.database import (
+    DATABASE_URL,
+    SINGLE_WRITER,
+    AsyncSessionLocal,
+    Base,
+    WriterSessionLocal,
+    engine,
+    ensure_indexes,
+)
+from app.core.group_commit import (
+    GROUP_COMMIT_MAX_BATCH,
+    GROUP_COMMIT_WINDOW_MS,
+    WRITER_MAX_QUEUE,
+    WriterQueueFullError,
+    start_group_commit,
+    stop_group_commit,
+)
+from app.models.client import ensure_client_version_column
+from app.models.person import ensure_person_search_index
 from app.api.clients import router as clients_router
 from app.api.managers import router as managers_router
 from app.api.transactions import router as transactions_router
 from app.api.persons import router as persons_router
 
 Base.metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    ensure_client_version_column(connection)
+    ensure_indexes(connection)
+    ensure_person_search_index(connection)
+response_cache.watch(DATABASE_URL)
 
 logger = logging.getLogger("uvicorn.error")
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SINGLE_WRITER:
+        await start_group_commit(
+            WriterSessionLocal,
+            GROUP_COMMIT_WINDOW_MS,
+            GROUP_COMMIT_MAX_BATCH,
+            WRITER_MAX_QUEUE,
+        )
+    elif GROUP_COMMIT_WINDOW_MS > 0:
+        await start_group_commit(
+            AsyncSessionLocal, GROUP_COMMIT_WINDOW_MS, GROUP_COMMIT_MAX_BATCH
+        )
+    yield
+    await stop_group_commit()
+    metrics.mark_process_dead()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.middleware("http")
+async def observe_request_metrics(request: Request, call_next):
+    return await metrics.observe_request(request, call_next)
+
+
+@app.middleware("http")
+async def profile_request_queries(request: Request, call_next):
+    with profiler.profile_queries() as stats:
+        response = await call_next(request)
+    profiler.report_request(request.method, request.url.path, stats)
+    if profiler.DEBUG:
+        response.headers.update(stats.headers())
+    return response
 
 
 @app.exception_handler(ValueError)
@@ -19,6 +80,14 @@ async def value_error_handler(request: Request, exc: ValueError):
     return JSONResponse(status_code=400, content={"detail": str(exc)})
 
 
+@app.exception_handler(WriterQueueFullError)
+async def writer_queue_full_handler(request: Request, exc: WriterQueueFullError):
+    logger.warning(f"{request.url}: {exc}")
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+
 app.include_router(clients_router)
 app.include_router(managers_router)
 app.include_router(transactions_router)
@@ -28,3 +97,14 @@ app.include_router(persons_router)
 @app.get("/")
 def root():
     return {"status": "running"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = metrics.render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/cache/metrics")
+def cache_metrics():
+    return response_cache.stats()
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Date, Numeric, String
+
+from app.core.database import Base
+
+
+class BalanceCheckpoint(Base):
+    __tablename__ = "balance_checkpoints"
+
+    # Balance at the end of `day`, i.e. including every transaction stamped
+    # before midnight of the following day.
+    client_id = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    balance = Column(Numeric(12, 2), nullable=False)
+
+    def __repr__(self):
+        return (
+            f"BalanceCheckpoint(client_id={self.client_id}, day={self.day}, "
+            f"balance={self.balance})"
+        )
@@ -1,5 +1,5 @@
 from decimal import Decimal, InvalidOperation
-from sqlalchemy import Column, String, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, inspect, text
 from sqlalchemy.orm import relationship
 
 from app.models.person import Person, PersonRole
@@ -10,8 +10,9 @@ class Client(Person):
 
     id = Column(String, ForeignKey("persons.id"), primary_key=True)
     _balance = Column(
-        "balance", Numeric(12, 2), nullable=False, default=Decimal("0.00")
+        "balance", Numeric(12, 2), nullable=False, default=Decimal("0.00"), index=True
     )
+    version_id = Column(Integer, nullable=False, default=1)
 
     transactions = relationship(
         "Transaction", back_populates="client", cascade="all, delete-orphan"
@@ -19,6 +20,7 @@ class Client(Person):
 
     __mapper_args__ = {
         "polymorphic_identity": PersonRole.CLIENT,
+        "version_id_col": version_id,
     }
 
     @property
@@ -63,3 +65,24 @@ class Client(Person):
             f"Client(id={self.id}, name='{self.name}', email='{self.email}', "
             f"role='{self.role.value}', created_at={self.created_at}, balance={self.balance})"
         )
+
+
+CLIENT_COLUMNS = (
+    Client.id,
+    Client.name,
+    Client.surname,
+    Client.email,
+    Client.role,
+    Client.created_at,
+    Client._balance.label("balance"),
+)
+
+
+def ensure_client_version_column(connection):
+    # create_all never alters existing tables, so databases created before
+    # client rows were versioned get the column here.
+    columns = {column["name"] for column in inspect(connection).get_columns("clients")}
+    if "version_id" not in columns:
+        connection.execute(
+            text("ALTER TABLE clients ADD COLUMN version_id INTEGER NOT NULL DEFAULT 1")
+        )
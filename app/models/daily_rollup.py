@@ -0,0 +1,23 @@
+from decimal import Decimal
+from sqlalchemy import Column, Date, Index, Integer, Numeric, String
+
+from app.core.database import Base
+
+
+class DailyRollup(Base):
+    __tablename__ = "daily_rollups"
+    # One row per (client, day, type) bucket, kept in step with `transactions`
+    # by the write paths; (day, type) serves the all-clients queries.
+    __table_args__ = (Index("ix_daily_rollups_day_type", "day", "type"),)
+
+    client_id = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    type = Column(String(16), primary_key=True)
+    amount = Column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"DailyRollup(client_id={self.client_id}, day={self.day}, "
+            f"type='{self.type}', amount={self.amount}, count={self.count})"
+        )
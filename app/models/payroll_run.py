@@ -0,0 +1,32 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Column, DateTime, Integer, Numeric, String, UniqueConstraint
+
+from app.core.database import Base
+
+
+class PayrollRun(Base):
+    __tablename__ = "payroll_runs"
+    # One row per (sender, reference). processed_rows is the resume
+    # checkpoint and advances in the same transaction as each paid chunk.
+    __table_args__ = (UniqueConstraint("sender_id", "reference"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sender_id = Column(String, nullable=False)
+    reference = Column(String(80), nullable=False)
+    file_digest = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False)
+    total_rows = Column(Integer, nullable=False)
+    total_amount = Column(Numeric(14, 2), nullable=False)
+    processed_rows = Column(Integer, nullable=False, default=0)
+    paid_amount = Column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))
+    detail = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return (
+            f"PayrollRun(id={self.id}, sender_id={self.sender_id}, "
+            f"reference='{self.reference}', status='{self.status}', "
+            f"processed_rows={self.processed_rows}/{self.total_rows})"
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum
+from sqlalchemy import Column, String, DateTime, Enum, Index, event, text
 from datetime import datetime
 import enum
 
@@ -20,6 +20,8 @@ class Person(Base):
     role = Column(Enum(PersonRole), nullable=False)
     created_at = Column(DateTime, default=datetime.now)
 
+    __table_args__ = (Index("ix_persons_created_at_id", "created_at", "id"),)
+
     __mapper_args__ = {
         "polymorphic_on": role,
         "polymorphic_identity": "person",
@@ -33,3 +35,76 @@ class Person(Base):
             f"Person(id={self.id}, name='{self.name}', email='{self.email}', "
             f"role='{self.role.value}', created_at={self.created_at})"
         )
+
+
+# Column tuples for list endpoints, which build responses from rows instead of
+# loading full ORM objects.
+PERSON_COLUMNS = (
+    Person.id,
+    Person.name,
+    Person.surname,
+    Person.email,
+    Person.role,
+    Person.created_at,
+)
+
+
+# Substring search over id/name/surname/email. SQLite keeps an external-content
+# FTS5 trigram index in step with persons through triggers.
+PERSON_SEARCH_TABLE = "persons_fts"
+PERSON_SEARCH_COLUMNS = ("id", "name", "surname", "email")
+
+_PERSON_SEARCH_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS persons_fts_ai AFTER INSERT ON persons BEGIN
+        INSERT INTO persons_fts(rowid, id, name, surname, email)
+        VALUES (new.rowid, new.id, new.name, new.surname, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS persons_fts_ad AFTER DELETE ON persons BEGIN
+        INSERT INTO persons_fts(persons_fts, rowid, id, name, surname, email)
+        VALUES ('delete', old.rowid, old.id, old.name, old.surname, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS persons_fts_au AFTER UPDATE ON persons BEGIN
+        INSERT INTO persons_fts(persons_fts, rowid, id, name, surname, email)
+        VALUES ('delete', old.rowid, old.id, old.name, old.surname, old.email);
+        INSERT INTO persons_fts(rowid, id, name, surname, email)
+        VALUES (new.rowid, new.id, new.name, new.surname, new.email);
+    END
+    """,
+)
+
+
+def has_person_search_index(connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    return (
+        connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": PERSON_SEARCH_TABLE},
+        ).first()
+        is not None
+    )
+
+
+def ensure_person_search_index(connection):
+    if connection.dialect.name != "sqlite" or has_person_search_index(connection):
+        return
+    connection.execute(
+        text(
+            "CREATE VIRTUAL TABLE persons_fts USING fts5("
+            "id, name, surname, email, "
+            "content='persons', content_rowid='rowid', tokenize='trigram')"
+        )
+    )
+    for statement in _PERSON_SEARCH_TRIGGERS:
+        connection.execute(text(statement))
+    connection.execute(text("INSERT INTO persons_fts(persons_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(Person.__table__, "after_create")
+def _create_person_search_index(target, connection, **kw):
+    ensure_person_search_index(connection)
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, String, Boolean
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -7,6 +16,22 @@ from app.core.database import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # Keyset pagination orders by (timestamp, transaction_id); each index
+    # starts with the equality filters the listing API supports.
+    __table_args__ = (
+        Index("ix_transactions_ts_id", "timestamp", "transaction_id"),
+        Index(
+            "ix_transactions_client_ts_id", "client_id", "timestamp", "transaction_id"
+        ),
+        Index("ix_transactions_type_ts_id", "type", "timestamp", "transaction_id"),
+        Index(
+            "ix_transactions_client_type_ts_id",
+            "client_id",
+            "type",
+            "timestamp",
+            "transaction_id",
+        ),
+    )
 
     transaction_id = Column(Integer, primary_key=True, autoincrement=True)
     client_id = Column(String, ForeignKey("clients.id"))
@@ -49,3 +74,16 @@ class Transaction(Base):
             f"type='{self.type}', amount={self.amount}, timestamp={self.timestamp}, is_reversed={self.is_reversed},"
             f"reversal_of_id={self.reversal_of_id}, reversed_by_id={self.reversed_by_id})"
         )
+
+
+TRANSACTION_COLUMNS = (
+    Transaction.transaction_id,
+    Transaction.client_id,
+    Transaction.type,
+    Transaction.amount,
+    Transaction.timestamp,
+    Transaction.transfer_group_id,
+    Transaction.is_reversed,
+    Transaction.reversal_of_id,
+    Transaction.reversed_by_id,
+)
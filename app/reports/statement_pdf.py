@@ -9,6 +9,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_RIGHT, TA_CENTER
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 
+from app.services.summary_service import summarize_transactions
+
 
 def fmt_money(value) -> str:
     if value is None:
@@ -47,7 +49,7 @@ def _header_footer(canvas, doc, client):
     canvas.restoreState()
 
 
-def build_statement_pdf(client, transactions) -> bytes:
+def build_statement_pdf(client, transactions, summary=None) -> bytes:
     buffer = BytesIO()
     doc = SimpleDocTemplate(
         buffer,
@@ -134,27 +136,25 @@ def build_statement_pdf(client, transactions) -> bytes:
     table.setStyle(table_style)
     story.append(table)
 
-    deposits = sum(Decimal(str(t.amount)) for t in txs if t.type == "deposit")
-    withdrawals = sum(Decimal(str(t.amount)) for t in txs if t.type == "withdrawal")
+    if summary is None:
+        summary = summarize_transactions(client.id, txs)
 
-    transfer_in = sum(Decimal(str(t.amount)) for t in txs if t.type == "transfer_in")
-    transfer_out = sum(Decimal(str(t.amount)) for t in txs if t.type == "transfer_out")
     story.append(Spacer(1, 12))
     story.append(
         Paragraph(
-            f"Total In: <b>{fmt_money(deposits + transfer_in)}</b>", styles["Normal"]
+            f"Total In: <b>{fmt_money(summary['total_in'])}</b>", styles["Normal"]
         )
     )
 
     story.append(
         Paragraph(
-            f"Total Out: <b>{fmt_money(withdrawals + transfer_out)}</b>",
+            f"Total Out: <b>{fmt_money(summary['total_out'])}</b>",
             styles["Normal"],
         )
     )
     story.append(
         Paragraph(
-            f"Net Change: <b>{fmt_money(deposits + transfer_in - transfer_out - withdrawals)}</b>",
+            f"Net Change: <b>{fmt_money(summary['net'])}</b>",
             styles["Bold"],
         )
     )
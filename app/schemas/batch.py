@@ -0,0 +1,38 @@
+from decimal import Decimal
+from enum import Enum
+
+from pydantic import BaseModel
+
+from app.schemas.money import Money
+
+
+class BatchOperationType(str, Enum):
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    TRANSFER = "transfer"
+
+
+class BatchMode(str, Enum):
+    ATOMIC = "atomic"
+    BEST_EFFORT = "best_effort"
+
+
+class BatchOperation(BaseModel):
+    op: BatchOperationType
+    client_id: str
+    amount: Decimal
+    receiver_id: str | None = None
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str
+    balance: Money | None = None
+    detail: str | None = None
+
+
+class BatchResult(BaseModel):
+    mode: BatchMode
+    applied: int
+    failed: int
+    results: list[BatchItemResult]
@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import AliasChoices, BaseModel, Field
+
+from app.schemas.money import Money
+from app.schemas.person import PersonOut
+
+
+class ClientSearchFilters(BaseModel):
+    id: str | None = None
+    name: str | None = None
+    surname: str | None = None
+    email: str | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    balance_min: Decimal | None = None
+    balance_max: Decimal | None = None
+
+
+class ClientOut(PersonOut):
+    # Group-commit writes hand back column snapshots keyed "_balance".
+    balance: Money = Field(validation_alias=AliasChoices("balance", "_balance"))
+
+
+class ClientPage(BaseModel):
+    items: list[ClientOut]
+    next_cursor: str | None = None
+
+
+class ClientSummary(BaseModel):
+    client_id: str
+    deposit: Money
+    withdrawal: Money
+    transfer_in: Money
+    transfer_out: Money
+    counts: dict[str, int]
+    last_activity: datetime | None = None
+    total_in: Money
+    total_out: Money
+    net: Money
+    transaction_count: int
+
+
+class BalanceAsOf(BaseModel):
+    client_id: str
+    as_of: datetime
+    balance: Money
+    checkpoint_day: date | None = None
+    replayed_transactions: int
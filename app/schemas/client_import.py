@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    line: int
+    id: str | None = None
+    detail: str
+
+
+class ClientImportResult(BaseModel):
+    rows: int
+    imported: int
+    rejected: int
+    deposits: int
+    complete: bool
+    errors: list[ImportRowError]
+    errors_truncated: bool = False
@@ -0,0 +1,7 @@
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import PlainSerializer
+
+# Amounts stay Decimal in Python and go out as JSON numbers, as before.
+Money = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
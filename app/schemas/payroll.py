@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+from app.schemas.money import Money
+
+
+class PayrollRowError(BaseModel):
+    line: int
+    receiver_id: str | None = None
+    detail: str
+
+
+class PayrollResult(BaseModel):
+    run_id: int | None = None
+    sender_id: str
+    reference: str
+    status: str
+    rows: int
+    total_amount: Money
+    processed_rows: int
+    paid_amount: Money
+    resumed_from_row: int = 0
+    sender_balance: Money | None = None
+    detail: str | None = None
+    errors: list[PayrollRowError] = []
+    errors_truncated: bool = False
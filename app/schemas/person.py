@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.person import PersonRole
+
+
+class PersonOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    surname: str
+    email: str | None = None
+    role: PersonRole
+    created_at: datetime | None = None
+
+
+class ManagerOut(PersonOut):
+    pass
+
+
+class DeleteResult(BaseModel):
+    status: str
+    person_id: str
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.money import Money
+
+TRANSACTION_TYPES = ("deposit", "withdrawal", "transfer_in", "transfer_out")
+
+
+class TransactionFilters(BaseModel):
+    client_id: str | None = None
+    types: list[str] | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    amount_min: Decimal | None = None
+    amount_max: Decimal | None = None
+    is_reversed: bool | None = None
+
+
+class TransactionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    transaction_id: int
+    client_id: str | None = None
+    type: str
+    amount: Money | None = None
+    timestamp: datetime | None = None
+    transfer_group_id: int | None = None
+    is_reversed: bool
+    reversal_of_id: int | None = None
+    reversed_by_id: int | None = None
+
+
+class TransactionPage(BaseModel):
+    items: list[TransactionOut]
+    next_cursor: str | None = None
+
+
+class ReversalResult(BaseModel):
+    status: str
+    original_transaction_id: int
+    reversal_transaction_id: int
+    client_id: str
+    new_balance: str
+
+
+class TransferReversalResult(BaseModel):
+    status: str
+    transfer_group_id: int
+    sender: str
+    receiver: str
+    amount: str
+    out_reversal: int
+    in_reversal: int
+
+
+class DailyRollupOut(BaseModel):
+    day: date
+    client_id: str | None = None
+    amounts: dict[str, Money]
+    counts: dict[str, int]
+    total_in: Money
+    total_out: Money
+    net: Money
+    transaction_count: int
@@ -0,0 +1,166 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import begin_outer_transaction
+from app.core.group_commit import get_group_committer
+from app.schemas.batch import (
+    BatchItemResult,
+    BatchMode,
+    BatchOperation,
+    BatchOperationType,
+    BatchResult,
+)
+from app.services.client_service import (
+    apply_deposit,
+    apply_transfer,
+    apply_withdrawal,
+)
+
+MAX_BATCH_SIZE = 10_000
+
+
+def _error_detail(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    return str(exc)
+
+
+def apply_operation(db: Session, operation: BatchOperation):
+    if operation.op == BatchOperationType.DEPOSIT:
+        return apply_deposit(db, operation.client_id, operation.amount)
+    if operation.op == BatchOperationType.WITHDRAWAL:
+        return apply_withdrawal(db, operation.client_id, operation.amount)
+    if not operation.receiver_id:
+        raise ValueError("Transfer requires receiver_id")
+    return apply_transfer(
+        db, operation.client_id, operation.receiver_id, operation.amount
+    )
+
+
+def _run_atomic_chunk(db: Session, start: int, chunk: list[BatchOperation]):
+    results = []
+    for offset, operation in enumerate(chunk):
+        try:
+            balance = apply_operation(db, operation)
+        except (ValueError, HTTPException) as exc:
+            db.rollback()
+            for item in results:
+                item.status = "rolled_back"
+                item.balance = None
+            results.append(
+                BatchItemResult(
+                    index=start + offset, status="error", detail=_error_detail(exc)
+                )
+            )
+            return results, False
+        results.append(
+            BatchItemResult(index=start + offset, status="ok", balance=balance)
+        )
+    db.commit()
+    return results, True
+
+
+def _run_best_effort_chunk(db: Session, start: int, chunk: list[BatchOperation]):
+    results = []
+    begin_outer_transaction(db)
+    for offset, operation in enumerate(chunk):
+        savepoint = db.begin_nested()
+        try:
+            balance = apply_operation(db, operation)
+            savepoint.commit()
+        except (ValueError, HTTPException) as exc:
+            savepoint.rollback()
+            results.append(
+                BatchItemResult(
+                    index=start + offset, status="error", detail=_error_detail(exc)
+                )
+            )
+            continue
+        results.append(
+            BatchItemResult(index=start + offset, status="ok", balance=balance)
+        )
+    db.commit()
+    return results, True
+
+
+def _check_batch(operations: list[BatchOperation], chunk_size: int | None) -> int:
+    if len(operations) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch cannot contain more than {MAX_BATCH_SIZE} operations")
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+    return chunk_size or max(len(operations), 1)
+
+
+def apply_batch_chunk(
+    db: Session, mode: BatchMode, start: int, chunk: list[BatchOperation]
+):
+    if mode == BatchMode.ATOMIC:
+        return _run_atomic_chunk(db, start, chunk)
+    return _run_best_effort_chunk(db, start, chunk)
+
+
+def _batch_result(
+    mode: BatchMode, operations: list[BatchOperation], chunks
+) -> BatchResult:
+    # chunks yields (start, results, ok) per chunk as it is applied; after a
+    # failed atomic chunk the rest of the batch is skipped.
+    results = []
+    for start, chunk_results, ok in chunks:
+        results.extend(chunk_results)
+        if not ok:
+            results.extend(
+                BatchItemResult(index=index, status="skipped")
+                for index in range(start + len(chunk_results), len(operations))
+            )
+            break
+    return BatchResult(
+        mode=mode,
+        applied=sum(1 for r in results if r.status == "ok"),
+        failed=sum(1 for r in results if r.status == "error"),
+        results=results,
+    )
+
+
+def apply_batch(
+    db: Session,
+    operations: list[BatchOperation],
+    mode: BatchMode = BatchMode.ATOMIC,
+    chunk_size: int | None = None,
+) -> BatchResult:
+    size = _check_batch(operations, chunk_size)
+
+    def chunks():
+        for start in range(0, len(operations), size):
+            chunk = operations[start : start + size]
+            yield start, *apply_batch_chunk(db, mode, start, chunk)
+
+    return _batch_result(mode, operations, chunks())
+
+
+async def _apply_chunk_async(
+    db: AsyncSession, mode: BatchMode, start: int, chunk: list[BatchOperation]
+):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit_exclusive(apply_batch_chunk, mode, start, chunk)
+    return await db.run_sync(apply_batch_chunk, mode, start, chunk)
+
+
+async def apply_batch_async(
+    db: AsyncSession,
+    operations: list[BatchOperation],
+    mode: BatchMode = BatchMode.ATOMIC,
+    chunk_size: int | None = None,
+) -> BatchResult:
+    # Each chunk is its own exclusive write, so other writes queued on the
+    # committer run between the chunks of a large batch.
+    size = _check_batch(operations, chunk_size)
+    applied = []
+    for start in range(0, len(operations), size):
+        chunk = operations[start : start + size]
+        chunk_results, ok = await _apply_chunk_async(db, mode, start, chunk)
+        applied.append((start, chunk_results, ok))
+        if not ok:
+            break
+    return _batch_result(mode, operations, applied)
@@ -0,0 +1,144 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.expression import UnaryExpression
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.client import Client
+from app.models.daily_rollup import DailyRollup
+from app.models.transaction import Transaction
+
+ZERO = Decimal("0.00")
+CREDIT_TYPES = ("deposit", "transfer_in")
+
+
+def signed_amount(model):
+    return case((model.type.in_(CREDIT_TYPES), model.amount), else_=-model.amount)
+
+
+def _outer(column):
+    # SQLite's unary "+" leaves the value unchanged but stops the planner from
+    # using an index on it, so the column's table becomes the outer loop of
+    # the join (without ANALYZE statistics it would scan the inner table).
+    return UnaryExpression(column, operator=operators.custom_op("+"))
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(ZERO)
+
+
+def delete_client_checkpoints(db: Session, client_id: str):
+    db.execute(
+        delete(BalanceCheckpoint).where(BalanceCheckpoint.client_id == client_id)
+    )
+
+
+def build_checkpoints(
+    db: Session, through: date | None = None, rebuild: bool = False
+) -> int:
+    # Checkpoints are derived from daily_rollups: one per client per active
+    # day, continuing from each client's latest checkpoint. Only closed days
+    # (before today) are checkpointed.
+    through = through or date.today() - timedelta(days=1)
+    if through >= date.today():
+        raise ValueError("Checkpoints can only be built for days before today")
+    if rebuild:
+        db.execute(delete(BalanceCheckpoint))
+
+    # Everything is driven from clients with one index seek per client, so a
+    # nightly run reads each client's latest checkpoint and only the rollup
+    # days after it, not the whole history.
+    clients = Client.__table__
+    latest = aliased(BalanceCheckpoint)
+    last_day = (
+        select(func.max(latest.day))
+        .where(latest.client_id == clients.c.id)
+        .correlate(clients)
+        .scalar_subquery()
+    )
+    bases = {
+        client_id: (day, _money(balance))
+        for client_id, day, balance in db.execute(
+            select(clients.c.id, BalanceCheckpoint.day, BalanceCheckpoint.balance)
+            .select_from(clients)
+            .join(
+                BalanceCheckpoint,
+                (BalanceCheckpoint.client_id == _outer(clients.c.id))
+                & (BalanceCheckpoint.day == last_day),
+            )
+        )
+    }
+
+    stmt = (
+        select(
+            DailyRollup.client_id,
+            DailyRollup.day,
+            func.sum(signed_amount(DailyRollup)),
+        )
+        .select_from(clients)
+        .join(
+            DailyRollup,
+            (DailyRollup.client_id == _outer(clients.c.id))
+            & (DailyRollup.day > func.coalesce(last_day, date.min))
+            & (DailyRollup.day <= through),
+        )
+        .group_by(DailyRollup.client_id, DailyRollup.day)
+        .order_by(DailyRollup.client_id, DailyRollup.day)
+    )
+
+    rows = []
+    running = {}
+    for client_id, day, delta in db.execute(stmt):
+        balance = running.get(client_id, bases.get(client_id, (None, ZERO))[1])
+        balance += _money(delta)
+        running[client_id] = balance
+        rows.append({"client_id": client_id, "day": day, "balance": balance})
+
+    if rows:
+        db.execute(insert(BalanceCheckpoint), rows)
+    db.commit()
+    return len(rows)
+
+
+def balance_as_of(db: Session, client_id: str, as_of: datetime | None = None):
+    if db.get(Client, client_id) is None:
+        raise ValueError("Client not found")
+    as_of = as_of or datetime.now()
+
+    checkpoint = db.execute(
+        select(BalanceCheckpoint.day, BalanceCheckpoint.balance)
+        .where(
+            BalanceCheckpoint.client_id == client_id,
+            BalanceCheckpoint.day < as_of.date(),
+        )
+        .order_by(BalanceCheckpoint.day.desc())
+        .limit(1)
+    ).first()
+
+    replay = select(func.sum(signed_amount(Transaction)), func.count()).where(
+        Transaction.client_id == client_id, Transaction.timestamp <= as_of
+    )
+    if checkpoint is not None:
+        start = datetime.combine(
+            checkpoint.day + timedelta(days=1), datetime.min.time()
+        )
+        replay = replay.where(Transaction.timestamp >= start)
+    delta, replayed = db.execute(replay).one()
+
+    base = _money(checkpoint.balance) if checkpoint is not None else ZERO
+    return {
+        "client_id": client_id,
+        "as_of": as_of,
+        "balance": base + _money(delta),
+        "checkpoint_day": checkpoint.day if checkpoint is not None else None,
+        "replayed_transactions": replayed,
+    }
+
+
+async def balance_as_of_async(
+    db: AsyncSession, client_id: str, as_of: datetime | None = None
+):
+    return await db.run_sync(balance_as_of, client_id, as_of)
@@ -0,0 +1,283 @@
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CLIENTS_TAG, TRANSACTIONS_TAG, invalidate_on_commit
+from app.core.group_commit import get_group_committer
+from app.core.metrics import record_on_commit
+from app.models.client import Client
+from app.models.person import Person, PersonRole
+from app.models.transaction import Transaction
+from app.services import rollup_service
+
+REQUIRED_COLUMNS = ("id", "name", "surname", "email")
+OPTIONAL_COLUMNS = ("balance",)
+DEFAULT_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 10_000
+MAX_REPORTED_ERRORS = 10_000
+MAX_BALANCE = Decimal("9999999999.99")
+ZERO = Decimal("0.00")
+
+
+async def csv_records(chunks):
+    # Yields (line number, fields) per CSV record from a stream of byte
+    # chunks. A record ends at a newline outside quotes, so quoted fields may
+    # span lines and chunk boundaries. Lines are decoded one at a time (a
+    # newline byte never occurs inside a multi-byte UTF-8 sequence), so an
+    # encoding error surfaces on its own line.
+    buffer = b""
+    record = []
+    quoted = False
+    line = 0
+    start = 1
+
+    def finish():
+        text = "\n".join(record)
+        record.clear()
+        return next(csv.reader([text]), [])
+
+    def add(raw: bytes):
+        nonlocal line, start, quoted
+        line += 1
+        text = raw.decode("utf-8-sig" if line == 1 else "utf-8").removesuffix("\r")
+        if not record:
+            start = line
+        record.append(text)
+        quoted ^= text.count('"') % 2 == 1
+        return not quoted
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            if add(raw):
+                fields = finish()
+                if fields:
+                    yield start, fields
+
+    if buffer:
+        add(buffer)
+    if record:
+        fields = finish()
+        if fields:
+            yield start, fields
+
+
+def read_header(fields: list[str]) -> list[str]:
+    columns = [name.strip().lower() for name in fields]
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+    unknown = set(columns) - set(REQUIRED_COLUMNS) - set(OPTIONAL_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown CSV column(s): {', '.join(sorted(unknown))}")
+    if len(set(columns)) != len(columns):
+        raise ValueError("CSV header repeats a column")
+    return columns
+
+
+def parse_row(columns: list[str], fields: list[str]) -> dict:
+    if len(fields) != len(columns):
+        raise ValueError(f"Expected {len(columns)} fields, got {len(fields)}")
+    values = {name: value.strip() for name, value in zip(columns, fields)}
+
+    for name in REQUIRED_COLUMNS:
+        if not values[name]:
+            raise ValueError(f"Missing {name}")
+    for name, limit in (("name", 80), ("surname", 80), ("email", 120)):
+        if len(values[name]) > limit:
+            raise ValueError(f"{name.capitalize()} is longer than {limit} characters")
+    if "@" not in values["email"]:
+        raise ValueError("Invalid email")
+
+    balance = values.get("balance") or "0"
+    try:
+        amount = Decimal(balance)
+    except InvalidOperation:
+        raise ValueError("Invalid balance format")
+    if not amount.is_finite():
+        raise ValueError("Invalid balance format")
+    if amount < ZERO:
+        raise ValueError("Initial balance cannot be negative")
+    if amount > MAX_BALANCE:
+        raise ValueError("Initial balance is too large")
+    if amount != amount.quantize(ZERO):
+        raise ValueError("Balance must have at most two decimal places")
+
+    return {
+        "id": values["id"],
+        "name": values["name"],
+        "surname": values["surname"],
+        "email": values["email"],
+        "balance": amount.quantize(ZERO),
+    }
+
+
+def _row_id(columns: list[str], fields: list[str]) -> str | None:
+    index = columns.index("id")
+    return fields[index].strip() or None if index < len(fields) else None
+
+
+def _write_chunk(db: Session, rows: list[tuple[int, dict]]):
+    ids = [row["id"] for _, row in rows]
+    emails = [row["email"] for _, row in rows]
+    taken_ids = set(db.scalars(select(Person.id).where(Person.id.in_(ids))))
+    taken_emails = set(db.scalars(select(Person.email).where(Person.email.in_(emails))))
+
+    accepted = []
+    errors = []
+    for line, row in rows:
+        if row["id"] in taken_ids:
+            errors.append((line, row["id"], "User with this ID already exists"))
+        elif row["email"] in taken_emails:
+            errors.append((line, row["id"], "User with this email already exists"))
+        else:
+            accepted.append(row)
+    if not accepted:
+        return 0, 0, errors
+
+    now = datetime.now()
+    db.execute(
+        insert(Person.__table__),
+        [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "surname": row["surname"],
+                "email": row["email"],
+                "role": PersonRole.CLIENT,
+                "created_at": now,
+            }
+            for row in accepted
+        ],
+    )
+    db.execute(
+        insert(Client.__table__),
+        [
+            {"id": row["id"], "balance": row["balance"], "version_id": 1}
+            for row in accepted
+        ],
+    )
+
+    deposits = [
+        {
+            "client_id": row["id"],
+            "type": "deposit",
+            "amount": row["balance"],
+            "timestamp": now,
+            "is_reversed": False,
+        }
+        for row in accepted
+        if row["balance"] > ZERO
+    ]
+    if deposits:
+        db.execute(insert(Transaction.__table__), deposits)
+        rollup_service.record_rows(db, deposits)
+        record_on_commit(db, "deposit", len(deposits))
+
+    # New ids have nothing cached under their own tags (lookups that 404 are
+    # not cached), so only the lists need to go.
+    invalidate_on_commit(db, CLIENTS_TAG, TRANSACTIONS_TAG)
+    return len(accepted), len(deposits), errors
+
+
+def import_clients_chunk(db: Session, rows: list[tuple[int, dict]]):
+    # Commits the chunk on its own. If a concurrent writer took an id or email
+    # between the check and the insert, the chunk is checked and written
+    # again, and that row is reported instead.
+    try:
+        result = _write_chunk(db, rows)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        result = _write_chunk(db, rows)
+        db.commit()
+    return result
+
+
+async def _import_chunk_async(db: AsyncSession, rows: list[tuple[int, dict]]):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit_exclusive(import_clients_chunk, rows)
+    return await db.run_sync(import_clients_chunk, rows)
+
+
+async def import_clients_async(
+    db: AsyncSession, chunks, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be between 1 and {MAX_CHUNK_SIZE}")
+
+    report = {
+        "rows": 0,
+        "imported": 0,
+        "rejected": 0,
+        "deposits": 0,
+        "complete": True,
+        "errors": [],
+        "errors_truncated": False,
+    }
+
+    def reject(line: int, person_id: str | None, detail: str):
+        report["rejected"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "id": person_id, "detail": detail})
+        else:
+            report["errors_truncated"] = True
+
+    async def flush():
+        imported, deposits, errors = await _import_chunk_async(db, pending)
+        report["imported"] += imported
+        report["deposits"] += deposits
+        for error in errors:
+            reject(*error)
+        pending.clear()
+
+    columns = None
+    seen_ids = set()
+    seen_emails = set()
+    pending = []
+    records = csv_records(chunks)
+    line = 0
+    try:
+        async for line, fields in records:
+            if columns is None:
+                columns = read_header(fields)
+                continue
+            report["rows"] += 1
+            try:
+                row = parse_row(columns, fields)
+            except ValueError as e:
+                reject(line, _row_id(columns, fields), str(e))
+                continue
+            if row["id"] in seen_ids:
+                reject(line, row["id"], "Duplicate id in file")
+                continue
+            if row["email"] in seen_emails:
+                reject(line, row["id"], "Duplicate email in file")
+                continue
+            seen_ids.add(row["id"])
+            seen_emails.add(row["email"])
+            pending.append((line, row))
+            if len(pending) >= chunk_size:
+                await flush()
+    except UnicodeDecodeError:
+        # Chunks before this point are already committed, so the import
+        # stops and reports where instead of failing the whole request.
+        if columns is None:
+            raise ValueError("CSV must be UTF-8 encoded")
+        report["complete"] = False
+        report["errors"].append(
+            {"line": line + 1, "id": None, "detail": "Invalid UTF-8; import stopped"}
+        )
+
+    if columns is None:
+        raise ValueError("CSV header is required")
+    if pending:
+        await flush()
+    report["errors"].sort(key=lambda error: error["line"])
+    return report
@@ -1,13 +1,30 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
 from io import BytesIO
 import uuid
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.orm import Session
-from app.models.client import Client
-from app.models.person import Person, PersonRole
-from app.models.transaction import Transaction
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import (
+    CLIENTS_TAG,
+    TRANSACTIONS_TAG,
+    client_transactions_tag,
+    invalidate_on_commit,
+    person_tag,
+    response_cache,
+)
+from app.core.etag import make_etag
+from app.core.metrics import record_insufficient_funds, record_on_commit
+from app.core.group_commit import get_group_committer, snapshot
+from app.core.pagination import check_limit, decode_cursor, encode_cursor
+from app.models.client import CLIENT_COLUMNS, Client
+from app.models.person import PERSON_SEARCH_COLUMNS, Person, PersonRole
+from app.models.transaction import TRANSACTION_COLUMNS, Transaction
 from app.reports.statement_pdf import build_statement_pdf
+from app.schemas.client import ClientSearchFilters
+from app.services import ledger_service, rollup_service, summary_service
 from app.services.person_service import _to_money
 
 
@@ -18,37 +35,79 @@ def get_client_or_404(db: Session, client_id: str) -> Client:
     return client
 
 
-def deposit(db: Session, client_id: str, amount: Decimal):
-    if amount <= 0:
-        raise ValueError("Amount must be positive")
+def invalidate_clients(db: Session, *client_ids: str):
+    invalidate_on_commit(
+        db,
+        CLIENTS_TAG,
+        TRANSACTIONS_TAG,
+        *(person_tag(client_id) for client_id in client_ids),
+        *(client_transactions_tag(client_id) for client_id in client_ids),
+    )
 
-    client = get_client_or_404(db, client_id)
 
-    client.deposit(amount)
+def apply_deposit(db: Session, client_id: str, amount: Decimal) -> Decimal:
+    balance = ledger_service.credit(db, client_id, amount)
+    invalidate_clients(db, client_id)
+
+    tx = Transaction(client_id=client_id, type="deposit", amount=Decimal(str(amount)))
+    db.add(tx)
+    rollup_service.record_transaction(db, tx)
+    record_on_commit(db, "deposit")
+    return balance
 
-    db.add(
-        Transaction(client_id=client_id, type="deposit", amount=Decimal(str(amount)))
+
+def apply_withdrawal(db: Session, client_id: str, amount: Decimal) -> Decimal:
+    balance = ledger_service.debit(db, client_id, amount)
+    invalidate_clients(db, client_id)
+
+    tx = Transaction(
+        client_id=client_id, type="withdrawal", amount=Decimal(str(amount))
     )
+    db.add(tx)
+    rollup_service.record_transaction(db, tx)
+    record_on_commit(db, "withdrawal")
+    return balance
+
+
+def deposit(db: Session, client_id: str, amount: Decimal):
+    apply_deposit(db, client_id, amount)
     db.commit()
-    db.refresh(client)
-    return client
+    return get_client_or_404(db, client_id)
 
 
 def withdraw(db: Session, client_id: str, amount: Decimal):
-    client = get_client_or_404(db, client_id)
-    client.withdraw(amount)
-
-    db.add(
-        Transaction(client_id=client_id, type="withdrawal", amount=Decimal(str(amount)))
-    )
+    apply_withdrawal(db, client_id, amount)
     db.commit()
-    db.refresh(client)
-    return client
+    return get_client_or_404(db, client_id)
 
 
 def transactions(db: Session, client_id: str):
-    client = get_client_or_404(db, client_id)
-    return client.transactions
+    get_client_or_404(db, client_id)
+    stmt = (
+        select(*TRANSACTION_COLUMNS)
+        .where(Transaction.client_id == client_id)
+        .order_by(Transaction.transaction_id)
+    )
+    return db.execute(stmt).all()
+
+
+def client_transactions_etag(db: Session, client_id: str) -> str:
+    # Every ledger write bumps the client's version_id and every new row
+    # (reversals included) raises the max transaction_id, so together they
+    # change whenever the client's history or balance does.
+    last_tx = (
+        select(func.max(Transaction.transaction_id))
+        .where(Transaction.client_id == client_id)
+        .scalar_subquery()
+    )
+    row = db.execute(
+        select(Client.version_id, Client.created_at, last_tx).where(
+            Client.id == client_id
+        )
+    ).first()
+    if row is None:
+        raise ValueError("Client not found")
+    return make_etag("client", client_id, *row)
 
 
 def personal_data(db: Session, client_id: str):
@@ -56,16 +115,105 @@ def personal_data(db: Session, client_id: str):
     return client
 
 
+def _personal_data_snapshot(db: Session, client_id: str) -> dict:
+    return snapshot(personal_data(db, client_id))
+
+
 def get_all_clients(db: Session):
-    return db.query(Client).all()
+    return db.execute(select(*CLIENT_COLUMNS).order_by(Client.id)).all()
+
+
+# Trigrams need at least three characters; shorter terms fall back to LIKE.
+MIN_FTS_TERM = 3
+
+
+def _like_pattern(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(column: str, value: str) -> str:
+    quoted = value.replace('"', '""')
+    return f'{column} : "{quoted}"'
+
+
+def apply_client_search_filters(stmt, filters: ClientSearchFilters, use_fts: bool):
+    fts_terms = []
+    for column in PERSON_SEARCH_COLUMNS:
+        value = (getattr(filters, column) or "").strip()
+        if not value:
+            continue
+        if use_fts and len(value) >= MIN_FTS_TERM:
+            fts_terms.append(_fts_phrase(column, value))
+        else:
+            stmt = stmt.where(
+                getattr(Person, column).ilike(_like_pattern(value), escape="\\")
+            )
+    if fts_terms:
+        stmt = stmt.where(
+            text(
+                "persons.rowid IN "
+                "(SELECT rowid FROM persons_fts WHERE persons_fts MATCH :fts_query)"
+            ).bindparams(fts_query=" AND ".join(fts_terms))
+        )
+    if filters.date_from:
+        start = datetime.combine(filters.date_from, datetime.min.time())
+        stmt = stmt.where(Client.created_at >= start)
+    if filters.date_to:
+        end = datetime.combine(filters.date_to, datetime.min.time()) + timedelta(days=1)
+        stmt = stmt.where(Client.created_at < end)
+    if filters.balance_min is not None:
+        stmt = stmt.where(Client._balance >= filters.balance_min)
+    if filters.balance_max is not None:
+        stmt = stmt.where(Client._balance <= filters.balance_max)
+    return stmt
+
+
+def search_clients(
+    db: Session,
+    filters: ClientSearchFilters,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+):
+    check_limit(limit)
+
+    use_fts = db.get_bind().dialect.name == "sqlite"
+    stmt = apply_client_search_filters(select(*CLIENT_COLUMNS), filters, use_fts)
+
+    key = tuple_(Client.created_at, Client.id)
+    if cursor:
+        position = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < position if sort_desc else key > position)
+
+    if sort_desc:
+        stmt = stmt.order_by(Client.created_at.desc(), Client.id.desc())
+    else:
+        stmt = stmt.order_by(Client.created_at, Client.id)
+
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return {"items": items, "next_cursor": next_cursor}
 
 
 def generate_client_statement_pdf(db: Session, client_id: str):
     client = get_client_or_404(db, client_id)
 
-    transactions = client.transactions
+    transactions = (
+        db.execute(
+            select(Transaction)
+            .where(Transaction.client_id == client_id)
+            .order_by(Transaction.timestamp.desc(), Transaction.transaction_id.desc())
+        )
+        .scalars()
+        .all()
+    )
+    summary = summary_service.client_summary(db, client_id)
 
-    pdf_bytes = build_statement_pdf(client, transactions)
+    pdf_bytes = build_statement_pdf(client, transactions, summary)
     return StreamingResponse(
         BytesIO(pdf_bytes),
         media_type="application/pdf",
@@ -75,14 +223,14 @@ def generate_client_statement_pdf(db: Session, client_id: str):
     )
 
 
-def create_client(
+def apply_create_client(
     db: Session,
     id: str,
     name: str,
     surname: str,
     email: str,
     initial_balance: Decimal | float | int = 0,
-):
+) -> Client:
 
     if db.get(Person, id):
         raise HTTPException(status_code=400, detail="User with this ID already exists")
@@ -97,6 +245,7 @@ def create_client(
         id=id, name=name, surname=surname, email=email, role=PersonRole.CLIENT
     )
     db.add(client)
+    invalidate_clients(db, id)
     db.flush()
 
     if init > Decimal("0.00"):
@@ -108,19 +257,36 @@ def create_client(
             amount=init,
         )
         db.add(tx)
+        rollup_service.record_transaction(db, tx)
+        record_on_commit(db, "deposit")
 
+    return client
+
+
+def create_client(
+    db: Session,
+    id: str,
+    name: str,
+    surname: str,
+    email: str,
+    initial_balance: Decimal | float | int = 0,
+):
+    client = apply_create_client(db, id, name, surname, email, initial_balance)
     db.commit()
     db.refresh(client)
     return client
 
 
-def create_transfer(db: Session, sender_id: str, receiver_id: str, amount: Decimal):
-
-    sender = get_client_or_404(db, sender_id)
-    receiver = get_client_or_404(db, receiver_id)
+def apply_transfer(
+    db: Session, sender_id: str, receiver_id: str, amount: Decimal
+) -> Decimal:
 
-    if sender.balance < amount:
+    sender_balance = ledger_service.try_debit(db, sender_id, amount)
+    if sender_balance is None:
+        record_insufficient_funds()
         raise HTTPException(400, "Sender does not have enough balance.")
+    ledger_service.credit(db, receiver_id, amount)
+    invalidate_clients(db, sender_id, receiver_id)
 
     group_id = uuid.uuid4().int % ((1 << 63) - 1)
 
@@ -138,15 +304,140 @@ def create_transfer(db: Session, sender_id: str, receiver_id: str, amount: Decim
         transfer_group_id=group_id,
     )
 
-    sender.withdraw(amount)
-    receiver.deposit(amount)
-
     db.add(tx_out)
     db.add(tx_in)
+    rollup_service.record_transaction(db, tx_out)
+    rollup_service.record_transaction(db, tx_in)
+    record_on_commit(db, "transfer")
+    return sender_balance
 
+
+def create_transfer(db: Session, sender_id: str, receiver_id: str, amount: Decimal):
+    apply_transfer(db, sender_id, receiver_id, amount)
     db.commit()
-    db.refresh(tx_out)
-    db.refresh(tx_in)
-    db.refresh(sender)
+    return get_client_or_404(db, sender_id)
+
+
+def _fresh_client(db: Session, client_id: str) -> Client:
+    return db.get(Client, client_id, populate_existing=True)
+
+
+def _deposit_write(db: Session, client_id: str, amount: Decimal):
+    apply_deposit(db, client_id, amount)
+    return _fresh_client(db, client_id)
+
+
+def _withdraw_write(db: Session, client_id: str, amount: Decimal):
+    apply_withdrawal(db, client_id, amount)
+    return _fresh_client(db, client_id)
+
+
+def _transfer_write(db: Session, sender_id: str, receiver_id: str, amount: Decimal):
+    apply_transfer(db, sender_id, receiver_id, amount)
+    return _fresh_client(db, sender_id)
 
-    return sender
+
+def _create_client_write(
+    db: Session, id: str, name: str, surname: str, email: str, initial_balance
+):
+    client = apply_create_client(db, id, name, surname, email, initial_balance)
+    db.flush()
+    return client
+
+
+async def deposit_async(db: AsyncSession, client_id: str, amount: Decimal):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(_deposit_write, client_id, amount)
+    return await db.run_sync(deposit, client_id, amount)
+
+
+async def withdraw_async(db: AsyncSession, client_id: str, amount: Decimal):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(_withdraw_write, client_id, amount)
+    return await db.run_sync(withdraw, client_id, amount)
+
+
+def _transactions_with_etag(db: Session, client_id: str):
+    # The validator is read before the rows, so a write that lands in between
+    # leaves the body newer than its ETag, never older.
+    return client_transactions_etag(db, client_id), transactions(db, client_id)
+
+
+async def transactions_with_etag_async(db: AsyncSession, client_id: str):
+    # Cached as one entry, so the ETag sent always belongs to the rows sent.
+    return await response_cache.get_or_load(
+        ("client_transactions", client_id),
+        (client_transactions_tag(client_id),),
+        lambda: db.run_sync(_transactions_with_etag, client_id),
+    )
+
+
+async def personal_data_async(db: AsyncSession, client_id: str):
+    return await response_cache.get_or_load(
+        ("client_personal_data", client_id),
+        (person_tag(client_id),),
+        lambda: db.run_sync(_personal_data_snapshot, client_id),
+    )
+
+
+async def get_all_clients_async(db: AsyncSession):
+    return await response_cache.get_or_load(
+        ("clients",), (CLIENTS_TAG,), lambda: db.run_sync(get_all_clients)
+    )
+
+
+async def search_clients_async(
+    db: AsyncSession,
+    filters: ClientSearchFilters,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+):
+    return await db.run_sync(search_clients, filters, limit, cursor, sort_desc)
+
+
+def _statement_if_modified(db: Session, client_id: str, is_current):
+    etag = client_transactions_etag(db, client_id)
+    if is_current(etag):
+        return etag, None
+    return etag, generate_client_statement_pdf(db, client_id)
+
+
+async def statement_pdf_if_modified_async(db: AsyncSession, client_id: str, is_current):
+    # Returns (etag, response); response is None when is_current(etag) holds
+    # and the render is skipped.
+    return await db.run_sync(_statement_if_modified, client_id, is_current)
+
+
+async def create_client_async(
+    db: AsyncSession,
+    id: str,
+    name: str,
+    surname: str,
+    email: str,
+    initial_balance: Decimal | float | int = 0,
+):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(
+            _create_client_write, id, name, surname, email, initial_balance
+        )
+    return await db.run_sync(
+        create_client,
+        id=id,
+        name=name,
+        surname=surname,
+        email=email,
+        initial_balance=initial_balance,
+    )
+
+
+async def create_transfer_async(
+    db: AsyncSession, sender_id: str, receiver_id: str, amount: Decimal
+):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(_transfer_write, sender_id, receiver_id, amount)
+    return await db.run_sync(create_transfer, sender_id, receiver_id, amount)
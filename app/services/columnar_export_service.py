@@ -0,0 +1,179 @@
+import io
+import os
+import tempfile
+from itertools import groupby
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.client import Client
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionFilters
+from app.services.export_service import (
+    CLIENT_EXPORT_COLUMNS,
+    TRANSACTION_EXPORT_COLUMNS,
+)
+from app.services.transaction_service import apply_transaction_filters
+
+ROW_GROUP_SIZE = 100_000
+STREAM_CHUNK_BYTES = 1 << 16
+
+COLUMNAR_FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Column order matches TRANSACTION_EXPORT_COLUMNS / CLIENT_EXPORT_COLUMNS.
+TRANSACTION_SCHEMA = pa.schema(
+    [
+        pa.field("transaction_id", pa.int64(), nullable=False),
+        pa.field("client_id", pa.string()),
+        pa.field("type", pa.string(), nullable=False),
+        pa.field("amount", pa.decimal128(12, 2)),
+        pa.field("timestamp", pa.timestamp("us")),
+        pa.field("transfer_group_id", pa.int64()),
+        pa.field("is_reversed", pa.bool_(), nullable=False),
+        pa.field("reversal_of_id", pa.int64()),
+        pa.field("reversed_by_id", pa.int64()),
+    ]
+)
+
+CLIENT_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string(), nullable=False),
+        pa.field("name", pa.string(), nullable=False),
+        pa.field("surname", pa.string(), nullable=False),
+        pa.field("email", pa.string()),
+        pa.field("created_at", pa.timestamp("us")),
+        pa.field("balance", pa.decimal128(12, 2), nullable=False),
+    ]
+)
+
+
+def rows_to_batch(rows, schema: pa.Schema) -> pa.RecordBatch:
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def _month(row) -> str:
+    return row.timestamp.strftime("%Y-%m") if row.timestamp else "unknown"
+
+
+def write_transactions_dataset(
+    db: Session, out_dir: str, chunk_size: int = ROW_GROUP_SIZE
+) -> dict:
+    stmt = (
+        select(*TRANSACTION_EXPORT_COLUMNS)
+        .order_by(Transaction.timestamp, Transaction.transaction_id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    written = {}
+    writer, current = None, None
+    try:
+        for partition in db.execute(stmt).partitions():
+            for month, rows in groupby(partition, key=_month):
+                if month != current:
+                    if writer is not None:
+                        writer.close()
+                    path = os.path.join(out_dir, f"month={month}", "part-0.parquet")
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    writer = pq.ParquetWriter(path, TRANSACTION_SCHEMA)
+                    current = month
+                batch = rows_to_batch(list(rows), TRANSACTION_SCHEMA)
+                writer.write_batch(batch)
+                written[month] = written.get(month, 0) + batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def write_clients_parquet(db: Session, path: str, chunk_size: int = ROW_GROUP_SIZE):
+    stmt = (
+        select(*CLIENT_EXPORT_COLUMNS)
+        .select_from(Client)
+        .order_by(Client.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    rows_written = 0
+    with pq.ParquetWriter(path, CLIENT_SCHEMA) as writer:
+        for partition in db.execute(stmt).partitions():
+            batch = rows_to_batch(partition, CLIENT_SCHEMA)
+            writer.write_batch(batch)
+            rows_written += batch.num_rows
+    return rows_written
+
+
+# Building record batches and encoding them is CPU-bound work over whole row
+# groups, so it runs in the threadpool instead of on the event loop.
+
+
+async def _stream_batches(session_factory, stmt, schema, chunk_size):
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            yield await run_in_threadpool(rows_to_batch, rows, schema)
+
+
+def _ipc_message(writer, sink: io.BytesIO, batch: pa.RecordBatch) -> bytes:
+    writer.write_batch(batch)
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def _read_chunks(file):
+    file.seek(0)
+    while chunk := file.read(STREAM_CHUNK_BYTES):
+        yield chunk
+
+
+async def stream_arrow(session_factory, stmt, schema, chunk_size=ROW_GROUP_SIZE):
+    # The IPC stream format is written message by message, so every record
+    # batch is sent as soon as it has been read.
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        async for batch in _stream_batches(session_factory, stmt, schema, chunk_size):
+            yield await run_in_threadpool(_ipc_message, writer, sink, batch)
+    yield sink.getvalue()
+
+
+async def stream_parquet(session_factory, stmt, schema, chunk_size=ROW_GROUP_SIZE):
+    # Parquet keeps its metadata in a footer, so row groups are spooled to a
+    # temporary file and the finished file is streamed back in chunks.
+    with tempfile.TemporaryFile() as spool:
+        writer = pq.ParquetWriter(spool, schema)
+        try:
+            async for batch in _stream_batches(
+                session_factory, stmt, schema, chunk_size
+            ):
+                await run_in_threadpool(writer.write_batch, batch)
+        finally:
+            await run_in_threadpool(writer.close)
+        async for chunk in iterate_in_threadpool(_read_chunks(spool)):
+            yield chunk
+
+
+def export_transactions_columnar(
+    session_factory, filters: TransactionFilters, fmt: str
+) -> StreamingResponse:
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    stmt = apply_transaction_filters(select(*TRANSACTION_EXPORT_COLUMNS), filters)
+    stmt = stmt.order_by(Transaction.timestamp, Transaction.transaction_id)
+    stream = stream_parquet if fmt == "parquet" else stream_arrow
+    return StreamingResponse(
+        stream(session_factory, stmt, TRANSACTION_SCHEMA),
+        media_type=COLUMNAR_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{fmt}"'},
+    )
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.models.client import Client
+from app.models.transaction import TRANSACTION_COLUMNS, Transaction
+from app.schemas.client import ClientSearchFilters
+from app.schemas.transaction import TransactionFilters
+from app.services.client_service import apply_client_search_filters
+from app.services.transaction_service import apply_transaction_filters
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+TRANSACTION_EXPORT_COLUMNS = TRANSACTION_COLUMNS
+
+CLIENT_EXPORT_COLUMNS = (
+    Client.id,
+    Client.name,
+    Client.surname,
+    Client.email,
+    Client.created_at,
+    Client._balance.label("balance"),
+)
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(row), default=_json_default, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows, header=None) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows([_csv_value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_export(session_factory, stmt, fmt: str):
+    header = list(stmt.selected_columns.keys())
+    if fmt == "csv":
+        yield encode_csv([], header)
+
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for rows in result.mappings().partitions():
+            if fmt == "csv":
+                yield encode_csv(([row[c] for c in header] for row in rows))
+            else:
+                yield encode_ndjson(rows)
+
+
+def export_response(session_factory, stmt, fmt: str, name: str):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return StreamingResponse(
+        stream_export(session_factory, stmt, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+def export_transactions(session_factory, filters: TransactionFilters, fmt: str):
+    stmt = apply_transaction_filters(select(*TRANSACTION_EXPORT_COLUMNS), filters)
+    stmt = stmt.order_by(Transaction.transaction_id)
+    return export_response(session_factory, stmt, fmt, "transactions")
+
+
+def export_clients(session_factory, filters: ClientSearchFilters, fmt: str):
+    use_fts = session_factory.kw["bind"].dialect.name == "sqlite"
+    stmt = select(*CLIENT_EXPORT_COLUMNS).select_from(Client)
+    stmt = apply_client_search_filters(stmt, filters, use_fts)
+    stmt = stmt.order_by(Client.id)
+    return export_response(session_factory, stmt, fmt, "clients")
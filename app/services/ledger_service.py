@@ -0,0 +1,82 @@
+from decimal import Decimal
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.metrics import record_insufficient_funds
+from app.models.client import Client
+from app.services.person_service import _to_money
+
+
+def _positive_amount(amount) -> Decimal:
+    amt = _to_money(amount)
+    if amt <= Decimal("0.00"):
+        raise ValueError("Amount must be positive")
+    return amt
+
+
+def _apply_balance_delta(
+    db: Session, client_id: str, delta: Decimal, require_funds: bool
+) -> Decimal | None:
+    stmt = update(Client).where(Client.id == client_id)
+    if require_funds:
+        stmt = stmt.where(Client._balance >= -delta)
+    stmt = stmt.values(
+        _balance=func.round(Client._balance + delta, 2),
+        version_id=Client.version_id + 1,
+    ).returning(Client._balance)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def _client_exists(db: Session, client_id: str) -> bool:
+    return (
+        db.execute(select(Client.id).where(Client.id == client_id)).first() is not None
+    )
+
+
+def credit(db: Session, client_id: str, amount) -> Decimal:
+    amt = _positive_amount(amount)
+    balance = _apply_balance_delta(db, client_id, amt, require_funds=False)
+    if balance is None:
+        raise ValueError("Client not found")
+    return balance
+
+
+def try_debit(db: Session, client_id: str, amount) -> Decimal | None:
+    amt = _positive_amount(amount)
+    balance = _apply_balance_delta(db, client_id, -amt, require_funds=True)
+    if balance is None and not _client_exists(db, client_id):
+        raise ValueError("Client not found")
+    return balance
+
+
+def debit(db: Session, client_id: str, amount) -> Decimal:
+    balance = try_debit(db, client_id, amount)
+    if balance is None:
+        record_insufficient_funds()
+        raise ValueError("Insufficient funds")
+    return balance
+
+
+def credit_many(db: Session, amounts: dict[str, Decimal]):
+    # One executemany UPDATE for a batch of credits (e.g. a payroll chunk);
+    # amounts maps client id to the total it receives.
+    if not amounts:
+        return
+    table = Client.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("client_id"))
+        .values(
+            balance=func.round(table.c.balance + bindparam("delta"), 2),
+            version_id=table.c.version_id + 1,
+        )
+    )
+    result = db.execute(
+        stmt,
+        [
+            {"client_id": client_id, "delta": _positive_amount(amount)}
+            for client_id, amount in amounts.items()
+        ],
+    )
+    if result.rowcount != len(amounts):
+        raise ValueError("Client not found")
@@ -1,7 +1,16 @@
 from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import (
+    MANAGERS_TAG,
+    invalidate_on_commit,
+    person_tag,
+    response_cache,
+)
+from app.core.group_commit import get_group_committer, snapshot
 from app.models.manager import Manager
-from app.models.person import Person, PersonRole
+from app.models.person import PERSON_COLUMNS, Person, PersonRole
 
 
 def get_manager_or_404(db: Session, manager_id: str) -> Manager:
@@ -16,11 +25,22 @@ def personal_data(db: Session, manager_id: str):
     return manager
 
 
+def _personal_data_snapshot(db: Session, manager_id: str) -> dict:
+    return snapshot(personal_data(db, manager_id))
+
+
 def get_all_managers(db: Session):
-    return db.query(Manager).all()
+    stmt = (
+        select(*PERSON_COLUMNS)
+        .where(Person.role == PersonRole.MANAGER)
+        .order_by(Person.id)
+    )
+    return db.execute(stmt).all()
 
 
-def create_manager(db: Session, id: str, name: str, surname: str, email: str):
+def apply_create_manager(
+    db: Session, id: str, name: str, surname: str, email: str
+) -> Manager:
 
     if db.get(Person, id):
         raise HTTPException(status_code=400, detail="User with this ID already exists")
@@ -29,6 +49,38 @@ def create_manager(db: Session, id: str, name: str, surname: str, email: str):
         id=id, name=name, surname=surname, email=email, role=PersonRole.MANAGER
     )
     db.add(manager)
+    invalidate_on_commit(db, MANAGERS_TAG, person_tag(id))
+    db.flush()
+    return manager
+
+
+def create_manager(db: Session, id: str, name: str, surname: str, email: str):
+    manager = apply_create_manager(db, id, name, surname, email)
     db.commit()
     db.refresh(manager)
     return manager
+
+
+async def personal_data_async(db: AsyncSession, manager_id: str):
+    return await response_cache.get_or_load(
+        ("manager_personal_data", manager_id),
+        (person_tag(manager_id),),
+        lambda: db.run_sync(_personal_data_snapshot, manager_id),
+    )
+
+
+async def get_all_managers_async(db: AsyncSession):
+    return await response_cache.get_or_load(
+        ("managers",), (MANAGERS_TAG,), lambda: db.run_sync(get_all_managers)
+    )
+
+
+async def create_manager_async(
+    db: AsyncSession, id: str, name: str, surname: str, email: str
+):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(apply_create_manager, id, name, surname, email)
+    return await db.run_sync(
+        create_manager, id=id, name=name, surname=surname, email=email
+    )
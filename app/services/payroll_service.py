@@ -0,0 +1,451 @@
+import csv
+import hashlib
+import io
+import tempfile
+import uuid
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.group_commit import get_group_committer
+from app.core.metrics import record_insufficient_funds, record_on_commit
+from app.models.client import Client
+from app.models.payroll_run import PayrollRun
+from app.models.transaction import Transaction
+from app.services import ledger_service, rollup_service
+from app.services.client_service import get_client_or_404, invalidate_clients
+
+COLUMNS = ("receiver_id", "amount")
+DEFAULT_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 10_000
+MAX_REPORTED_ERRORS = 10_000
+MAX_AMOUNT = Decimal("9999999999.99")
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+ZERO = Decimal("0.00")
+
+RUNNING = "running"
+INTERRUPTED = "interrupted"
+COMPLETED = "completed"
+REJECTED = "rejected"
+
+
+class PayrollConflictError(Exception):
+    pass
+
+
+def file_digest(file) -> str:
+    digest = hashlib.sha256()
+    file.seek(0)
+    while block := file.read(1024 * 1024):
+        digest.update(block)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def _records(file):
+    # Yields (line, receiver_id, amount text) per data row. The header is
+    # required; blank lines are skipped.
+    file.seek(0)
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("Payroll file is empty")
+        columns = [name.strip().lower() for name in header]
+        if sorted(columns) != sorted(COLUMNS):
+            raise ValueError("Payroll header must be receiver_id,amount")
+        receiver_index = columns.index("receiver_id")
+        amount_index = columns.index("amount")
+        start = reader.line_num + 1
+        for fields in reader:
+            line, start = start, reader.line_num + 1
+            if not fields:
+                continue
+            if len(fields) != len(COLUMNS):
+                yield line, None, None
+                continue
+            yield line, fields[receiver_index].strip(), fields[amount_index].strip()
+    except UnicodeDecodeError:
+        raise ValueError("Payroll file must be UTF-8 encoded")
+    finally:
+        text.detach()
+
+
+def _parse_amount(value: str) -> Decimal:
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValueError("Invalid amount format")
+    if not amount.is_finite():
+        raise ValueError("Invalid amount format")
+    if amount <= ZERO:
+        raise ValueError("Amount must be positive")
+    if amount > MAX_AMOUNT:
+        raise ValueError("Amount is too large")
+    if amount != amount.quantize(ZERO):
+        raise ValueError("Amount must have at most two decimal places")
+    return amount.quantize(ZERO)
+
+
+def validate_payroll(db: Session, sender_id: str, file, chunk_size: int) -> dict:
+    # Reads the whole file once: row format, amounts, receivers (checked
+    # against clients with one IN query per chunk) and the total. Nothing is
+    # written.
+    result = {"rows": 0, "total": ZERO, "errors": [], "rejected": 0}
+
+    def reject(line: int, receiver_id: str | None, detail: str):
+        result["rejected"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append(
+                {"line": line, "receiver_id": receiver_id, "detail": detail}
+            )
+
+    def check_receivers():
+        known = set(
+            db.scalars(select(Client.id).where(Client.id.in_(set(pending.values()))))
+        )
+        for line, receiver_id in pending.items():
+            if receiver_id not in known:
+                reject(line, receiver_id, "Receiver not found")
+        pending.clear()
+
+    pending = {}
+    for line, receiver_id, amount in _records(file):
+        result["rows"] += 1
+        if receiver_id is None:
+            reject(line, None, f"Expected {len(COLUMNS)} fields")
+            continue
+        if not receiver_id:
+            reject(line, None, "Missing receiver_id")
+            continue
+        if receiver_id == sender_id:
+            reject(line, receiver_id, "Receiver cannot be the sender")
+            continue
+        try:
+            result["total"] += _parse_amount(amount)
+        except ValueError as e:
+            reject(line, receiver_id, str(e))
+            continue
+        pending[line] = receiver_id
+        if len(pending) >= chunk_size:
+            check_receivers()
+    if pending:
+        check_receivers()
+
+    result["errors"].sort(key=lambda error: error["line"])
+    return result
+
+
+def _report(run: PayrollRun, **extra) -> dict:
+    return {
+        "run_id": run.id,
+        "sender_id": run.sender_id,
+        "reference": run.reference,
+        "status": run.status,
+        "rows": run.total_rows,
+        "total_amount": run.total_amount,
+        "processed_rows": run.processed_rows,
+        "paid_amount": run.paid_amount,
+        "detail": run.detail,
+        **extra,
+    }
+
+
+def _rejected(
+    sender_id: str, reference: str, checked: dict, run: PayrollRun | None, detail
+) -> dict:
+    return {
+        "run_id": run.id if run else None,
+        "sender_id": sender_id,
+        "reference": reference,
+        "status": REJECTED,
+        "rows": checked["rows"],
+        "total_amount": checked["total"],
+        "processed_rows": run.processed_rows if run else 0,
+        "paid_amount": run.paid_amount if run else ZERO,
+        "detail": detail,
+        "errors": checked["errors"],
+        "errors_truncated": checked["rejected"] > len(checked["errors"]),
+    }
+
+
+def _payments(file, skip: int, chunk_size: int):
+    # Yields the validated rows in chunks, starting after the first `skip`
+    # rows (the run's checkpoint).
+    chunk = []
+    for index, (_, receiver_id, amount) in enumerate(_records(file)):
+        if index < skip:
+            continue
+        chunk.append((receiver_id, _parse_amount(amount)))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _pay_chunk(db: Session, run: PayrollRun, chunk: list[tuple[str, Decimal]]):
+    # One transaction: a single aggregate debit of the sender, one
+    # executemany credit, the transfer pairs, their rollups and the
+    # checkpoint. A failure anywhere leaves the run at its last checkpoint.
+    total = sum((amount for _, amount in chunk), ZERO)
+    if ledger_service.try_debit(db, run.sender_id, total) is None:
+        record_insufficient_funds()
+        raise ValueError("Insufficient funds")
+
+    credits = {}
+    for receiver_id, amount in chunk:
+        credits[receiver_id] = credits.get(receiver_id, ZERO) + amount
+    ledger_service.credit_many(db, credits)
+
+    now = datetime.now()
+    rows = []
+    for receiver_id, amount in chunk:
+        group_id = uuid.uuid4().int % ((1 << 63) - 1)
+        for client_id, tx_type in (
+            (run.sender_id, "transfer_out"),
+            (receiver_id, "transfer_in"),
+        ):
+            rows.append(
+                {
+                    "client_id": client_id,
+                    "type": tx_type,
+                    "amount": amount,
+                    "timestamp": now,
+                    "transfer_group_id": group_id,
+                    "is_reversed": False,
+                }
+            )
+    db.execute(insert(Transaction.__table__), rows)
+    rollup_service.record_rows(db, rows)
+    record_on_commit(db, "transfer", len(chunk))
+    invalidate_clients(db, run.sender_id, *credits)
+
+    # Guarded on the checkpoint this upload started from, so two uploads of
+    # the same run can never both pay a chunk.
+    advanced = db.execute(
+        update(PayrollRun)
+        .where(
+            PayrollRun.id == run.id,
+            PayrollRun.status == RUNNING,
+            PayrollRun.processed_rows == run.processed_rows,
+        )
+        .values(
+            processed_rows=PayrollRun.processed_rows + len(chunk),
+            paid_amount=func.round(PayrollRun.paid_amount + total, 2),
+            updated_at=now,
+        )
+    )
+    if advanced.rowcount != 1:
+        raise PayrollConflictError("Payroll run is being processed by another upload")
+    db.commit()
+    db.refresh(run)
+
+
+def _finish(db: Session, run: PayrollRun, status: str, detail: str | None):
+    run.status = status
+    run.detail = detail
+    run.updated_at = datetime.now()
+    db.commit()
+
+
+def _find_run(db: Session, sender_id: str, reference: str) -> PayrollRun | None:
+    return db.execute(
+        select(PayrollRun)
+        .where(PayrollRun.sender_id == sender_id, PayrollRun.reference == reference)
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+
+
+def _check_payroll(
+    db: Session, sender_id: str, reference: str, file, digest: str, chunk_size: int
+):
+    # Read-only first pass. Returns (report, checked); report is set when
+    # there is nothing to pay.
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be between 1 and {MAX_CHUNK_SIZE}")
+    if not reference or len(reference) > 80:
+        raise ValueError("Reference must be 1-80 characters")
+    get_client_or_404(db, sender_id)
+
+    run = _find_run(db, sender_id, reference)
+    if run is not None and run.file_digest != digest:
+        raise ValueError("Payroll reference was already used for a different file")
+    if run is not None and run.status == COMPLETED:
+        return _report(run, detail="Payroll run was already completed"), None
+
+    checked = validate_payroll(db, sender_id, file, chunk_size)
+    if checked["rows"] == 0:
+        raise ValueError("Payroll file has no rows")
+    if checked["rejected"]:
+        return (
+            _rejected(
+                sender_id, reference, checked, run, "Payroll file has invalid rows"
+            ),
+            None,
+        )
+    return None, checked
+
+
+def _start_run(
+    db: Session, sender_id: str, reference: str, digest: str, checked: dict
+) -> dict:
+    # Creates the run, or marks an interrupted one running again. The report
+    # has status RUNNING when there is something left to pay.
+    run = _find_run(db, sender_id, reference)
+    if run is not None and run.file_digest != digest:
+        raise ValueError("Payroll reference was already used for a different file")
+    if run is not None and run.status == COMPLETED:
+        return _report(run, detail="Payroll run was already completed")
+
+    # One balance check for the whole remaining payroll instead of failing
+    # part-way through. Each chunk still debits conditionally, so a
+    # concurrent withdrawal interrupts the run rather than overdrawing.
+    remaining = checked["total"] - (run.paid_amount if run else ZERO)
+    balance = db.scalar(select(Client._balance).where(Client.id == sender_id))
+    if balance < remaining:
+        record_insufficient_funds()
+        return _rejected(
+            sender_id, reference, checked, run, "Insufficient funds for payroll"
+        )
+
+    if run is None:
+        run = PayrollRun(
+            sender_id=sender_id,
+            reference=reference,
+            file_digest=digest,
+            status=RUNNING,
+            total_rows=checked["rows"],
+            total_amount=checked["total"],
+            processed_rows=0,
+            paid_amount=ZERO,
+        )
+        db.add(run)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError("Payroll run is being processed by another upload")
+    else:
+        _finish(db, run, RUNNING, None)
+    return _report(run)
+
+
+def _pay_next_chunk(
+    db: Session, run_id: int, paid_rows: int, chunk: list[tuple[str, Decimal]]
+) -> bool:
+    # paid_rows is where this upload expects the checkpoint to be; another
+    # upload of the same run moving it first is a conflict. Returns False
+    # when the chunk failed and the run is now interrupted.
+    run = db.get(PayrollRun, run_id, populate_existing=True)
+    try:
+        if run.status != RUNNING or run.processed_rows != paid_rows:
+            raise PayrollConflictError(
+                "Payroll run is being processed by another upload"
+            )
+        _pay_chunk(db, run, chunk)
+    except PayrollConflictError as e:
+        db.rollback()
+        raise ValueError(str(e))
+    except Exception as e:
+        # Everything up to the last checkpoint stays paid; the same upload
+        # resumes from there.
+        db.rollback()
+        db.refresh(run)
+        _finish(db, run, INTERRUPTED, str(e) or type(e).__name__)
+        if not isinstance(e, ValueError):
+            raise
+        return False
+    return True
+
+
+def _close_run(db: Session, run_id: int, resumed_from: int, completed: bool) -> dict:
+    run = db.get(PayrollRun, run_id, populate_existing=True)
+    if completed:
+        _finish(db, run, COMPLETED, None)
+    return _report(
+        run,
+        resumed_from_row=resumed_from,
+        sender_balance=db.scalar(
+            select(Client._balance).where(Client.id == run.sender_id)
+        ),
+    )
+
+
+def run_payroll(
+    db: Session,
+    sender_id: str,
+    reference: str,
+    file,
+    digest: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    # file is a seekable binary CSV (receiver_id,amount). It is read twice:
+    # once to validate every row and the total, then chunk by chunk to pay.
+    # The run is keyed by (sender, reference): uploading the same file again
+    # resumes an interrupted run from its checkpoint and never pays a
+    # completed one twice.
+    report, checked = _check_payroll(db, sender_id, reference, file, digest, chunk_size)
+    if report is not None:
+        return report
+    started = _start_run(db, sender_id, reference, digest, checked)
+    if started["status"] != RUNNING:
+        return started
+
+    run_id, resumed_from = started["run_id"], started["processed_rows"]
+    paid_rows = resumed_from
+    for chunk in _payments(file, resumed_from, chunk_size):
+        if not _pay_next_chunk(db, run_id, paid_rows, chunk):
+            return _close_run(db, run_id, resumed_from, completed=False)
+        paid_rows += len(chunk)
+    return _close_run(db, run_id, resumed_from, completed=True)
+
+
+async def _write_async(db: AsyncSession, fn, *args):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit_exclusive(fn, *args)
+    return await db.run_sync(fn, *args)
+
+
+async def run_payroll_async(
+    db: AsyncSession,
+    sender_id: str,
+    reference: str,
+    chunks,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    # The upload is spooled (in memory up to SPOOL_MEMORY_BYTES, then to a
+    # temporary file) and hashed on the way in, so the payroll can be read
+    # twice without holding a large file in memory. Validation runs on the
+    # request session; the start, each chunk and the close are separate
+    # writes, so other writes run between the chunks of a large payroll.
+    hasher = hashlib.sha256()
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES) as file:
+        async for chunk in chunks:
+            hasher.update(chunk)
+            file.write(chunk)
+        digest = hasher.hexdigest()
+
+        report, checked = await db.run_sync(
+            _check_payroll, sender_id, reference, file, digest, chunk_size
+        )
+        if report is not None:
+            return report
+        started = await _write_async(
+            db, _start_run, sender_id, reference, digest, checked
+        )
+        if started["status"] != RUNNING:
+            return started
+
+        run_id, resumed_from = started["run_id"], started["processed_rows"]
+        paid_rows = resumed_from
+        for chunk in _payments(file, resumed_from, chunk_size):
+            if not await _write_async(db, _pay_next_chunk, run_id, paid_rows, chunk):
+                return await _write_async(db, _close_run, run_id, resumed_from, False)
+            paid_rows += len(chunk)
+        return await _write_async(db, _close_run, run_id, resumed_from, True)
@@ -1,8 +1,20 @@
 from decimal import Decimal, InvalidOperation
 from fastapi import HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.person import Person
+from app.core.cache import (
+    CLIENTS_TAG,
+    MANAGERS_TAG,
+    TRANSACTIONS_TAG,
+    client_transactions_tag,
+    invalidate_on_commit,
+    person_tag,
+)
+from app.core.group_commit import get_group_committer
+from app.models.person import PERSON_COLUMNS, Person
+from app.services import checkpoint_service, rollup_service
 
 
 def _to_money(value) -> Decimal:
@@ -20,13 +32,40 @@ def get_person_or_404(db: Session, person_id: str) -> Person:
     return person
 
 
-def delete_person(db: Session, id: str):
+def apply_delete_person(db: Session, id: str):
     person = get_person_or_404(db, id)
+    invalidate_on_commit(
+        db,
+        person_tag(id),
+        CLIENTS_TAG,
+        MANAGERS_TAG,
+        TRANSACTIONS_TAG,
+        client_transactions_tag(id),
+    )
+    rollup_service.delete_client_rollups(db, id)
+    checkpoint_service.delete_client_checkpoints(db, id)
     db.delete(person)
-    db.commit()
+    db.flush()
 
     return {"status": "deleted", "person_id": id}
 
 
+def delete_person(db: Session, id: str):
+    result = apply_delete_person(db, id)
+    db.commit()
+    return result
+
+
 def get_all_persons(db: Session):
-    return db.query(Person).all()
+    return db.execute(select(*PERSON_COLUMNS).order_by(Person.id)).all()
+
+
+async def delete_person_async(db: AsyncSession, id: str):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(apply_delete_person, id)
+    return await db.run_sync(delete_person, id)
+
+
+async def get_all_persons_async(db: AsyncSession):
+    return await db.run_sync(get_all_persons)
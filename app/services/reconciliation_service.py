@@ -0,0 +1,144 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import DATABASE_URL, make_engine
+from app.models.client import Client
+from app.models.transaction import Transaction
+from app.services.checkpoint_service import signed_amount
+
+ZERO = Decimal("0.00")
+DEFAULT_PARTITIONS = 16
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(ZERO)
+
+
+def client_ranges(db: Session, partitions: int) -> list[tuple[str | None, str | None]]:
+    # Splits the ordered client ids into contiguous [lo, hi) ranges of roughly
+    # equal size; None means unbounded.
+    partitions = max(partitions, 1)
+    total = db.execute(select(func.count()).select_from(Client)).scalar_one()
+    step = -(-total // partitions) if total else 1
+    bounds = (
+        db.execute(
+            select(Client.id).order_by(Client.id).offset(step * i).limit(1)
+        ).scalar_one()
+        for i in range(1, partitions)
+        if step * i < total
+    )
+    edges = [None, *bounds, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _in_range(column, lo: str | None, hi: str | None):
+    conditions = []
+    if lo is not None:
+        conditions.append(column >= lo)
+    if hi is not None:
+        conditions.append(column < hi)
+    return conditions
+
+
+def reconcile_range(db: Session, lo: str | None, hi: str | None) -> dict:
+    # Balances and transaction sums come from one statement, so both are read
+    # from the same snapshot and a write committed mid-run cannot show up as
+    # a mismatch.
+    sums = (
+        select(
+            Transaction.client_id,
+            func.sum(signed_amount(Transaction)).label("total"),
+            func.count().label("count"),
+        )
+        .where(*_in_range(Transaction.client_id, lo, hi))
+        .group_by(Transaction.client_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Client.id, Client._balance, sums.c.total, sums.c.count)
+        .outerjoin(sums, sums.c.client_id == Client.id)
+        .where(*_in_range(Client.id, lo, hi))
+    ).all()
+
+    mismatches = []
+    transactions = 0
+    for client_id, balance, total, count in rows:
+        expected = _money(total)
+        transactions += count or 0
+        balance = _money(balance)
+        if balance != expected:
+            mismatches.append(
+                {
+                    "client_id": client_id,
+                    "balance": str(balance),
+                    "expected": str(expected),
+                    "difference": str(balance - expected),
+                }
+            )
+    return {
+        "clients": len(rows),
+        "transactions": transactions,
+        "mismatches": mismatches,
+    }
+
+
+def _reconcile_partition(url: str, lo: str | None, hi: str | None) -> dict:
+    # Runs in a worker process, so it opens its own engine.
+    engine = make_engine(url)
+    try:
+        with Session(engine) as db:
+            return reconcile_range(db, lo, hi)
+    finally:
+        engine.dispose()
+
+
+def run_reconciliation(
+    url: str = DATABASE_URL,
+    partitions: int = DEFAULT_PARTITIONS,
+    workers: int | None = None,
+) -> dict:
+    started_at = datetime.now()
+    started = time.perf_counter()
+
+    engine = make_engine(url)
+    try:
+        with Session(engine) as db:
+            ranges = client_ranges(db, partitions)
+    finally:
+        engine.dispose()
+
+    if workers == 1:
+        results = [_reconcile_partition(url, lo, hi) for lo, hi in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_reconcile_partition, url, lo, hi) for lo, hi in ranges
+            ]
+            results = [future.result() for future in futures]
+
+    elapsed = time.perf_counter() - started
+    clients = sum(r["clients"] for r in results)
+    transactions = sum(r["transactions"] for r in results)
+    mismatches = sorted(
+        (m for r in results for m in r["mismatches"]), key=lambda m: m["client_id"]
+    )
+    return {
+        "started_at": started_at.isoformat(),
+        "elapsed_seconds": round(elapsed, 3),
+        "partitions": len(ranges),
+        "clients": clients,
+        "transactions": transactions,
+        "transactions_per_second": round(transactions / elapsed) if elapsed else None,
+        "mismatch_count": len(mismatches),
+        "mismatches": mismatches,
+    }
+
+
+def write_report(report: dict, path: str):
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(report, out, indent=2)
@@ -0,0 +1,166 @@
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client import Client
+from app.models.daily_rollup import DailyRollup
+from app.models.transaction import Transaction
+from app.schemas.transaction import TRANSACTION_TYPES
+
+ZERO = Decimal("0.00")
+
+
+def record_transaction(db: Session, tx: Transaction):
+    # Stamp the transaction here so its row and its rollup bucket always agree
+    # on the day, even across midnight.
+    if tx.timestamp is None:
+        tx.timestamp = datetime.now()
+
+    amount = Decimal(str(tx.amount))
+    stmt = sqlite_insert(DailyRollup).values(
+        client_id=tx.client_id,
+        day=tx.timestamp.date(),
+        type=tx.type,
+        amount=amount,
+        count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyRollup.client_id, DailyRollup.day, DailyRollup.type],
+        set_={
+            "amount": func.round(DailyRollup.amount + stmt.excluded.amount, 2),
+            "count": DailyRollup.count + 1,
+        },
+    )
+    db.execute(stmt)
+
+
+def record_rows(db: Session, rows):
+    # Bulk counterpart of record_transaction for writers that insert
+    # transaction dicts with executemany: one upsert per bucket.
+    buckets = {}
+    for row in rows:
+        key = (row["client_id"], row["timestamp"].date(), row["type"])
+        amount, count = buckets.get(key, (ZERO, 0))
+        buckets[key] = (amount + Decimal(str(row["amount"])), count + 1)
+    if not buckets:
+        return
+
+    table = DailyRollup.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.client_id, table.c.day, table.c.type],
+        set_={
+            "amount": func.round(table.c.amount + stmt.excluded.amount, 2),
+            "count": table.c.count + stmt.excluded.count,
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {
+                "client_id": client_id,
+                "day": day,
+                "type": tx_type,
+                "amount": amount,
+                "count": count,
+            }
+            for (client_id, day, tx_type), (amount, count) in buckets.items()
+        ],
+    )
+
+
+def delete_client_rollups(db: Session, client_id: str):
+    db.execute(delete(DailyRollup).where(DailyRollup.client_id == client_id))
+
+
+def rebuild_rollups(db: Session) -> int:
+    day = func.date(Transaction.timestamp)
+    history = select(
+        Transaction.client_id,
+        day,
+        Transaction.type,
+        func.round(func.sum(Transaction.amount), 2),
+        func.count(),
+    ).group_by(Transaction.client_id, day, Transaction.type)
+
+    db.execute(delete(DailyRollup))
+    db.execute(
+        insert(DailyRollup).from_select(
+            ["client_id", "day", "type", "amount", "count"], history
+        )
+    )
+    db.commit()
+    return db.execute(select(func.count()).select_from(DailyRollup)).scalar_one()
+
+
+def _empty_bucket(day: date, client_id: str | None) -> dict:
+    return {
+        "day": day,
+        "client_id": client_id,
+        "amounts": {tx_type: ZERO for tx_type in TRANSACTION_TYPES},
+        "counts": {tx_type: 0 for tx_type in TRANSACTION_TYPES},
+    }
+
+
+def _finish(bucket: dict) -> dict:
+    amounts = bucket["amounts"]
+    bucket["total_in"] = amounts["deposit"] + amounts["transfer_in"]
+    bucket["total_out"] = amounts["withdrawal"] + amounts["transfer_out"]
+    bucket["net"] = bucket["total_in"] - bucket["total_out"]
+    bucket["transaction_count"] = sum(bucket["counts"].values())
+    return bucket
+
+
+def daily_rollups(
+    db: Session,
+    client_id: str | None = None,
+    types: list[str] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[dict]:
+    if date_from and date_to and date_from > date_to:
+        raise ValueError("date_from must not be after date_to")
+
+    if client_id:
+        if db.get(Client, client_id) is None:
+            raise ValueError("Client not found")
+        stmt = select(
+            DailyRollup.day, DailyRollup.type, DailyRollup.amount, DailyRollup.count
+        ).where(DailyRollup.client_id == client_id)
+    else:
+        stmt = select(
+            DailyRollup.day,
+            DailyRollup.type,
+            func.sum(DailyRollup.amount),
+            func.sum(DailyRollup.count),
+        ).group_by(DailyRollup.day, DailyRollup.type)
+
+    if types:
+        unknown = set(types) - set(TRANSACTION_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown transaction type: {', '.join(sorted(unknown))}")
+        stmt = stmt.where(DailyRollup.type.in_(types))
+    if date_from:
+        stmt = stmt.where(DailyRollup.day >= date_from)
+    if date_to:
+        stmt = stmt.where(DailyRollup.day <= date_to)
+
+    buckets = {}
+    for day, tx_type, amount, count in db.execute(stmt.order_by(DailyRollup.day)):
+        bucket = buckets.setdefault(day, _empty_bucket(day, client_id))
+        bucket["amounts"][tx_type] = Decimal(str(amount)).quantize(ZERO)
+        bucket["counts"][tx_type] = count
+    return [_finish(bucket) for bucket in buckets.values()]
+
+
+async def daily_rollups_async(
+    db: AsyncSession,
+    client_id: str | None = None,
+    types: list[str] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[dict]:
+    return await db.run_sync(daily_rollups, client_id, types, date_from, date_to)
@@ -0,0 +1,324 @@
+import random
+import time
+from bisect import bisect
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.client import Client
+from app.models.manager import Manager
+from app.models.person import Person, PersonRole
+from app.models.transaction import Transaction
+from app.services import checkpoint_service, rollup_service
+
+DEFAULT_MIX = {"deposit": 30, "withdrawal": 15, "transfer": 50, "reversal": 5}
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Reversals only look back over rows that have not been written yet, so the
+# original can still be marked reversed before its insert.
+REVERSAL_WINDOW = 10_000
+
+
+@dataclass
+class SeedConfig:
+    clients: int = 1_000
+    managers: int = 10
+    transactions: int = 100_000
+    seed: int = 1
+    prefix: str = "seed"
+    days: int = 365
+    end: datetime | None = None
+    mix: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    initial_min: Decimal = Decimal("0.00")
+    initial_max: Decimal = Decimal("5000.00")
+    amount_median: Decimal = Decimal("40.00")
+    amount_sigma: float = 1.0
+    amount_max: Decimal = Decimal("10000.00")
+    skew: float = 1.0
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    def validate(self):
+        if self.clients < 2:
+            raise ValueError("At least two clients are needed")
+        if self.transactions < 0 or self.managers < 0 or self.days < 1:
+            raise ValueError("Counts must not be negative and days must be positive")
+        unknown = set(self.mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"Unknown operation in mix: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in self.mix.values()) or not any(
+            self.mix.values()
+        ):
+            raise ValueError("Mix weights must be non-negative and not all zero")
+        if not Decimal("0.00") <= self.initial_min <= self.initial_max:
+            raise ValueError("Initial balance range is invalid")
+        if self.amount_median <= 0 or self.amount_max < self.amount_median:
+            raise ValueError("Amount distribution is invalid")
+        if self.chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+
+
+class _Generator:
+    # Produces transaction rows in id order and keeps every balance in cents,
+    # applying the same rules as the services: debits need funds, a reversal
+    # writes the opposite rows and marks the originals.
+
+    def __init__(self, config: SeedConfig, first_id: int, first_group: int):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.ids = [f"{config.prefix}-c{i}" for i in range(config.clients)]
+        self.balances = [0] * config.clients
+        self.next_id = first_id
+        self.next_group = first_group
+        self.rows = []
+        self.reversible = []
+        self.written = 0
+
+        end = config.end or datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.start = end - timedelta(days=config.days)
+        self.step = (end - self.start) / max(config.transactions, 1)
+
+        # Zipf-like activity: client i is picked with weight 1 / (i + 1)^skew.
+        self.cum_weights = list(
+            accumulate(1 / (i + 1) ** config.skew for i in range(config.clients))
+        )
+        self.operations = list(config.mix)
+        self.op_weights = list(accumulate(config.mix.values()))
+
+    def _client(self) -> int:
+        point = self.rng.random() * self.cum_weights[-1]
+        return min(bisect(self.cum_weights, point), len(self.ids) - 1)
+
+    def _amount(self) -> int:
+        median = float(self.config.amount_median) * 100
+        cents = int(self.rng.lognormvariate(0, self.config.amount_sigma) * median)
+        return min(max(cents, 1), int(self.config.amount_max * 100))
+
+    def _add(self, client: int, tx_type: str, cents: int, **extra) -> dict:
+        row = {
+            "transaction_id": self.next_id,
+            "client_id": self.ids[client],
+            "type": tx_type,
+            "amount": Decimal(cents) / 100,
+            "timestamp": self.start + self.step * self.written,
+            "transfer_group_id": None,
+            "is_reversed": False,
+            "reversal_of_id": None,
+            "reversed_by_id": None,
+            **extra,
+        }
+        self.next_id += 1
+        self.written += 1
+        self.rows.append(row)
+        return row
+
+    def _credit(self, client: int, tx_type: str, cents: int, **extra) -> dict:
+        self.balances[client] += cents
+        return self._add(client, tx_type, cents, **extra)
+
+    def _debit(self, client: int, tx_type: str, cents: int, **extra) -> dict:
+        self.balances[client] -= cents
+        return self._add(client, tx_type, cents, **extra)
+
+    def _remember(self, *entries):
+        # Entries are (client index, row) pairs: one for deposits and
+        # withdrawals, two (out, in) for transfers.
+        self.reversible.append(entries)
+        if len(self.reversible) > REVERSAL_WINDOW:
+            self.reversible.pop(0)
+
+    def open_accounts(self):
+        low = int(self.config.initial_min * 100)
+        high = int(self.config.initial_max * 100)
+        for client in range(len(self.ids)):
+            cents = self.rng.randint(low, high)
+            if cents > 0:
+                self._remember((client, self._credit(client, "deposit", cents)))
+
+    def step_once(self):
+        operation = self.operations[
+            bisect(self.op_weights, self.rng.random() * self.op_weights[-1])
+        ]
+        if operation == "reversal" and self._reverse():
+            return
+        client = self._client()
+        cents = self._amount()
+
+        if operation == "transfer" and self.balances[client] >= cents:
+            receiver = self._client()
+            if receiver == client:
+                receiver = (client + 1) % len(self.ids)
+            group = self.next_group
+            self.next_group += 1
+            self._remember(
+                (
+                    client,
+                    self._debit(client, "transfer_out", cents, transfer_group_id=group),
+                ),
+                (
+                    receiver,
+                    self._credit(
+                        receiver, "transfer_in", cents, transfer_group_id=group
+                    ),
+                ),
+            )
+        elif operation == "withdrawal" and self.balances[client] >= cents:
+            self._remember((client, self._debit(client, "withdrawal", cents)))
+        else:
+            self._remember((client, self._credit(client, "deposit", cents)))
+
+    def _reverse(self) -> bool:
+        if not self.reversible:
+            return False
+        index = self.rng.randrange(len(self.reversible))
+        entries = self.reversible[index]
+        if len(entries) == 2:
+            (sender, tx_out), (receiver, tx_in) = entries
+            cents = int(tx_out["amount"] * 100)
+            if self.balances[receiver] < cents:
+                return False
+            back_out = self._credit(
+                sender, "transfer_in", cents, reversal_of_id=tx_out["transaction_id"]
+            )
+            back_in = self._debit(
+                receiver, "transfer_out", cents, reversal_of_id=tx_in["transaction_id"]
+            )
+            tx_out.update(is_reversed=True, reversed_by_id=back_out["transaction_id"])
+            tx_in.update(is_reversed=True, reversed_by_id=back_in["transaction_id"])
+        else:
+            ((client, original),) = entries
+            cents = int(original["amount"] * 100)
+            if original["type"] == "deposit":
+                if self.balances[client] < cents:
+                    return False
+                reversal = self._debit(
+                    client,
+                    "withdrawal",
+                    cents,
+                    reversal_of_id=original["transaction_id"],
+                )
+            else:
+                reversal = self._credit(
+                    client, "deposit", cents, reversal_of_id=original["transaction_id"]
+                )
+            original.update(is_reversed=True, reversed_by_id=reversal["transaction_id"])
+            # A reversal of a deposit or withdrawal can be reversed in turn,
+            # which is how chains form.
+            self._remember((client, reversal))
+
+        self.reversible[index] = self.reversible[-1]
+        self.reversible.pop()
+        return True
+
+    def take_rows(self) -> list[dict]:
+        rows, self.rows = self.rows, []
+        self.reversible.clear()
+        return rows
+
+
+def _person_rows(ids: list[str], role: PersonRole, created_at: datetime):
+    return [
+        {
+            "id": person_id,
+            "name": "Seed",
+            "surname": person_id,
+            "email": f"{person_id}@seed.example",
+            "role": role,
+            "created_at": created_at,
+        }
+        for person_id in ids
+    ]
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def generate(engine, config: SeedConfig, derive: bool = True) -> dict:
+    # Offline bulk load: rows go in with executemany in chunked transactions,
+    # then the daily rollups and balance checkpoints are rebuilt from the new
+    # history. Nothing is written to the cache or metrics; restart or wait
+    # out BANK_CACHE_TTL if an app is running against the same database.
+    config.validate()
+    started = time.perf_counter()
+
+    with engine.connect() as conn:
+        if conn.execute(
+            select(Person.id).where(Person.id.like(f"{config.prefix}-%")).limit(1)
+        ).first():
+            raise ValueError(f"Ids with prefix '{config.prefix}-' already exist")
+        first_id = (
+            conn.execute(select(func.max(Transaction.transaction_id))).scalar() or 0
+        ) + 1
+        first_group = (
+            conn.execute(select(func.max(Transaction.transfer_group_id))).scalar() or 0
+        ) + 1
+
+    generator = _Generator(config, first_id, first_group)
+    manager_ids = [f"{config.prefix}-m{i}" for i in range(config.managers)]
+
+    with engine.begin() as conn:
+        for chunk in _chunks(
+            _person_rows(generator.ids, PersonRole.CLIENT, generator.start),
+            config.chunk_size,
+        ):
+            conn.execute(insert(Person.__table__), chunk)
+        if manager_ids:
+            conn.execute(
+                insert(Person.__table__),
+                _person_rows(manager_ids, PersonRole.MANAGER, generator.start),
+            )
+            conn.execute(insert(Manager.__table__), [{"id": id} for id in manager_ids])
+
+    generator.open_accounts()
+    while generator.written < config.transactions or generator.rows:
+        while (
+            generator.written < config.transactions
+            and len(generator.rows) < config.chunk_size
+        ):
+            generator.step_once()
+        with engine.begin() as conn:
+            for chunk in _chunks(generator.take_rows(), config.chunk_size):
+                conn.execute(insert(Transaction.__table__), chunk)
+
+    # Clients go in last, with their final balances, so the ledger and the
+    # history agree once the load finishes.
+    with engine.begin() as conn:
+        for start in range(0, config.clients, config.chunk_size):
+            conn.execute(
+                insert(Client.__table__),
+                [
+                    {
+                        "id": generator.ids[i],
+                        "balance": Decimal(generator.balances[i]) / 100,
+                        "version_id": 1,
+                    }
+                    for i in range(
+                        start, min(start + config.chunk_size, config.clients)
+                    )
+                ],
+            )
+
+    report = {
+        "clients": config.clients,
+        "managers": config.managers,
+        "transactions": generator.written,
+        "first_transaction_id": first_id,
+        "seed": config.seed,
+    }
+    if derive:
+        db = Session(bind=engine)
+        try:
+            report["rollups"] = rollup_service.rebuild_rollups(db)
+            report["checkpoints"] = checkpoint_service.build_checkpoints(
+                db, rebuild=True
+            )
+        finally:
+            db.close()
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
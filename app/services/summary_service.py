@@ -0,0 +1,100 @@
+from decimal import Decimal
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client import Client
+from app.models.transaction import Transaction
+from app.schemas.transaction import TRANSACTION_TYPES
+
+ZERO = Decimal("0.00")
+
+
+def _empty_summary(client_id: str) -> dict:
+    return {
+        "client_id": client_id,
+        **{tx_type: ZERO for tx_type in TRANSACTION_TYPES},
+        "counts": {tx_type: 0 for tx_type in TRANSACTION_TYPES},
+        "last_activity": None,
+    }
+
+
+def _add_group(summary: dict, tx_type: str, total, count: int, last):
+    if tx_type not in summary["counts"]:
+        return
+    summary[tx_type] = total if total is not None else ZERO
+    summary["counts"][tx_type] = count
+    if last is not None and (
+        summary["last_activity"] is None or last > summary["last_activity"]
+    ):
+        summary["last_activity"] = last
+
+
+def summarize_transactions(client_id: str, transactions) -> dict:
+    summary = _empty_summary(client_id)
+    for t in transactions:
+        if t.type in summary["counts"]:
+            summary[t.type] += Decimal(str(t.amount))
+            summary["counts"][t.type] += 1
+            if t.timestamp and (
+                summary["last_activity"] is None
+                or t.timestamp > summary["last_activity"]
+            ):
+                summary["last_activity"] = t.timestamp
+    return _finish(summary)
+
+
+def _finish(summary: dict) -> dict:
+    summary["total_in"] = summary["deposit"] + summary["transfer_in"]
+    summary["total_out"] = summary["withdrawal"] + summary["transfer_out"]
+    summary["net"] = summary["total_in"] - summary["total_out"]
+    summary["transaction_count"] = sum(summary["counts"].values())
+    return summary
+
+
+def _grouped_columns():
+    return (
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count(),
+        func.max(Transaction.timestamp),
+    )
+
+
+def client_summary(db: Session, client_id: str) -> dict:
+    if db.get(Client, client_id) is None:
+        raise ValueError("Client not found")
+
+    stmt = (
+        select(*_grouped_columns())
+        .where(Transaction.client_id == client_id)
+        .group_by(Transaction.type)
+    )
+    summary = _empty_summary(client_id)
+    for tx_type, total, count, last in db.execute(stmt):
+        _add_group(summary, tx_type, total, count, last)
+    return _finish(summary)
+
+
+def all_client_summaries(db: Session) -> list[dict]:
+    summaries = {
+        client_id: _empty_summary(client_id)
+        for client_id in db.execute(select(Client.id).order_by(Client.id)).scalars()
+    }
+
+    stmt = select(Transaction.client_id, *_grouped_columns()).group_by(
+        Transaction.client_id, Transaction.type
+    )
+    for client_id, tx_type, total, count, last in db.execute(stmt):
+        if client_id in summaries:
+            _add_group(summaries[client_id], tx_type, total, count, last)
+
+    return [_finish(summary) for summary in summaries.values()]
+
+
+async def client_summary_async(db: AsyncSession, client_id: str) -> dict:
+    return await db.run_sync(client_summary, client_id)
+
+
+async def all_client_summaries_async(db: AsyncSession) -> list[dict]:
+    return await db.run_sync(all_client_summaries)
@@ -1,9 +1,20 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
 from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.transaction import Transaction
-from app.services.client_service import get_client_or_404
+from app.core.cache import TRANSACTIONS_TAG, client_transactions_tag, response_cache
+from app.core.etag import make_etag
+from app.core.group_commit import get_group_committer
+from app.core.metrics import record_on_commit
+from app.core.pagination import check_limit, decode_cursor, encode_cursor
+from app.core.retry import retry_on_conflict
+from app.models.transaction import TRANSACTION_COLUMNS, Transaction
+from app.schemas.transaction import TRANSACTION_TYPES, TransactionFilters
+from app.services import rollup_service
+from app.services.client_service import get_client_or_404, invalidate_clients
 
 
 def get_transaction_or_404(db: Session, transaction_id: int) -> Transaction:
@@ -14,10 +25,91 @@ def get_transaction_or_404(db: Session, transaction_id: int) -> Transaction:
 
 
 def get_all_transactions(db: Session):
-    return db.query(Transaction).all()
-
-
-def reverse_transaction(db: Session, transaction_id: int):
+    stmt = select(*TRANSACTION_COLUMNS).order_by(Transaction.transaction_id)
+    return db.execute(stmt).all()
+
+
+def transactions_etag(db: Session) -> str:
+    # New rows raise the max id (reversals add rows too); deleting a client
+    # lowers the count.
+    last_id, count = db.execute(
+        select(func.max(Transaction.transaction_id), func.count())
+    ).one()
+    return make_etag("transactions", last_id, count)
+
+
+def apply_transaction_filters(stmt, filters: TransactionFilters):
+    if filters.client_id:
+        stmt = stmt.where(Transaction.client_id == filters.client_id)
+    if filters.types:
+        unknown = set(filters.types) - set(TRANSACTION_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown transaction type: {', '.join(sorted(unknown))}")
+        stmt = stmt.where(Transaction.type.in_(filters.types))
+    if filters.date_from:
+        start = datetime.combine(filters.date_from, datetime.min.time())
+        stmt = stmt.where(Transaction.timestamp >= start)
+    if filters.date_to:
+        end = datetime.combine(filters.date_to, datetime.min.time()) + timedelta(days=1)
+        stmt = stmt.where(Transaction.timestamp < end)
+    if filters.amount_min is not None:
+        stmt = stmt.where(Transaction.amount >= filters.amount_min)
+    if filters.amount_max is not None:
+        stmt = stmt.where(Transaction.amount <= filters.amount_max)
+    if filters.is_reversed is not None:
+        stmt = stmt.where(Transaction.is_reversed == filters.is_reversed)
+    return stmt
+
+
+def list_transactions_page(
+    db: Session,
+    filters: TransactionFilters,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+):
+    check_limit(limit)
+
+    key = tuple_(Transaction.timestamp, Transaction.transaction_id)
+    stmt = apply_transaction_filters(select(*TRANSACTION_COLUMNS), filters)
+
+    if cursor:
+        timestamp, transaction_id = decode_cursor(cursor)
+        try:
+            position = tuple_(timestamp, int(transaction_id))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        stmt = stmt.where(key < position if sort_desc else key > position)
+
+    if sort_desc:
+        stmt = stmt.order_by(
+            Transaction.timestamp.desc(), Transaction.transaction_id.desc()
+        )
+    else:
+        stmt = stmt.order_by(Transaction.timestamp, Transaction.transaction_id)
+
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(items[-1].timestamp, items[-1].transaction_id)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def list_client_transactions_page(
+    db: Session,
+    client_id: str,
+    filters: TransactionFilters,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+):
+    get_client_or_404(db, client_id)
+    filters = filters.model_copy(update={"client_id": client_id})
+    return list_transactions_page(db, filters, limit, cursor, sort_desc)
+
+
+def apply_reversal(db: Session, transaction_id: int) -> dict:
     tx = get_transaction_or_404(db, transaction_id)
 
     if tx.is_reversed:
@@ -32,6 +124,7 @@ def reverse_transaction(db: Session, transaction_id: int):
 
         sender = get_client_or_404(db, tx_out.client_id)
         receiver = get_client_or_404(db, tx_in.client_id)
+        invalidate_clients(db, sender.id, receiver.id)
 
         amount = abs(Decimal(str(tx_out.amount)))
 
@@ -57,12 +150,14 @@ def reverse_transaction(db: Session, transaction_id: int):
 
         db.add(reversal_out)
         db.add(reversal_in)
+        rollup_service.record_transaction(db, reversal_out)
+        rollup_service.record_transaction(db, reversal_in)
         db.flush()
 
         tx_out.reversed_by_id = reversal_out.transaction_id
         tx_in.reversed_by_id = reversal_in.transaction_id
-
-        db.commit()
+        db.flush()
+        record_on_commit(db, "reversal")
 
         return {
             "status": "reversed_transfer",
@@ -77,6 +172,7 @@ def reverse_transaction(db: Session, transaction_id: int):
     else:
 
         client = get_client_or_404(db, tx.client_id)
+        invalidate_clients(db, client.id)
 
         amount = Decimal(str(tx.amount))
 
@@ -96,14 +192,13 @@ def reverse_transaction(db: Session, transaction_id: int):
             reversal_of_id=tx.transaction_id,
         )
         db.add(reversal)
+        rollup_service.record_transaction(db, reversal)
         db.flush()
 
         tx.is_reversed = True
         tx.reversed_by_id = reversal.transaction_id
-
-        db.commit()
-        db.refresh(client)
-        db.refresh(reversal)
+        db.flush()
+        record_on_commit(db, "reversal")
 
         return {
             "status": "reversed",
@@ -114,6 +209,15 @@ def reverse_transaction(db: Session, transaction_id: int):
         }
 
 
+# Reversing a deposit or withdrawal flushes the versioned Client, so a
+# concurrent ledger update can still surface as StaleDataError here.
+@retry_on_conflict
+def reverse_transaction(db: Session, transaction_id: int):
+    result = apply_reversal(db, transaction_id)
+    db.commit()
+    return result
+
+
 def get_related_transfer_transactions(db: Session, tx: Transaction):
 
     if tx.transfer_group_id is None:
@@ -126,3 +230,64 @@ def get_related_transfer_transactions(db: Session, tx: Transaction):
     )
 
     return rows
+
+
+def _all_transactions_with_etag(db: Session):
+    # The validator is read before the rows, so a write that lands in between
+    # leaves the body newer than its ETag, never older.
+    return transactions_etag(db), get_all_transactions(db)
+
+
+async def all_transactions_with_etag_async(db: AsyncSession):
+    return await db.run_sync(_all_transactions_with_etag)
+
+
+async def list_transactions_page_async(
+    db: AsyncSession,
+    filters: TransactionFilters,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+):
+    tag = (
+        client_transactions_tag(filters.client_id)
+        if filters.client_id
+        else TRANSACTIONS_TAG
+    )
+    return await response_cache.get_or_load(
+        ("transactions_page", filters.model_dump_json(), limit, cursor, sort_desc),
+        (tag,),
+        lambda: db.run_sync(list_transactions_page, filters, limit, cursor, sort_desc),
+    )
+
+
+async def list_client_transactions_page_async(
+    db: AsyncSession,
+    client_id: str,
+    filters: TransactionFilters,
+    limit: int = 50,
+    cursor: str | None = None,
+    sort_desc: bool = True,
+):
+    return await response_cache.get_or_load(
+        (
+            "client_transactions_page",
+            client_id,
+            filters.model_dump_json(),
+            limit,
+            cursor,
+            sort_desc,
+        ),
+        (client_transactions_tag(client_id),),
+        lambda: db.run_sync(
+            list_client_transactions_page, client_id, filters, limit, cursor, sort_desc
+        ),
+    )
+
+
+@retry_on_conflict
+async def reverse_transaction_async(db: AsyncSession, transaction_id: int):
+    committer = get_group_committer()
+    if committer is not None:
+        return await committer.submit(apply_reversal, transaction_id)
+    return await db.run_sync(reverse_transaction.__wrapped__, transaction_id)
@@ -0,0 +1,112 @@
+"""Write throughput and latency of per-request commits vs group commit.
+
+Usage: python -m benchmarks.bench_group_commit [--concurrency 64] [--seconds 3]
+       [--windows 0,1,2,5,10] [--profile legacy]
+
+A window of 0 commits every request on its own session.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core import group_commit
+from app.core.database import Base, make_async_engine, make_engine
+from app.services.client_service import create_client, deposit_async
+
+CLIENTS = 100
+
+
+def _seed(url: str, profile: str):
+    engine = make_engine(url, profile)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        for i in range(CLIENTS):
+            create_client(db, f"gc{i}", "Bench", str(i), f"gc{i}@example.com")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+async def _run(url, profile, window_ms, concurrency, seconds):
+    engine = make_async_engine(url, profile)
+    SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+    if window_ms > 0:
+        await group_commit.start_group_commit(SessionLocal, window_ms, 1024)
+
+    latencies = []
+    errors = 0
+    stop_at = time.perf_counter() + seconds
+
+    async def worker(n):
+        nonlocal errors
+        i = n
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                async with SessionLocal() as db:
+                    await deposit_async(db, f"gc{i % CLIENTS}", Decimal("1.00"))
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            i += concurrency
+
+    try:
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    finally:
+        await group_commit.stop_group_commit()
+        await engine.dispose()
+
+    latencies.sort()
+    ms = [x * 1000 for x in latencies] or [0.0]
+    return {
+        "window_ms": window_ms,
+        "writes_per_sec": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(ms), 2),
+        "p99_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.99))], 2),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--windows", default="0,1,2,5,10")
+    parser.add_argument("--profile", default="legacy")
+    args = parser.parse_args()
+
+    for window_ms in (float(w) for w in args.windows.split(",")):
+        fd, path = tempfile.mkstemp(prefix="bench_gc_", suffix=".sqlite3")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+        try:
+            _seed(url, args.profile)
+            result = asyncio.run(
+                _run(url, args.profile, window_ms, args.concurrency, args.seconds)
+            )
+        finally:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                try:
+                    os.remove(path + suffix)
+                except FileNotFoundError:
+                    pass
+        print(
+            f"window={result['window_ms']:>5} ms  "
+            f"{result['writes_per_sec']:>9} writes/s  "
+            f"p50={result['p50_ms']} ms  p99={result['p99_ms']} ms  "
+            f"errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
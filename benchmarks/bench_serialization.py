@@ -0,0 +1,140 @@
+"""Serialization cost of list responses: ORM objects vs typed row models.
+
+Usage: python -m benchmarks.bench_serialization [--rows 10000] [--repeat 5]
+
+"orm+jsonable_encoder" is how list endpoints used to respond (full ORM
+objects through FastAPI's introspecting encoder). The others build the
+response models from row tuples and dump them with orjson (if installed) or
+with pydantic-core, which is what FastAPI does for routes with a
+response_model.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, make_engine
+from app.models.client import CLIENT_COLUMNS, Client
+from app.models.person import Person, PersonRole
+from app.models.transaction import TRANSACTION_COLUMNS, Transaction
+from app.schemas.client import ClientOut
+from app.schemas.transaction import TransactionOut
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _seed(engine, rows: int):
+    started = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Person),
+            [
+                {
+                    "id": f"s{i}",
+                    "name": "Bench",
+                    "surname": str(i),
+                    "email": f"s{i}@example.com",
+                    "role": PersonRole.CLIENT,
+                    "created_at": started,
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(Client.__table__),
+            [{"id": f"s{i}", "balance": Decimal("100.00")} for i in range(rows)],
+        )
+        conn.execute(
+            insert(Transaction),
+            [
+                {
+                    "client_id": f"s{i}",
+                    "type": "deposit",
+                    "amount": Decimal("100.00"),
+                    "timestamp": started + timedelta(seconds=i),
+                    "is_reversed": False,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+def _best(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _cases(SessionLocal, entity, columns, model):
+    adapter = TypeAdapter(list[model])
+
+    def orm_jsonable():
+        with SessionLocal() as db:
+            objects = db.execute(select(entity)).scalars().all()
+            return json.dumps(jsonable_encoder(objects)).encode()
+
+    def rows_orjson():
+        with SessionLocal() as db:
+            rows = db.execute(select(*columns)).all()
+            items = adapter.validate_python(rows, from_attributes=True)
+            return orjson.dumps(adapter.dump_python(items, mode="json"))
+
+    def rows_dump_json():
+        with SessionLocal() as db:
+            rows = db.execute(select(*columns)).all()
+            items = adapter.validate_python(rows, from_attributes=True)
+            return adapter.dump_json(items)
+
+    cases = {
+        "orm+jsonable_encoder": orm_jsonable,
+        "rows+pydantic+orjson": rows_orjson,
+        "rows+pydantic.dump_json": rows_dump_json,
+    }
+    if orjson is None:
+        del cases["rows+pydantic+orjson"]
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(prefix="bench_ser_", suffix=".sqlite3")
+    os.close(fd)
+    engine = make_engine(f"sqlite:///{path}", "legacy")
+    try:
+        Base.metadata.create_all(bind=engine)
+        _seed(engine, args.rows)
+        SessionLocal = sessionmaker(bind=engine)
+
+        for label, entity, columns, model in (
+            ("transactions", Transaction, TRANSACTION_COLUMNS, TransactionOut),
+            ("clients", Client, CLIENT_COLUMNS, ClientOut),
+        ):
+            for name, fn in _cases(SessionLocal, entity, columns, model).items():
+                seconds = _best(fn, args.repeat)
+                print(f"{label:<12} {name:<24} {seconds * 1000:>8.1f} ms")
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
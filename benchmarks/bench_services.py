@@ -0,0 +1,276 @@
+"""Service-level timings and peak memory over seeded databases.
+
+Usage: python -m benchmarks.bench_services [--size 10k] [--db PATH]
+       [--ops deposit,withdraw,...] [--save] [--compare]
+       [--max-regression 30] [--baselines benchmarks/baselines/services.json]
+
+--size picks how many transactions app.services.seed_service writes (10k,
+1m or 10m). Without --db the database is a temporary file, removed
+afterwards; with --db it is seeded once and reused by later runs. Every
+operation calls the service function directly on its own session, the way a
+request would. Time is measured without tracing; peak memory comes from one
+extra traced call.
+
+--save stores the results as the baseline for the size. --compare checks them
+against the stored baseline and exits with status 1 when an operation's
+median time or peak memory grew by more than --max-regression percent.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base, make_engine
+from app.models.client import Client
+from app.models.transaction import Transaction
+from app.services import client_service, seed_service, transaction_service
+from app.services.seed_service import SeedConfig
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines", "services.json")
+SEED = 7
+
+# Iterations per operation. Full-table reads repeat until they have read
+# about FULL_SCAN_ROWS rows in total, and at least three times.
+FULL_SCAN_ROWS = 300_000
+OPERATIONS = {
+    "deposit": 200,
+    "withdraw": 200,
+    "create_transfer": 200,
+    "reverse_transaction": 100,
+    "statement_pdf": 20,
+    "get_all_transactions": 3,
+}
+
+
+def seed_config(size: str) -> SeedConfig:
+    # Uniform activity and generous opening balances, so the withdrawals and
+    # reversals being timed never run into insufficient funds.
+    transactions = SIZES[size]
+    return SeedConfig(
+        clients=max(transactions // 100, 100),
+        managers=0,
+        transactions=transactions,
+        seed=SEED,
+        prefix="b",
+        initial_min=Decimal("10000.00"),
+        initial_max=Decimal("10000.00"),
+        skew=0.0,
+    )
+
+
+@contextmanager
+def seeded_db(size: str, path: str | None = None):
+    # Same shape as the test_db fixture in tests/conftest.py: a file database,
+    # NullPool, a plain sessionmaker and best-effort cleanup.
+    temporary = path is None
+    if temporary:
+        fd, path = tempfile.mkstemp(prefix="bench_db_", suffix=".sqlite3")
+        os.close(fd)
+        os.remove(path)
+    fresh = not os.path.exists(path)
+
+    engine = make_engine(f"sqlite:///{path}", "wal", poolclass=NullPool)
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    try:
+        if fresh:
+            Base.metadata.create_all(bind=engine)
+            report = seed_service.generate(engine, seed_config(size))
+            print(
+                f"seeded {report['transactions']} transactions in "
+                f"{report['elapsed_seconds']:.1f}s",
+                file=sys.stderr,
+            )
+        yield SessionLocal
+    finally:
+        engine.dispose()
+        if temporary:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(path + suffix)
+                except FileNotFoundError:
+                    pass
+
+
+def _candidates(SessionLocal, rng: random.Random) -> dict:
+    db = SessionLocal()
+    try:
+        client_ids = db.scalars(select(Client.id)).all()
+        last_id = db.scalar(select(func.max(Transaction.transaction_id)))
+        reversible = db.scalars(
+            select(Transaction.transaction_id)
+            .where(
+                Transaction.type == "transfer_out",
+                Transaction.is_reversed.is_(False),
+                Transaction.reversal_of_id.is_(None),
+                Transaction.transaction_id > last_id // 2,
+            )
+            .limit(OPERATIONS["reverse_transaction"] * 2)
+        ).all()
+    finally:
+        db.close()
+    rng.shuffle(reversible)
+    return {"clients": client_ids, "reversible": reversible}
+
+
+def _operations(rng: random.Random, candidates: dict) -> dict:
+    clients = candidates["clients"]
+    reversible = iter(candidates["reversible"])
+    amount = Decimal("1.00")
+
+    def pair():
+        sender, receiver = rng.sample(clients, 2)
+        return sender, receiver
+
+    return {
+        "deposit": lambda db: client_service.deposit(db, rng.choice(clients), amount),
+        "withdraw": lambda db: client_service.withdraw(db, rng.choice(clients), amount),
+        "create_transfer": lambda db: client_service.create_transfer(
+            db, *pair(), amount
+        ),
+        "reverse_transaction": lambda db: transaction_service.reverse_transaction(
+            db, next(reversible)
+        ),
+        "statement_pdf": lambda db: client_service.generate_client_statement_pdf(
+            db, rng.choice(clients)
+        ),
+        "get_all_transactions": transaction_service.get_all_transactions,
+    }
+
+
+def _call(SessionLocal, operation):
+    db = SessionLocal()
+    try:
+        operation(db)
+    finally:
+        db.close()
+
+
+def measure(SessionLocal, operation, iterations: int) -> dict:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        _call(SessionLocal, operation)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        _call(SessionLocal, operation)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run(size: str, ops: list[str], path: str | None = None) -> dict:
+    rng = random.Random(SEED)
+    results = {}
+    with seeded_db(size, path) as SessionLocal:
+        operations = _operations(rng, _candidates(SessionLocal, rng))
+        for name in ops:
+            iterations = OPERATIONS[name]
+            if name == "get_all_transactions":
+                iterations = max(iterations, FULL_SCAN_ROWS // SIZES[size])
+            results[name] = measure(SessionLocal, operations[name], iterations)
+    return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("median_ms", "peak_kib"):
+            if not previous[metric]:
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric] * 100
+            if change > max_regression:
+                regressions.append(
+                    f"{name} {metric}: {previous[metric]} -> {current[metric]} "
+                    f"(+{change:.1f}%)"
+                )
+    return regressions
+
+
+def _load_baselines(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--db", help="seed once into this file and reuse it")
+    parser.add_argument("--ops", default=",".join(OPERATIONS))
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=30.0)
+    args = parser.parse_args()
+
+    ops = [name for name in args.ops.split(",") if name]
+    unknown = set(ops) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    results = run(args.size, ops, args.db)
+    print(f"{'operation':<22}{'median ms':>12}{'p95 ms':>12}{'peak KiB':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<22}{result['median_ms']:>12.3f}{result['p95_ms']:>12.3f}"
+            f"{result['peak_kib']:>12.1f}"
+        )
+
+    baselines = _load_baselines(args.baselines)
+    if args.save:
+        baselines[args.size] = {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "operations": results,
+        }
+        os.makedirs(os.path.dirname(args.baselines) or ".", exist_ok=True)
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        if args.size not in baselines:
+            sys.exit(f"No {args.size} baseline in {args.baselines}")
+        regressions = compare(
+            results, baselines[args.size]["operations"], args.max_regression
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression above {args.max_regression}%")
+
+
+if __name__ == "__main__":
+    main()
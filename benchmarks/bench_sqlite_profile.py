@@ -0,0 +1,118 @@
+"""Mixed read/write throughput for each SQLite engine profile.
+
+Usage: python -m benchmarks.bench_sqlite_profile [--threads 8] [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, SQLITE_PROFILES, make_engine
+from app.services.client_service import create_client, deposit, personal_data
+
+CLIENTS = 50
+
+
+def _seed(SessionLocal):
+    db = SessionLocal()
+    try:
+        for i in range(CLIENTS):
+            create_client(
+                db,
+                id=f"bench{i}",
+                name="Bench",
+                surname=str(i),
+                email=f"bench{i}@example.com",
+                initial_balance=Decimal("100.00"),
+            )
+    finally:
+        db.close()
+
+
+def _worker(SessionLocal, stop_at, write_ratio, counters, lock):
+    rnd = random.Random()
+    reads = writes = errors = 0
+    while time.perf_counter() < stop_at:
+        client_id = f"bench{rnd.randrange(CLIENTS)}"
+        db = SessionLocal()
+        try:
+            if rnd.random() < write_ratio:
+                deposit(db, client_id, Decimal("1.00"))
+                writes += 1
+            else:
+                personal_data(db, client_id)
+                reads += 1
+        except Exception:
+            db.rollback()
+            errors += 1
+        finally:
+            db.close()
+    with lock:
+        counters["reads"] += reads
+        counters["writes"] += writes
+        counters["errors"] += errors
+
+
+def run_profile(profile: str, threads: int, seconds: float, write_ratio: float):
+    fd, path = tempfile.mkstemp(prefix=f"bench_{profile}_", suffix=".sqlite3")
+    os.close(fd)
+    engine = make_engine(f"sqlite:///{path}", profile)
+    try:
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine)
+        _seed(SessionLocal)
+
+        counters = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        stop_at = time.perf_counter() + seconds
+        pool = [
+            threading.Thread(
+                target=_worker,
+                args=(SessionLocal, stop_at, write_ratio, counters, lock),
+            )
+            for _ in range(threads)
+        ]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+    finally:
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+
+    ops = counters["reads"] + counters["writes"]
+    return {
+        "profile": profile,
+        "ops_per_sec": round(ops / seconds, 1),
+        **counters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile, args.threads, args.seconds, args.write_ratio)
+        print(
+            f"{result['profile']:>8}: {result['ops_per_sec']:>9} ops/s  "
+            f"reads={result['reads']} writes={result['writes']} "
+            f"errors={result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -72,6 +72,18 @@ def get_transactions(client_id: str) -> List[Dict]:
     return _handle_response(resp)
 
 
+def get_client_summary(client_id: str) -> Dict:
+    url = f"{API_BASE_URL}/clients/{client_id}/summary"
+    resp = requests.get(url, timeout=20)
+    return _handle_response(resp)
+
+
+def get_all_client_summaries() -> List[Dict]:
+    url = f"{API_BASE_URL}/clients/summaries"
+    resp = requests.get(url, timeout=20)
+    return _handle_response(resp)
+
+
 def get_personal_data(client_id: str) -> Dict:
     url = f"{API_BASE_URL}/clients/{client_id}/personal_data"
     resp = requests.get(url, timeout=20)
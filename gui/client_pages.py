@@ -6,6 +6,7 @@ from api_client import (
     withdraw_money,
     transfer_money,
     get_transactions,
+    get_client_summary,
     get_personal_data,
     get_statement_pdf_response,
 )
@@ -24,7 +25,7 @@ def page_client_profile(client_id: str):
     if not client_id:
         st.info("Client ID not provided.")
         return
-    render_client_profile(client_id, get_personal_data)
+    render_client_profile(client_id, get_personal_data, get_client_summary)
 
 
 def page_client_deposit(client_id: str):
@@ -36,7 +37,7 @@ def page_client_deposit(client_id: str):
             try:
                 amt = Decimal(str(amount_str))
                 data = deposit_money(client_id, amt)
-                st.success(f"Deposit succeded. Updated balance: {data.get('_balance')}")
+                st.success(f"Deposit succeded. Updated balance: {data.get('balance')}")
             except Exception as e:
                 st.error(f"Deposit error: {e}")
 
@@ -51,7 +52,7 @@ def page_client_withdraw(client_id: str):
                 amt = Decimal(str(amount_str))
                 data = withdraw_money(client_id, amt)
                 st.success(
-                    f"Withdrawal succeded. Updated balance: {data.get('_balance')}"
+                    f"Withdrawal succeded. Updated balance: {data.get('balance')}"
                 )
             except Exception as e:
                 st.error(f"Withdrawal error: {e}")
@@ -67,9 +68,7 @@ def page_client_transfer(client_id: str):
             try:
                 amt = Decimal(str(amount_str))
                 data = transfer_money(client_id, receiver_str, amt)
-                st.success(
-                    f"Transfer succeded. Updated balance: {data.get('_balance')}"
-                )
+                st.success(f"Transfer succeded. Updated balance: {data.get('balance')}")
             except Exception as e:
                 st.error(f"Transfer error: {e}")
 
@@ -104,7 +104,10 @@ def prepare_user_df(df, rename_map, columns, parse_date=True):
     return df
 
 
-def prepare_client_df(clients):
+SUMMARY_COLUMNS = {"total_in": "Total In", "total_out": "Total Out", "net": "Net"}
+
+
+def prepare_client_df(clients, summaries=None):
     rename_map = {
         "id": "ID",
         "name": "Name",
@@ -112,15 +115,19 @@ def prepare_client_df(clients):
         "email": "Email",
         "role": "Role",
         "created_at": "Created",
-        "_balance": "Balance",
+        "balance": "Balance",
     }
 
-    return prepare_user_df(
-        pd.DataFrame(clients),
-        rename_map,
-        ["ID", "Name", "Surname", "Email", "Balance", "Created"],
-        parse_date=True,
-    )
+    columns = ["ID", "Name", "Surname", "Email", "Balance", "Created"]
+    df = pd.DataFrame(clients)
+
+    if summaries:
+        totals = pd.DataFrame(summaries)[["client_id", *SUMMARY_COLUMNS]]
+        df = df.merge(totals, how="left", left_on="id", right_on="client_id")
+        rename_map.update(SUMMARY_COLUMNS)
+        columns += list(SUMMARY_COLUMNS.values())
+
+    return prepare_user_df(df, rename_map, columns, parse_date=True)
 
 
 def prepare_manager_df(managers):
@@ -187,7 +194,7 @@ def render_manager_profile(manager_id, get_data_fn):
     )
 
 
-def render_client_profile(client_id, get_data_fn):
+def render_client_profile(client_id, get_data_fn, get_summary_fn=None):
 
     try:
         data = get_data_fn(client_id)
@@ -195,11 +202,20 @@ def render_client_profile(client_id, get_data_fn):
         st.error(f"Load client data error: {e}")
         return
 
-    balance = data.get("_balance", "—")
+    balance = data.get("balance", "—")
+    extra_fields = {"Balance": balance}
+
+    if get_summary_fn:
+        try:
+            summary = get_summary_fn(client_id)
+            for key, label in SUMMARY_COLUMNS.items():
+                extra_fields[label] = summary.get(key, "—")
+        except Exception as e:
+            st.warning(f"Load client summary error: {e}")
 
     render_profile_base(
         data=data,
         person_id=client_id,
         title="Client Profile",
-        extra_fields={"Balance": balance},
+        extra_fields=extra_fields,
     )
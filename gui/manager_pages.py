@@ -2,6 +2,7 @@ import streamlit as st
 
 from api_client import (
     get_all_clients,
+    get_all_client_summaries,
     delete_person,
     add_client,
 )
@@ -44,7 +45,13 @@ def page_manager_list_users():
             st.info("No clients.")
         else:
 
-            df = prepare_client_df(clients)
+            try:
+                summaries = get_all_client_summaries()
+            except Exception as e:
+                st.warning(f"Unable to retrieve client totals: {e}")
+                summaries = None
+
+            df = prepare_client_df(clients, summaries)
 
             with st.expander("Filters", expanded=False):
                 filters = build_user_filters(prefix="client_", include_balance=True)
@@ -53,7 +60,7 @@ def page_manager_list_users():
 
                 filter_and_display_table(
                     df=df,
-                    columns=["ID", "Name", "Surname", "Email", "Balance", "Created"],
+                    columns=list(df.columns),
                     text_filter_map={
                         "ID": filters["id"],
                         "Name": filters["name"],
@@ -0,0 +1,258 @@
+"""Closed-loop load generator for a running banking API.
+
+Usage: python -m loadtest.runner loadtest/scenarios/deposit_heavy.json
+       [--base-url http://127.0.0.1:8000] [--duration 30] [--concurrency 32]
+       [--report report.json]
+
+A scenario file describes the setup (how many clients/managers to create)
+and a weighted mix of requests; see loadtest/scenarios/ for examples.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+
+import httpx
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+SETUP_CONCURRENCY = 16
+
+
+@dataclass
+class RequestSpec:
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    params: dict = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: list[RequestSpec]
+    duration_seconds: float = 30.0
+    concurrency: int = 32
+    target_rps: float | None = None
+    seed: int = 1
+    id_prefix: str = "lt"
+    clients: int = 100
+    managers: int = 0
+    initial_balance: str = "1000.00"
+    amount_min: str = "1.00"
+    amount_max: str = "50.00"
+
+    @classmethod
+    def load(cls, path: str) -> "Scenario":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        setup = data.pop("setup", {})
+        amount = data.pop("amount", {})
+        requests = [RequestSpec(**spec) for spec in data.pop("requests")]
+        if not requests:
+            raise ValueError("Scenario has no requests")
+        return cls(
+            requests=requests,
+            clients=setup.get("clients", cls.clients),
+            managers=setup.get("managers", cls.managers),
+            initial_balance=setup.get("initial_balance", cls.initial_balance),
+            amount_min=amount.get("min", cls.amount_min),
+            amount_max=amount.get("max", cls.amount_max),
+            **data,
+        )
+
+    def client_ids(self) -> list[str]:
+        return [f"{self.id_prefix}-c{i}" for i in range(self.clients)]
+
+    def manager_ids(self) -> list[str]:
+        return [f"{self.id_prefix}-m{i}" for i in range(self.managers)]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[str, int]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, name: str, seconds: float, status: int | None):
+        self.latencies.setdefault(name, []).append(seconds)
+        counts = self.statuses.setdefault(name, {})
+        key = str(status) if status is not None else "transport_error"
+        counts[key] = counts.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, name: str, latencies: list[float], elapsed: float) -> dict:
+        ms = sorted(x * 1000 for x in latencies)
+        return {
+            "requests": len(ms),
+            "errors": self.errors.get(name, 0) if name != "total" else None,
+            "rps": round(len(ms) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(ms, 50), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+            "max_ms": round(ms[-1], 2) if ms else 0.0,
+        }
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name, latencies in sorted(self.latencies.items()):
+            endpoints[name] = {
+                **self.summary(name, latencies, elapsed),
+                "status_counts": self.statuses[name],
+            }
+        total = self.summary(
+            "total", [x for values in self.latencies.values() for x in values], elapsed
+        )
+        total["errors"] = sum(self.errors.values())
+        return {"total": total, "endpoints": endpoints}
+
+
+def _amount(rng: random.Random, scenario: Scenario) -> str:
+    low = int(Decimal(scenario.amount_min) * 100)
+    high = int(Decimal(scenario.amount_max) * 100)
+    return str(Decimal(rng.randint(low, high)) / 100)
+
+
+def _render(spec: RequestSpec, rng: random.Random, scenario: Scenario, ids: dict):
+    client, receiver = rng.sample(ids["clients"], 2)
+    values = {
+        "client": client,
+        "receiver": receiver,
+        "manager": rng.choice(ids["managers"]) if ids["managers"] else "",
+        "amount": _amount(rng, scenario),
+    }
+    path = spec.path.format(**values)
+    params = {key: str(value).format(**values) for key, value in spec.params.items()}
+    return path, params
+
+
+async def setup(http: httpx.AsyncClient, scenario: Scenario):
+    # Existing ids (from an earlier run with the same prefix) are reused.
+    semaphore = asyncio.Semaphore(SETUP_CONCURRENCY)
+
+    async def create(path: str, person_id: str, extra: dict):
+        params = {
+            "id": person_id,
+            "name": "Load",
+            "surname": person_id,
+            "email": f"{person_id}@loadtest.example",
+            **extra,
+        }
+        async with semaphore:
+            r = await http.post(path, params=params)
+        if r.status_code != 200 and "already exists" not in r.text:
+            raise RuntimeError(f"Setup failed for {person_id}: {r.text}")
+
+    await asyncio.gather(
+        *(
+            create("/clients/add", person_id, {"balance": scenario.initial_balance})
+            for person_id in scenario.client_ids()
+        ),
+        *(
+            create("/managers/add", person_id, {})
+            for person_id in scenario.manager_ids()
+        ),
+    )
+
+
+async def run_scenario(
+    scenario: Scenario, base_url: str = DEFAULT_BASE_URL, transport=None
+) -> dict:
+    if scenario.clients < 2:
+        raise ValueError("Scenarios need at least two clients")
+    limits = httpx.Limits(max_connections=scenario.concurrency + SETUP_CONCURRENCY)
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=60
+    ) as http:
+        await setup(http, scenario)
+
+        ids = {"clients": scenario.client_ids(), "managers": scenario.manager_ids()}
+        weights = [spec.weight for spec in scenario.requests]
+        recorder = Recorder()
+        started_at = datetime.now()
+        started = time.perf_counter()
+        stop_at = started + scenario.duration_seconds
+        interval = 1 / scenario.target_rps if scenario.target_rps else 0.0
+        next_slot = started
+
+        async def worker(n: int):
+            nonlocal next_slot
+            rng = random.Random(scenario.seed * 1_000_003 + n)
+            while True:
+                if interval:
+                    slot, next_slot = next_slot, max(next_slot, time.perf_counter())
+                    next_slot += interval
+                    await asyncio.sleep(max(slot - time.perf_counter(), 0))
+                if time.perf_counter() >= stop_at:
+                    return
+                spec = rng.choices(scenario.requests, weights)[0]
+                path, params = _render(spec, rng, scenario, ids)
+                sent = time.perf_counter()
+                try:
+                    r = await http.request(spec.method, path, params=params)
+                    await r.aread()
+                    status = r.status_code
+                except httpx.HTTPError:
+                    status = None
+                recorder.record(spec.name, time.perf_counter() - sent, status)
+
+        await asyncio.gather(*(worker(n) for n in range(scenario.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": scenario.name,
+        "base_url": base_url,
+        "started_at": started_at.isoformat(),
+        "duration_seconds": round(elapsed, 3),
+        "concurrency": scenario.concurrency,
+        "target_rps": scenario.target_rps,
+        "seed": scenario.seed,
+        **recorder.report(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a load-test scenario.")
+    parser.add_argument("scenario")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--duration", type=float)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--target-rps", type=float)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--report", help="write the JSON report here")
+    args = parser.parse_args()
+
+    scenario = Scenario.load(args.scenario)
+    for option, attribute in (
+        ("duration", "duration_seconds"),
+        ("concurrency", "concurrency"),
+        ("target_rps", "target_rps"),
+        ("seed", "seed"),
+    ):
+        value = getattr(args, option)
+        if value is not None:
+            setattr(scenario, attribute, value)
+
+    report = asyncio.run(run_scenario(scenario, args.base_url))
+    text = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as out:
+            out.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
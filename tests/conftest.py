@@ -4,13 +4,19 @@ import time
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.core.database import Base
+from app.core.cache import response_cache
+from app.core.database import DATABASE_URL, Base, make_async_engine
 from app.api import clients as clients_router
 from app.api import managers as managers_router
+from app.api import persons as persons_router
+from app.api import transactions as transactions_router
+
+ROUTERS = (clients_router, managers_router, persons_router, transactions_router)
 
 
 @pytest.fixture
@@ -27,10 +33,20 @@ def test_db():
     )
     TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+    async_engine = make_async_engine(url, "legacy", poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, expire_on_commit=False
+    )
+
     Base.metadata.create_all(bind=engine)
 
     try:
-        yield {"engine": engine, "SessionLocal": TestingSessionLocal, "path": path}
+        yield {
+            "engine": engine,
+            "SessionLocal": TestingSessionLocal,
+            "AsyncSessionLocal": TestingAsyncSessionLocal,
+            "path": path,
+        }
     finally:
 
         try:
@@ -56,24 +72,30 @@ def test_db():
 @pytest.fixture
 def client(test_db):
 
-    TestingSessionLocal = test_db["SessionLocal"]
+    TestingAsyncSessionLocal = test_db["AsyncSessionLocal"]
+    response_cache.watch(f"sqlite:///{test_db['path']}")
 
-    def _override_get_db():
-        db = TestingSessionLocal()
-        try:
+    async def _override_get_db():
+        async with TestingAsyncSessionLocal() as db:
             yield db
-        finally:
-            db.close()
 
-    app.dependency_overrides[clients_router.get_db] = _override_get_db
-    app.dependency_overrides[managers_router.get_db] = _override_get_db
+    for router in ROUTERS:
+        app.dependency_overrides[router.get_db] = _override_get_db
+        if hasattr(router, "get_session_factory"):
+            app.dependency_overrides[router.get_session_factory] = (
+                lambda: TestingAsyncSessionLocal
+            )
 
     try:
         with TestClient(app) as c:
             yield c
     finally:
-        app.dependency_overrides.pop(clients_router.get_db, None)
-        app.dependency_overrides.pop(managers_router.get_db, None)
+        response_cache.watch(DATABASE_URL)
+        for router in ROUTERS:
+            app.dependency_overrides.pop(router.get_db, None)
+            app.dependency_overrides.pop(
+                getattr(router, "get_session_factory", None), None
+            )
 
 
 @pytest.fixture
@@ -84,3 +106,20 @@ def db_session(test_db):
         yield db
     finally:
         db.close()
+
+
+@pytest.fixture
+def add_client(client):
+    def _add(id_, balance="10.00"):
+        return client.post(
+            "/clients/add",
+            params={
+                "id": id_,
+                "name": id_.capitalize(),
+                "surname": "Test",
+                "email": f"{id_}@example.com",
+                "balance": balance,
+            },
+        )
+
+    return _add
@@ -0,0 +1,110 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.models.balance_checkpoint import BalanceCheckpoint
+from app.models.transaction import Transaction
+from app.services.checkpoint_service import build_checkpoints
+from app.services.rollup_service import rebuild_rollups
+
+
+def _seed_history(client, db_session):
+    client.post(
+        "/clients/add",
+        params={"id": "bc1", "name": "B", "surname": "C", "email": "bc1@example.com"},
+    )
+    start = datetime.combine(date.today() - timedelta(days=3), datetime.min.time())
+    history = [
+        (start + timedelta(hours=9), "deposit", "100.00"),
+        (start + timedelta(hours=15), "withdrawal", "30.00"),
+        (start + timedelta(days=1, hours=10), "transfer_in", "20.00"),
+        (start + timedelta(days=2, hours=11), "transfer_out", "5.50"),
+    ]
+    for timestamp, tx_type, amount in history:
+        db_session.add(
+            Transaction(
+                client_id="bc1",
+                type=tx_type,
+                amount=Decimal(amount),
+                timestamp=timestamp,
+            )
+        )
+    db_session.commit()
+    rebuild_rollups(db_session)
+    return start
+
+
+def _balance(client, as_of):
+    r = client.get("/clients/bc1/balance", params={"as_of": as_of.isoformat()})
+    assert r.status_code == 200
+    return r.json()
+
+
+def test_balance_as_of_replays_from_nearest_checkpoint(client, db_session):
+    start = _seed_history(client, db_session)
+
+    before = _balance(client, start + timedelta(days=1, hours=12))
+    assert Decimal(str(before["balance"])) == Decimal("90.00")
+    assert before["checkpoint_day"] is None
+    assert before["replayed_transactions"] == 3
+
+    assert build_checkpoints(db_session) == 3
+    assert build_checkpoints(db_session) == 0
+
+    after = _balance(client, start + timedelta(days=1, hours=12))
+    assert Decimal(str(after["balance"])) == Decimal("90.00")
+    assert after["checkpoint_day"] == start.date().isoformat()
+    assert after["replayed_transactions"] == 1
+
+    latest = _balance(client, start + timedelta(days=3))
+    assert Decimal(str(latest["balance"])) == Decimal("84.50")
+    assert latest["replayed_transactions"] == 0
+
+    assert Decimal(str(_balance(client, start)["balance"])) == Decimal("0.00")
+
+
+def test_build_checkpoints_is_incremental(client, db_session):
+    start = _seed_history(client, db_session)
+
+    assert build_checkpoints(db_session, through=start.date()) == 1
+    assert build_checkpoints(db_session) == 2
+    checkpoints = db_session.query(BalanceCheckpoint).order_by("day").all()
+    assert [Decimal(str(c.balance)) for c in checkpoints] == [
+        Decimal("70.00"),
+        Decimal("90.00"),
+        Decimal("84.50"),
+    ]
+
+    with pytest.raises(ValueError):
+        build_checkpoints(db_session, through=date.today())
+
+
+def test_build_checkpoints_seeks_rollups_per_client(test_db, db_session):
+    engine = test_db["engine"]
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM clients JOIN daily_rollups" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        build_checkpoints(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    ((statement, parameters),) = statements
+    plan = [
+        row[-1]
+        for row in db_session.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+    ]
+    assert plan[0].startswith("SCAN clients")
+    assert any(step.startswith("SEARCH daily_rollups") for step in plan)
+
+
+def test_balance_unknown_client(client):
+    assert client.get("/clients/ghost/balance").status_code == 400
@@ -0,0 +1,117 @@
+import sqlite3
+from decimal import Decimal
+
+from app.models.client import Client
+from app.models.transaction import Transaction
+from app.services import batch_service
+
+
+def test_batch_atomic_success(client, add_client, db_session):
+    add_client("ba", "100.00")
+    add_client("bb", "0.00")
+
+    r = client.post(
+        "/clients/batch",
+        json=[
+            {"op": "deposit", "client_id": "ba", "amount": "10.00"},
+            {"op": "withdrawal", "client_id": "ba", "amount": "30.00"},
+            {"op": "transfer", "client_id": "ba", "receiver_id": "bb", "amount": "50"},
+        ],
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["applied"] == 3
+    assert data["failed"] == 0
+    assert [item["status"] for item in data["results"]] == ["ok", "ok", "ok"]
+    assert data["results"][-1]["balance"] == 30.0
+
+    assert db_session.get(Client, "ba").balance == Decimal("30.00")
+    assert db_session.get(Client, "bb").balance == Decimal("50.00")
+
+
+def test_batch_atomic_failure_rolls_back_everything(client, add_client, db_session):
+    add_client("bc", "20.00")
+
+    r = client.post(
+        "/clients/batch",
+        json=[
+            {"op": "deposit", "client_id": "bc", "amount": "5.00"},
+            {"op": "withdrawal", "client_id": "bc", "amount": "500.00"},
+            {"op": "deposit", "client_id": "bc", "amount": "5.00"},
+        ],
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert [item["status"] for item in data["results"]] == [
+        "rolled_back",
+        "error",
+        "skipped",
+    ]
+    assert data["results"][1]["detail"] == "Insufficient funds"
+
+    assert db_session.get(Client, "bc").balance == Decimal("20.00")
+    assert db_session.query(Transaction).filter_by(client_id="bc").count() == 1
+
+
+def test_batch_best_effort_isolates_failures(client, add_client, db_session):
+    add_client("bd", "20.00")
+
+    r = client.post(
+        "/clients/batch",
+        params={"mode": "best_effort", "chunk_size": 2},
+        json=[
+            {"op": "deposit", "client_id": "bd", "amount": "5.00"},
+            {"op": "withdrawal", "client_id": "bd", "amount": "500.00"},
+            {"op": "deposit", "client_id": "missing", "amount": "1.00"},
+            {"op": "withdrawal", "client_id": "bd", "amount": "10.00"},
+        ],
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["applied"] == 2
+    assert data["failed"] == 2
+    assert [item["detail"] for item in data["results"]] == [
+        None,
+        "Insufficient funds",
+        "Client not found",
+        None,
+    ]
+
+    assert db_session.get(Client, "bd").balance == Decimal("15.00")
+    assert db_session.query(Transaction).filter_by(client_id="bd").count() == 3
+
+
+def test_best_effort_chunk_commits_once(
+    client, add_client, db_session, test_db, monkeypatch
+):
+    add_client("be", "10.00")
+    seen = []
+    apply_operation = batch_service.apply_operation
+
+    def observed(db, operation):
+        # A second connection only sees what has actually been committed.
+        try:
+            return apply_operation(db, operation)
+        finally:
+            other = sqlite3.connect(test_db["path"])
+            seen.append(
+                other.execute("SELECT balance FROM clients WHERE id = 'be'").fetchone()[
+                    0
+                ]
+            )
+            other.close()
+
+    monkeypatch.setattr(batch_service, "apply_operation", observed)
+    r = client.post(
+        "/clients/batch",
+        params={"mode": "best_effort", "chunk_size": 3},
+        json=[
+            {"op": "deposit", "client_id": "be", "amount": "1.00"},
+            {"op": "withdrawal", "client_id": "be", "amount": "500.00"},
+            {"op": "deposit", "client_id": "be", "amount": "1.00"},
+            {"op": "deposit", "client_id": "be", "amount": "1.00"},
+        ],
+    )
+    assert r.status_code == 200 and r.json()["applied"] == 3
+    assert [float(balance) for balance in seen] == [10.0, 10.0, 10.0, 12.0]
+    assert db_session.get(Client, "be").balance == Decimal("13.00")
@@ -0,0 +1,32 @@
+from app.services.reconciliation_service import reconcile_range
+from benchmarks.bench_services import compare, seeded_db
+
+
+def test_seeded_db_reconciles():
+    with seeded_db("10k") as SessionLocal:
+        db = SessionLocal()
+        try:
+            report = reconcile_range(db, None, None)
+        finally:
+            db.close()
+
+    assert report["transactions"] >= 10_000
+    assert report["clients"] == 100
+    assert report["mismatches"] == []
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    baseline = {
+        "deposit": {"median_ms": 10.0, "peak_kib": 40.0},
+        "statement_pdf": {"median_ms": 30.0, "peak_kib": 800.0},
+    }
+    results = {
+        "deposit": {"median_ms": 12.0, "peak_kib": 40.0},
+        "statement_pdf": {"median_ms": 25.0, "peak_kib": 1200.0},
+        "get_all_transactions": {"median_ms": 99.0, "peak_kib": 1.0},
+    }
+
+    regressions = compare(results, baseline, max_regression=25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("statement_pdf peak_kib")
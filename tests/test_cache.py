@@ -0,0 +1,91 @@
+import asyncio
+import sqlite3
+import time
+
+from app.core.cache import ResponseCache, response_cache
+
+
+def test_lru_eviction_ttl_and_tag_invalidation():
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set("a", 1, ("t1",))
+    cache.set("b", 2, ("t2",))
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3, ("t2",))
+    assert cache.get("b") == (False, None)
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate("t2")
+    assert cache.get("c") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+    cache.ttl = 0.01
+    cache.set("d", 4, ())
+    time.sleep(0.02)
+    assert cache.get("d") == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = ResponseCache(max_entries=10, ttl=60)
+
+    async def loader():
+        cache.invalidate("t")
+        return "stale"
+
+    assert asyncio.run(cache.get_or_load("k", ("t",), loader)) == "stale"
+    assert cache.get("k") == (False, None)
+
+
+def test_personal_data_and_lists_are_invalidated_by_writes(client, add_client):
+    add_client("ca1")
+    add_client("ca2")
+
+    assert client.get("/clients/ca1/personal_data").json()["balance"] == 10.0
+    assert client.get("/clients/ca1/personal_data").json()["balance"] == 10.0
+    assert len(client.get("/clients/clients").json()) == 2
+    assert response_cache.stats()["hits"] == 1
+
+    client.post("/clients/ca1/ca2/transfer", params={"amount": "4.00"})
+    assert client.get("/clients/ca1/personal_data").json()["balance"] == 6.0
+    balances = {c["id"]: c["balance"] for c in client.get("/clients/clients").json()}
+    assert balances == {"ca1": 6.0, "ca2": 14.0}
+
+    page = client.get("/clients/ca2/transactions/page").json()
+    assert [t["type"] for t in page["items"]] == ["transfer_in", "deposit"]
+    tx_id = page["items"][0]["transaction_id"]
+    client.post(f"/transactions/transactions/{tx_id}/reverse")
+    page = client.get("/clients/ca2/transactions/page").json()
+    reversed_flags = {t["transaction_id"]: t["is_reversed"] for t in page["items"]}
+    assert len(reversed_flags) == 3 and reversed_flags[tx_id] is True
+
+    client.delete("/clients/delete/ca2")
+    assert [c["id"] for c in client.get("/clients/clients").json()] == ["ca1"]
+    assert client.get("/clients/ca2/personal_data").status_code == 400
+
+    stats = client.get("/cache/metrics").json()
+    assert stats["invalidations"] > 0 and stats["misses"] > 0
+
+
+def test_failed_write_keeps_cached_entry(client, add_client):
+    add_client("ca3", "1.00")
+    client.get("/clients/ca3/personal_data")
+    r = client.post("/clients/ca3/withdrawal", params={"amount": "5.00"})
+    assert r.status_code == 400
+    hits = response_cache.stats()["hits"]
+    assert client.get("/clients/ca3/personal_data").json()["balance"] == 1.0
+    assert response_cache.stats()["hits"] == hits + 1
+
+
+def test_writes_from_other_processes_are_seen(client, add_client, test_db):
+    add_client("ca4", "1.00")
+    assert client.get("/clients/ca4/personal_data").json()["balance"] == 1.0
+
+    # Stands in for another worker or a CLI writer: its commit never runs
+    # this process's invalidation hooks.
+    other = sqlite3.connect(test_db["path"])
+    with other:
+        other.execute("UPDATE clients SET balance = 7 WHERE id = 'ca4'")
+    other.close()
+
+    assert client.get("/clients/ca4/personal_data").json()["balance"] == 7.0
+    assert response_cache.stats()["stale"] == 1
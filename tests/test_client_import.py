@@ -0,0 +1,115 @@
+from decimal import Decimal
+
+from app.services.client_import_service import MAX_CHUNK_SIZE
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+
+
+def _import(client, body, **params):
+    if isinstance(body, str):
+        body = body.encode()
+    return client.post(
+        "/clients/import", content=body, params=params, headers=CSV_HEADERS
+    )
+
+
+def test_import_clients_with_initial_deposits(client):
+    body = "\n".join(
+        ["id,name,surname,email,balance"]
+        + [f"imp{i},Name{i},Surname{i},imp{i}@example.com,{i}.50" for i in range(25)]
+        + ['quoted,"Anna, ""Ann""","Multi\nLine",quoted@example.com,']
+    )
+    r = _import(client, body, chunk_size=10)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["rows"] == 26
+    assert data["imported"] == 26
+    assert data["deposits"] == 25
+    assert data["complete"] is True
+    assert data["errors"] == []
+
+    person = client.get("/clients/quoted/personal_data").json()
+    assert person["name"] == 'Anna, "Ann"'
+    assert person["surname"] == "Multi\nLine"
+    assert Decimal(str(person["balance"])) == Decimal("0.00")
+
+    assert client.get("/clients/imp3/personal_data").json()["balance"] == 3.5
+    history = client.get("/clients/imp3/transactions").json()
+    assert [(t["type"], t["amount"]) for t in history] == [("deposit", 3.5)]
+    rollups = client.get("/clients/imp3/rollups/daily").json()
+    assert rollups[0]["counts"]["deposit"] == 1
+    assert len(client.get("/clients/clients").json()) == 26
+
+
+def test_import_reports_row_errors(client):
+    client.post(
+        "/clients/add",
+        params={
+            "id": "taken",
+            "name": "A",
+            "surname": "B",
+            "email": "taken@example.com",
+        },
+    )
+    client.get("/clients/clients")  # cached list must be invalidated
+
+    body = "\r\n".join(
+        [
+            "ID,Name,Surname,Email,Balance",
+            "ok1,A,B,ok1@example.com,10",
+            "taken,A,B,new@example.com,1",
+            "ok2,A,B,taken@example.com,1",
+            "ok1,A,B,other@example.com,1",
+            "ok3,A,B,ok1@example.com,1",
+            "ok4,,B,ok4@example.com,1",
+            "ok5,A,B,ok5@example.com,-1",
+            "ok6,A,B,ok6@example.com,1.234",
+            "ok7,A,B,not-an-email,1",
+            "ok8,A,B",
+            "ok9,A,B,ok9@example.com,abc",
+            "",
+        ]
+    )
+    data = _import(client, body).json()
+
+    assert data["rows"] == 11
+    assert data["imported"] == 1
+    assert data["rejected"] == 10
+    assert [(e["line"], e["id"], e["detail"]) for e in data["errors"]] == [
+        (3, "taken", "User with this ID already exists"),
+        (4, "ok2", "User with this email already exists"),
+        (5, "ok1", "Duplicate id in file"),
+        (6, "ok3", "Duplicate email in file"),
+        (7, "ok4", "Missing name"),
+        (8, "ok5", "Initial balance cannot be negative"),
+        (9, "ok6", "Balance must have at most two decimal places"),
+        (10, "ok7", "Invalid email"),
+        (11, "ok8", "Expected 5 fields, got 3"),
+        (12, "ok9", "Invalid balance format"),
+    ]
+    ids = {c["id"] for c in client.get("/clients/clients").json()}
+    assert ids == {"taken", "ok1"}
+
+
+def test_import_rejects_bad_header_and_chunk_size(client):
+    r = _import(client, "id,name,email\nx,y,z@example.com\n")
+    assert r.status_code == 400
+    assert "surname" in r.json()["detail"]
+
+    r = _import(client, "id,name,surname,email,extra\n")
+    assert r.status_code == 400
+
+    r = _import(client, "")
+    assert r.status_code == 400
+
+    r = _import(client, "id,name,surname,email\n", chunk_size=MAX_CHUNK_SIZE + 1)
+    assert r.status_code == 400
+
+
+def test_import_stops_at_invalid_utf8(client):
+    body = "id,name,surname,email\na1,A,B,a1@example.com\n".encode() + b"a2,\xff,B,x\n"
+    data = _import(client, body).json()
+
+    assert data["imported"] == 1
+    assert data["complete"] is False
+    assert data["errors"][-1]["detail"] == "Invalid UTF-8; import stopped"
@@ -0,0 +1,88 @@
+from app.models.client import Client
+
+PEOPLE = [
+    ("cs1", "Alice", "Nowak", "alice.nowak@example.com", "10.00"),
+    ("cs2", "Alicja", "Kowalska", "alicja@bank.pl", "250.00"),
+    ("cs3", "Bob", "Al", "bob_al@example.com", "75.50"),
+    ("cs4", "Carol", "Smith", "carol%smith@example.com", "0.00"),
+]
+
+
+def _seed(client):
+    for id_, name, surname, email, balance in PEOPLE:
+        client.post(
+            "/clients/add",
+            params={
+                "id": id_,
+                "name": name,
+                "surname": surname,
+                "email": email,
+                "balance": balance,
+            },
+        )
+
+
+def _ids(resp):
+    assert resp.status_code == 200
+    return {item["id"] for item in resp.json()["items"]}
+
+
+def test_search_substring_uses_trigram_index(client):
+    _seed(client)
+
+    assert _ids(client.get("/clients/search", params={"name": "lic"})) == {
+        "cs1",
+        "cs2",
+    }
+    assert _ids(client.get("/clients/search", params={"email": "EXAMPLE.COM"})) == {
+        "cs1",
+        "cs3",
+        "cs4",
+    }
+    assert _ids(
+        client.get("/clients/search", params={"name": "ali", "email": "bank"})
+    ) == {"cs2"}
+
+
+def test_search_short_terms_and_wildcards(client):
+    _seed(client)
+
+    assert _ids(client.get("/clients/search", params={"surname": "al"})) == {
+        "cs2",
+        "cs3",
+    }
+    assert _ids(client.get("/clients/search", params={"email": "%"})) == {"cs4"}
+    assert _ids(client.get("/clients/search", params={"email": "b_"})) == {"cs3"}
+
+
+def test_search_balance_range_and_pagination(client):
+    _seed(client)
+
+    r = client.get(
+        "/clients/search", params={"balance_min": "10", "balance_max": "100"}
+    )
+    assert _ids(r) == {"cs1", "cs3"}
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get("/clients/search", params=params).json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ["cs4", "cs3", "cs2", "cs1"]
+
+
+def test_search_index_follows_updates_and_deletes(client, db_session):
+    _seed(client)
+
+    c = db_session.get(Client, "cs4")
+    c.name = "Caroline"
+    db_session.commit()
+    client.delete("/clients/delete/cs1")
+
+    assert _ids(client.get("/clients/search", params={"name": "caroline"})) == {"cs4"}
+    assert _ids(client.get("/clients/search", params={"name": "alice"})) == set()
@@ -202,3 +202,56 @@ def test_get_transactions_endpoint(client, db_session):
 
     count = db_session.query(Transaction).filter(Transaction.client_id == "t1").count()
     assert len(data) == count
+
+
+def test_transfer_to_unknown_receiver_keeps_sender_balance(client, db_session):
+    client.post(
+        "/clients/add",
+        params={
+            "id": "s3",
+            "name": "Sender3",
+            "surname": "S",
+            "email": "sender3@example.com",
+            "balance": "50.00",
+        },
+    )
+
+    r = client.post("/clients/s3/nobody/transfer", params={"amount": "20.00"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Client not found"
+
+    assert db_session.get(Client, "s3").balance == Decimal("50.00")
+    assert db_session.query(Transaction).filter_by(type="transfer_out").count() == 0
+
+
+def test_concurrent_withdrawals_never_overdraw(test_db):
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.client_service import create_client, withdraw
+
+    SessionLocal = test_db["SessionLocal"]
+    db = SessionLocal()
+    create_client(db, "w1", "Wendy", "W", "wendy@example.com", Decimal("100.00"))
+    db.close()
+
+    def _withdraw(_):
+        session = SessionLocal()
+        try:
+            withdraw(session, "w1", Decimal("30.00"))
+            return True
+        except ValueError:
+            session.rollback()
+            return False
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(_withdraw, range(8)))
+
+    assert results.count(True) == 3
+
+    db = SessionLocal()
+    try:
+        assert db.get(Client, "w1").balance == Decimal("10.00")
+        assert db.query(Transaction).filter_by(type="withdrawal").count() == 3
+    finally:
+        db.close()
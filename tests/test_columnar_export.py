@@ -0,0 +1,103 @@
+import io
+import threading
+from datetime import datetime
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.models.transaction import Transaction
+from app.services.client_service import create_client
+from app.services import columnar_export_service
+from app.services.columnar_export_service import (
+    write_clients_parquet,
+    write_transactions_dataset,
+)
+
+
+def _seed(db):
+    create_client(db, "pq1", "Pat", "Q", "pat@example.com", Decimal("12.34"))
+    create_client(db, "pq2", "Quinn", "Q", None, Decimal("0.00"))
+    db.add_all(
+        [
+            Transaction(
+                client_id="pq2",
+                type="deposit",
+                amount=Decimal("5.10"),
+                timestamp=datetime(2024, 1, 31, 23, 59),
+            ),
+            Transaction(
+                client_id="pq2",
+                type="withdrawal",
+                amount=Decimal("1.00"),
+                timestamp=datetime(2024, 2, 1, 0, 1),
+                is_reversed=True,
+            ),
+        ]
+    )
+    db.commit()
+
+
+def test_parquet_endpoint_is_typed(client, db_session):
+    _seed(db_session)
+
+    r = client.get("/transactions/export/columnar", params={"client_id": "pq2"})
+    assert r.status_code == 200
+    table = pq.read_table(io.BytesIO(r.content))
+
+    assert table.schema.field("amount").type == pa.decimal128(12, 2)
+    assert table.schema.field("timestamp").type == pa.timestamp("us")
+    assert table.schema.field("is_reversed").type == pa.bool_()
+    assert table.column("amount").to_pylist() == [Decimal("5.10"), Decimal("1.00")]
+    assert table.column("is_reversed").to_pylist() == [False, True]
+
+
+def test_arrow_stream_endpoint(client, db_session):
+    _seed(db_session)
+
+    r = client.get("/transactions/export/columnar", params={"format": "arrow"})
+    assert r.status_code == 200
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.num_rows == 3
+    assert table.column("client_id").to_pylist() == ["pq2", "pq2", "pq1"]
+
+
+def test_batches_are_built_off_the_event_loop(client, db_session, monkeypatch):
+    _seed(db_session)
+    rows_to_batch = columnar_export_service.rows_to_batch
+    threads = []
+
+    def recording_rows_to_batch(rows, schema):
+        threads.append(threading.current_thread())
+        return rows_to_batch(rows, schema)
+
+    monkeypatch.setattr(
+        columnar_export_service, "rows_to_batch", recording_rows_to_batch
+    )
+    r = client.get("/transactions/export/columnar", params={"format": "parquet"})
+    assert r.status_code == 200
+    assert pq.read_table(io.BytesIO(r.content)).num_rows == 3
+    assert threads and all(
+        thread.name.startswith("AnyIO worker thread") for thread in threads
+    )
+
+
+def test_dataset_is_partitioned_by_month(db_session, tmp_path):
+    _seed(db_session)
+
+    months = write_transactions_dataset(db_session, str(tmp_path / "tx"), 1)
+    assert months["2024-01"] == 1
+    assert months["2024-02"] == 1
+    assert sum(months.values()) == 3
+
+    dataset = ds.dataset(str(tmp_path / "tx"), format="parquet", partitioning="hive")
+    feb = dataset.to_table(filter=ds.field("month") == "2024-02")
+    assert feb.column("type").to_pylist() == ["withdrawal"]
+
+    assert write_clients_parquet(db_session, str(tmp_path / "clients.parquet")) == 2
+    clients = pq.read_table(str(tmp_path / "clients.parquet"))
+    assert clients.column("balance").to_pylist() == [
+        Decimal("12.34"),
+        Decimal("0.00"),
+    ]
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.core.database import (
+    Base,
+    SqliteProfile,
+    ensure_indexes,
+    get_sqlite_profile,
+    make_engine,
+)
+from app.models.client import ensure_client_version_column
+
+
+def test_wal_profile_applies_pragmas(tmp_path):
+    engine = make_engine(
+        f"sqlite:///{tmp_path / 'wal.sqlite3'}", "wal", poolclass=NullPool
+    )
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+    finally:
+        engine.dispose()
+
+
+def test_custom_profile_object(tmp_path):
+    profile = SqliteProfile(busy_timeout_ms=1234, cache_size=-1000)
+    engine = make_engine(
+        f"sqlite:///{tmp_path / 'custom.sqlite3'}", profile, poolclass=NullPool
+    )
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -1000
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    finally:
+        engine.dispose()
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        get_sqlite_profile("turbo")
+
+
+def test_existing_database_gets_version_column_and_indexes(tmp_path):
+    engine = make_engine(
+        f"sqlite:///{tmp_path / 'old.sqlite3'}", "legacy", poolclass=NullPool
+    )
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_transactions_client_ts_id"))
+            conn.execute(text("ALTER TABLE clients DROP COLUMN version_id"))
+            conn.execute(
+                text(
+                    "INSERT INTO persons (id, name, surname, email, role) VALUES ('old', 'A', 'B', 'old@example.com', 'CLIENT')"
+                )
+            )
+            conn.execute(text("INSERT INTO clients (id, balance) VALUES ('old', 1)"))
+
+        for _ in range(2):
+            with engine.begin() as conn:
+                ensure_client_version_column(conn)
+                ensure_indexes(conn)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT version_id FROM clients")).scalar() == 1
+            indexes = {
+                row[1] for row in conn.execute(text("PRAGMA index_list(transactions)"))
+            }
+            assert "ix_transactions_client_ts_id" in indexes
+    finally:
+        engine.dispose()
@@ -0,0 +1,88 @@
+import sqlite3
+from unittest.mock import patch
+
+from app.core.cache import response_cache
+
+
+def _conditional(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_client_transactions_etag(client, add_client):
+    add_client("et1")
+    add_client("et2")
+    url = "/clients/et1/transactions"
+
+    r = client.get(url)
+    etag = r.headers["ETag"]
+    r = _conditional(client, url, etag)
+    assert r.status_code == 304 and r.content == b""
+    assert _conditional(client, url, f'W/{etag}, "other"').status_code == 304
+
+    client.post("/clients/et2/deposit", params={"amount": "1.00"})
+    assert _conditional(client, url, etag).status_code == 304
+
+    client.post("/clients/et1/deposit", params={"amount": "1.00"})
+    r = _conditional(client, url, etag)
+    assert r.status_code == 200 and len(r.json()) == 2
+    new_etag = r.headers["ETag"]
+    assert new_etag != etag
+
+    tx_id = r.json()[0]["transaction_id"]
+    client.post(f"/transactions/transactions/{tx_id}/reverse")
+    assert _conditional(client, url, new_etag).status_code == 200
+
+    assert client.get("/clients/ghost/transactions").status_code == 400
+
+
+def test_cached_body_keeps_its_own_etag(client, add_client, test_db, monkeypatch):
+    # Without a watched version, an out-of-band write is only seen once the
+    # cached body expires; until then the body must keep its own validator.
+    monkeypatch.setattr(response_cache, "version", None)
+    add_client("et5")
+    url = "/clients/et5/transactions"
+    first = client.get(url)
+
+    other = sqlite3.connect(test_db["path"])
+    with other:
+        other.execute(
+            "INSERT INTO transactions (client_id, type, amount, timestamp, "
+            "is_reversed) VALUES ('et5', 'deposit', 1, '2026-01-01', 0)"
+        )
+    other.close()
+
+    r = client.get(url)
+    assert r.json() == first.json()
+    assert r.headers["ETag"] == first.headers["ETag"]
+
+    response_cache.clear()
+    r = client.get(url)
+    assert len(r.json()) == len(first.json()) + 1
+    assert r.headers["ETag"] != first.headers["ETag"]
+
+
+def test_all_transactions_etag(client, add_client):
+    add_client("et3")
+    url = "/transactions/transactions"
+    etag = client.get(url).headers["ETag"]
+    assert _conditional(client, url, etag).status_code == 304
+
+    client.post("/clients/et3/withdrawal", params={"amount": "1.00"})
+    assert _conditional(client, url, etag).status_code == 200
+
+
+def test_statement_not_modified_skips_render(client, add_client):
+    add_client("et4")
+    url = "/clients/et4/statement"
+    r = client.get(url)
+    assert r.content.startswith(b"%PDF")
+    etag = r.headers["ETag"]
+
+    with patch("app.services.client_service.build_statement_pdf") as render:
+        r = _conditional(client, url, etag)
+    assert r.status_code == 304
+    render.assert_not_called()
+
+    client.post("/clients/et4/deposit", params={"amount": "2.00"})
+    r = _conditional(client, url, etag)
+    assert r.status_code == 200 and r.headers["ETag"] != etag
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+
+def _seed(client):
+    for id_, balance in (("e1", "40.00"), ("e2", "0.00")):
+        client.post(
+            "/clients/add",
+            params={
+                "id": id_,
+                "name": id_.upper(),
+                "surname": "Export",
+                "email": f"{id_}@example.com",
+                "balance": balance,
+            },
+        )
+    client.post("/clients/e1/e2/transfer", params={"amount": "15.00"})
+
+
+def test_export_transactions_ndjson(client):
+    _seed(client)
+
+    r = client.get("/transactions/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["type"] for row in rows] == ["deposit", "transfer_out", "transfer_in"]
+    assert Decimal(rows[1]["amount"]) == Decimal("15.00")
+    assert rows[1]["transfer_group_id"] == rows[2]["transfer_group_id"]
+
+    r = client.get(
+        "/transactions/export", params={"client_id": "e2", "type": "transfer_in"}
+    )
+    assert len(r.text.splitlines()) == 1
+
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    assert client.get("/transactions/export", params={"date_from": tomorrow}).text == ""
+
+
+def test_export_transactions_csv(client):
+    _seed(client)
+
+    r = client.get("/transactions/export", params={"format": "csv"})
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 3
+    assert rows[0]["client_id"] == "e1"
+    assert rows[0]["reversal_of_id"] == ""
+
+
+def test_export_clients(client):
+    _seed(client)
+
+    r = client.get("/clients/export", params={"format": "csv", "balance_min": "20"})
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [(row["id"], Decimal(row["balance"])) for row in rows] == [
+        ("e1", Decimal("25.00"))
+    ]
+
+    r = client.get("/clients/export", params={"email": "example"})
+    assert [json.loads(line)["id"] for line in r.text.splitlines()] == ["e1", "e2"]
+
+
+def test_export_rejects_unknown_format(client):
+    r = client.get("/transactions/export", params={"format": "xml"})
+    assert r.status_code == 400
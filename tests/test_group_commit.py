@@ -0,0 +1,220 @@
+import asyncio
+import sqlite3
+from decimal import Decimal
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool
+
+from app.core import group_commit, profiler
+from app.core.database import make_async_engine
+from app.core.group_commit import GroupCommitter, WriterQueueFullError
+from app.models.client import Client
+from app.models.transaction import Transaction
+from app.schemas.batch import BatchMode, BatchOperation
+from app.services.batch_service import apply_batch_async
+from app.services.client_service import (
+    apply_deposit,
+    create_client,
+    deposit_async,
+    withdraw_async,
+)
+
+
+def test_group_commit_coalesces_and_isolates_errors(test_db, db_session):
+    failed = REGISTRY.get_sample_value(
+        "bank_writer_writes_total", {"outcome": "failed"}
+    )
+    create_client(db_session, "g1", "Gus", "G", "gus@example.com", Decimal("10.00"))
+    db_session.close()
+
+    async def scenario():
+        await group_commit.start_group_commit(test_db["AsyncSessionLocal"], 50, 64)
+        try:
+            calls = [deposit_async(None, "g1", Decimal("1.00")) for _ in range(10)]
+            calls.append(withdraw_async(None, "g1", Decimal("1000.00")))
+            calls.append(deposit_async(None, "missing", Decimal("1.00")))
+            results = await asyncio.gather(*calls, return_exceptions=True)
+            metrics = dict(group_commit.get_group_committer().metrics)
+        finally:
+            await group_commit.stop_group_commit()
+        return results, metrics
+
+    results, metrics = asyncio.run(scenario())
+
+    assert all(isinstance(r, dict) for r in results[:10])
+    assert str(results[10]) == "Insufficient funds"
+    assert str(results[11]) == "Client not found"
+    assert metrics["groups"] == 1
+    assert metrics["writes"] == 10
+    assert metrics["failed_writes"] == 2
+    assert metrics["queue_wait_seconds_max"] > 0
+    assert (
+        REGISTRY.get_sample_value("bank_writer_writes_total", {"outcome": "failed"})
+        == failed + 2
+    )
+    assert sorted(r["_balance"] for r in results[:10]) == [
+        Decimal("10.00") + i for i in range(1, 11)
+    ]
+
+    assert db_session.get(Client, "g1").balance == Decimal("20.00")
+    assert db_session.query(Transaction).filter_by(client_id="g1").count() == 11
+
+
+def test_group_members_commit_together(test_db, db_session):
+    create_client(db_session, "g3", "Gil", "G", "gil@example.com", Decimal("10.00"))
+    db_session.close()
+
+    def committed_balance(db):
+        # A second connection only sees what has actually been committed.
+        other = sqlite3.connect(test_db["path"])
+        try:
+            return other.execute(
+                "SELECT balance FROM clients WHERE id = 'g3'"
+            ).fetchone()[0]
+        finally:
+            other.close()
+
+    def failing_deposit(db):
+        apply_deposit(db, "g3", Decimal("5.00"))
+        raise ValueError("boom")
+
+    async def scenario():
+        committer = GroupCommitter(test_db["AsyncSessionLocal"], 50, 64)
+        await committer.start()
+        try:
+            return await asyncio.gather(
+                committer.submit(apply_deposit, "g3", Decimal("1.00")),
+                committer.submit(committed_balance),
+                committer.submit(failing_deposit),
+                committer.submit(committed_balance),
+                committer.submit(apply_deposit, "g3", Decimal("1.00")),
+                return_exceptions=True,
+            )
+        finally:
+            await committer.stop()
+
+    results = asyncio.run(scenario())
+
+    assert float(results[1]) == 10.0 and float(results[3]) == 10.0
+    assert str(results[2]) == "boom"
+    assert db_session.get(Client, "g3").balance == Decimal("12.00")
+
+
+def test_submit_requires_running_committer(test_db):
+    committer = GroupCommitter(test_db["AsyncSessionLocal"], 1)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(committer.submit(lambda db: None))
+
+
+def test_full_writer_queue_rejects_writes(test_db):
+    rejected = REGISTRY.get_sample_value("bank_writer_rejected_total")
+
+    async def scenario():
+        committer = GroupCommitter(test_db["AsyncSessionLocal"], 0, 1, max_queue=1)
+        await committer.start()
+        try:
+            first, second = await asyncio.gather(
+                committer.submit(lambda db: "a"),
+                committer.submit(lambda db: "b"),
+                return_exceptions=True,
+            )
+            return first, type(second), committer.metrics["rejected"]
+        finally:
+            await committer.stop()
+
+    assert asyncio.run(scenario()) == ("a", WriterQueueFullError, 1)
+    assert REGISTRY.get_sample_value("bank_writer_rejected_total") == rejected + 1
+
+
+def test_writes_are_profiled_for_their_submitter(test_db):
+    def count_clients(db):
+        return db.query(Client).count()
+
+    async def scenario():
+        committer = GroupCommitter(test_db["AsyncSessionLocal"], 20, 64)
+        await committer.start()
+        try:
+            with profiler.profile_queries() as first:
+                pending = asyncio.ensure_future(committer.submit(count_clients))
+            with profiler.profile_queries() as second:
+                await committer.submit_exclusive(count_clients)
+            await pending
+            return first, second
+        finally:
+            await committer.stop()
+
+    first, second = asyncio.run(scenario())
+    assert first.count > 0 and second.count > 0
+    assert profiler.current_stats() is None
+
+
+def test_writer_runs_batches_exclusively(test_db, db_session):
+    create_client(db_session, "g2", "Gia", "G", "gia@example.com", Decimal("5.00"))
+    db_session.close()
+    operations = [
+        BatchOperation(op="deposit", client_id="g2", amount=Decimal("1.00")),
+        BatchOperation(op="withdrawal", client_id="g2", amount=Decimal("100.00")),
+    ]
+
+    async def scenario():
+        await group_commit.start_group_commit(test_db["AsyncSessionLocal"], 5, 64)
+        try:
+            return await asyncio.gather(
+                deposit_async(None, "g2", Decimal("2.00")),
+                apply_batch_async(None, operations, BatchMode.BEST_EFFORT),
+                deposit_async(None, "g2", Decimal("3.00")),
+            )
+        finally:
+            await group_commit.stop_group_commit()
+
+    _, batch, _ = asyncio.run(scenario())
+
+    assert [item.status for item in batch.results] == ["ok", "error"]
+    assert db_session.get(Client, "g2").balance == Decimal("11.00")
+
+
+def test_writes_run_between_batch_chunks(test_db, db_session):
+    create_client(db_session, "g4", "Gwen", "G", "gwen@example.com", Decimal("10.00"))
+    db_session.close()
+    operations = [
+        BatchOperation(op="deposit", client_id="g4", amount=Decimal("1.00")),
+        BatchOperation(op="deposit", client_id="g4", amount=Decimal("1.00")),
+    ]
+
+    async def scenario():
+        await group_commit.start_group_commit(test_db["AsyncSessionLocal"], 5, 64)
+        try:
+            return await asyncio.gather(
+                apply_batch_async(None, operations, BatchMode.ATOMIC, 1),
+                deposit_async(None, "g4", Decimal("5.00")),
+            )
+        finally:
+            await group_commit.stop_group_commit()
+
+    batch, _ = asyncio.run(scenario())
+
+    # The deposit was queued behind the first chunk and ahead of the second.
+    assert [item.balance for item in batch.results] == [
+        Decimal("11.00"),
+        Decimal("17.00"),
+    ]
+
+
+def test_read_only_engine_rejects_writes(test_db):
+    url = f"sqlite:///{test_db['path']}"
+
+    async def scenario():
+        engine = make_async_engine(url, "legacy", read_only=True, poolclass=NullPool)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT count(*) FROM clients"))
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("DELETE FROM clients"))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
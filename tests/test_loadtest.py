@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import httpx
+
+from app.main import app
+from loadtest.runner import RequestSpec, Scenario, percentile, run_scenario
+
+
+def test_percentile_nearest_rank():
+    values = [float(x) for x in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_scenario_files_load():
+    scenario = Scenario.load("loadtest/scenarios/transfer_heavy.json")
+    assert scenario.clients == 200
+    assert {spec.name for spec in scenario.requests} >= {"transfer", "deposit"}
+
+
+def test_run_scenario_reports_per_endpoint(client):
+    scenario = Scenario(
+        name="smoke",
+        duration_seconds=0.5,
+        concurrency=4,
+        clients=5,
+        managers=1,
+        requests=[
+            RequestSpec(
+                "deposit",
+                "POST",
+                "/clients/{client}/deposit",
+                3,
+                {"amount": "{amount}"},
+            ),
+            RequestSpec(
+                "transfer",
+                "POST",
+                "/clients/{client}/{receiver}/transfer",
+                1,
+                {"amount": "{amount}"},
+            ),
+            RequestSpec("managers", "GET", "/managers/managers"),
+        ],
+    )
+    transport = httpx.ASGITransport(app=app)
+    report = asyncio.run(run_scenario(scenario, "http://test", transport))
+
+    assert report["total"]["requests"] > 0
+    assert report["total"]["errors"] == 0
+    assert set(report["endpoints"]) <= {"deposit", "transfer", "managers"}
+    deposit = report["endpoints"]["deposit"]
+    assert deposit["status_counts"] == {"200": deposit["requests"]}
+    assert deposit["p50_ms"] <= deposit["p95_ms"] <= deposit["p99_ms"]
+    json.dumps(report)
+
+    # Setup is idempotent, so a second run against the same data works.
+    scenario.duration_seconds = 0.1
+    assert (
+        asyncio.run(run_scenario(scenario, "http://test", transport))["total"]["errors"]
+        == 0
+    )
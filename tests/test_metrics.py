@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client import REGISTRY
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_reports_requests_and_ledger_counters(client, add_client):
+    before = {
+        op: _value("bank_ledger_operations_total", operation=op)
+        for op in ("deposit", "withdrawal", "transfer", "reversal")
+    }
+    insufficient = _value("bank_insufficient_funds_total")
+    deposits_observed = _value(
+        "bank_http_request_duration_seconds_count",
+        method="POST",
+        route="/clients/{client_id}/deposit",
+        status="200",
+    )
+
+    add_client("me1")
+    add_client("me2", "0.00")
+    client.post("/clients/me1/deposit", params={"amount": "1.00"})
+    client.post("/clients/me1/me2/transfer", params={"amount": "2.00"})
+    assert (
+        client.post("/clients/me2/me1/transfer", params={"amount": "9.00"}).status_code
+        == 400
+    )
+    assert (
+        client.post("/clients/me2/withdrawal", params={"amount": "9.00"}).status_code
+        == 400
+    )
+    tx_id = client.get("/clients/me1/transactions").json()[1]["transaction_id"]
+    client.post(f"/transactions/transactions/{tx_id}/reverse")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "bank_http_requests_in_flight" in r.text
+    assert "bank_db_commit_seconds_bucket" in r.text
+    assert "bank_db_connection_acquire_seconds_count" in r.text
+
+    deltas = {
+        op: _value("bank_ledger_operations_total", operation=op) - count
+        for op, count in before.items()
+    }
+    assert deltas == {"deposit": 2, "withdrawal": 0, "transfer": 1, "reversal": 1}
+    assert _value("bank_insufficient_funds_total") - insufficient == 2
+    assert (
+        _value(
+            "bank_http_request_duration_seconds_count",
+            method="POST",
+            route="/clients/{client_id}/deposit",
+            status="200",
+        )
+        == deposits_observed + 1
+    )
+
+
+WORKER = """
+from app.core import metrics
+metrics.LEDGER_OPERATIONS.labels("deposit").inc(3)
+metrics.REQUEST_LATENCY.labels("GET", "/", "200").observe(0.01)
+"""
+
+SCRAPE = """
+from app.core import metrics
+body, _ = metrics.render_metrics()
+print(body.decode())
+"""
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", WORKER], env=env, check=True)
+    out = subprocess.run(
+        [sys.executable, "-c", SCRAPE],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert 'bank_ledger_operations_total{operation="deposit"} 6.0' in out
+    assert (
+        'bank_http_request_duration_seconds_count{method="GET",route="/",status="200"} 2.0'
+        in out
+    )
@@ -0,0 +1,185 @@
+import asyncio
+from decimal import Decimal
+
+from app.core import group_commit
+from app.services import payroll_service
+from app.services.client_service import create_client
+
+CSV_HEADERS = {"Content-Type": "text/csv"}
+
+
+def _payroll(client, sender, body, **params):
+    return client.post(
+        f"/clients/{sender}/payroll",
+        content=body.encode(),
+        params=params,
+        headers=CSV_HEADERS,
+    )
+
+
+def _balance(client, client_id):
+    r = client.get(f"/clients/{client_id}/personal_data")
+    return Decimal(str(r.json()["balance"]))
+
+
+def test_payroll_pays_every_row_in_chunks(client, add_client):
+    add_client("acme", "1000")
+    for i in range(5):
+        add_client(f"emp{i}", "0")
+    client.get("/clients/emp0/personal_data")  # cached reads must be invalidated
+
+    rows = [f"emp{i},{i + 1}0.25" for i in range(5)] + ["emp0,5.00"]
+    body = "receiver_id,amount\r\n" + "\r\n".join(rows) + "\r\n"
+    r = _payroll(client, "acme", body, reference="2026-10", chunk_size=2)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["status"] == "completed"
+    assert data["rows"] == data["processed_rows"] == 6
+    assert Decimal(str(data["total_amount"])) == Decimal("156.25")
+    assert Decimal(str(data["sender_balance"])) == Decimal("843.75")
+
+    assert _balance(client, "acme") == Decimal("843.75")
+    assert _balance(client, "emp0") == Decimal("15.25")
+    assert _balance(client, "emp4") == Decimal("50.25")
+    history = client.get("/clients/acme/transactions").json()
+    assert sorted(t["type"] for t in history) == ["deposit"] + ["transfer_out"] * 6
+    rollups = client.get("/clients/emp0/rollups/daily").json()
+    assert rollups[0]["counts"]["transfer_in"] == 2
+
+    # The same upload again pays nothing.
+    again = _payroll(client, "acme", body, reference="2026-10").json()
+    assert again["status"] == "completed"
+    assert again["detail"] == "Payroll run was already completed"
+    assert _balance(client, "acme") == Decimal("843.75")
+
+    other = _payroll(
+        client, "acme", "receiver_id,amount\nemp1,1\n", reference="2026-10"
+    )
+    assert other.status_code == 400
+
+
+def test_payroll_rejects_invalid_file_without_paying(client, add_client):
+    add_client("acme", "100")
+    add_client("emp", "0")
+
+    body = "\n".join(
+        [
+            "amount,receiver_id",
+            "10,emp",
+            "5,ghost",
+            "-1,emp",
+            "1.001,emp",
+            "3,acme",
+            "7",
+        ]
+    )
+    data = _payroll(client, "acme", body, reference="bad").json()
+    assert data["status"] == "rejected"
+    assert data["run_id"] is None
+    assert [(e["line"], e["detail"]) for e in data["errors"]] == [
+        (3, "Receiver not found"),
+        (4, "Amount must be positive"),
+        (5, "Amount must have at most two decimal places"),
+        (6, "Receiver cannot be the sender"),
+        (7, "Expected 2 fields"),
+    ]
+
+    data = _payroll(client, "acme", "receiver_id,amount\nemp,100.01\n", reference="big")
+    data = data.json()
+    assert data["status"] == "rejected"
+    assert data["detail"] == "Insufficient funds for payroll"
+    assert _balance(client, "acme") == Decimal("100.00")
+    assert _balance(client, "emp") == Decimal("0.00")
+
+    r = _payroll(client, "acme", "name,amount\nemp,1\n", reference="header")
+    assert r.status_code == 400
+
+
+def test_interrupted_payroll_resumes_from_checkpoint(client, add_client, monkeypatch):
+    add_client("acme", "100")
+    for i in range(4):
+        add_client(f"emp{i}", "0")
+    body = "receiver_id,amount\n" + "\n".join(f"emp{i},10" for i in range(4))
+
+    pay_chunk = payroll_service._pay_chunk
+    calls = []
+
+    def failing_pay_chunk(db, run, chunk):
+        calls.append(chunk)
+        if len(calls) == 2:
+            raise ValueError("Insufficient funds")
+        return pay_chunk(db, run, chunk)
+
+    monkeypatch.setattr(payroll_service, "_pay_chunk", failing_pay_chunk)
+    data = _payroll(client, "acme", body, reference="oct", chunk_size=2).json()
+    assert data["status"] == "interrupted"
+    assert data["detail"] == "Insufficient funds"
+    assert data["processed_rows"] == 2
+    assert Decimal(str(data["paid_amount"])) == Decimal("20.00")
+    assert _balance(client, "acme") == Decimal("80.00")
+    assert _balance(client, "emp2") == Decimal("0.00")
+
+    monkeypatch.setattr(payroll_service, "_pay_chunk", pay_chunk)
+    data = _payroll(client, "acme", body, reference="oct", chunk_size=2).json()
+    assert data["status"] == "completed"
+    assert data["run_id"] is not None
+    assert data["resumed_from_row"] == 2
+    assert data["processed_rows"] == 4
+    assert _balance(client, "acme") == Decimal("60.00")
+    assert [_balance(client, f"emp{i}") for i in range(4)] == [Decimal("10.00")] * 4
+    history = client.get("/clients/acme/transactions").json()
+    assert [t["type"] for t in history].count("transfer_out") == 4
+
+
+def test_writes_run_between_payroll_chunks(test_db, db_session, monkeypatch):
+    create_client(db_session, "acme", "Acme", "Co", "acme@example.com", Decimal("100"))
+    for i in range(3):
+        create_client(
+            db_session, f"emp{i}", "Emp", "E", f"emp{i}@example.com", Decimal("0.00")
+        )
+    db_session.close()
+    body = b"receiver_id,amount\n" + b"".join(b"emp%d,1\n" % i for i in range(3))
+
+    order = []
+    pay_chunk = payroll_service._pay_chunk
+
+    def logged_pay_chunk(db, run, chunk):
+        order.append("chunk")
+        if len(order) == 1:
+            committer = group_commit.get_group_committer()
+            asyncio.ensure_future(committer.submit(lambda db: order.append("other")))
+        return pay_chunk(db, run, chunk)
+
+    async def upload():
+        yield body
+
+    async def scenario():
+        await group_commit.start_group_commit(test_db["AsyncSessionLocal"], 0, 64)
+        try:
+            async with test_db["AsyncSessionLocal"]() as db:
+                return await payroll_service.run_payroll_async(
+                    db, "acme", "nov", upload(), chunk_size=1
+                )
+        finally:
+            await group_commit.stop_group_commit()
+
+    monkeypatch.setattr(payroll_service, "_pay_chunk", logged_pay_chunk)
+    report = asyncio.run(scenario())
+
+    assert report["status"] == "completed"
+    assert order == ["chunk", "other", "chunk", "chunk"]
+
+
+def test_payroll_chunk_size_is_validated(client, add_client):
+    add_client("acme", "10")
+    r = _payroll(
+        client,
+        "acme",
+        "receiver_id,amount\n",
+        reference="x",
+        chunk_size=payroll_service.MAX_CHUNK_SIZE + 1,
+    )
+    assert r.status_code == 400
+    r = _payroll(client, "acme", "receiver_id,amount\n", reference="x")
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Payroll file has no rows"
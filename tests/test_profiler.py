@@ -0,0 +1,41 @@
+import logging
+
+from app.core import profiler
+
+
+def test_debug_headers_count_request_queries(client, add_client, monkeypatch):
+    add_client("pf1")
+    add_client("pf2")
+
+    r = client.post("/clients/pf1/pf2/transfer", params={"amount": "1.00"})
+    assert "X-DB-Queries" not in r.headers
+
+    monkeypatch.setattr(profiler, "DEBUG", True)
+    r = client.post("/clients/pf1/pf2/transfer", params={"amount": "1.00"})
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) > 0
+    assert float(r.headers["X-DB-Time-Ms"]) > 0
+    assert r.headers["X-DB-Repeated-Statements"] == "0"
+
+
+def test_slow_queries_are_logged_with_params(client, add_client, monkeypatch, caplog):
+    add_client("pf3")
+    monkeypatch.setattr(profiler, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        client.get("/clients/pf3/personal_data")
+    assert any("Slow query" in m and "pf3" in m for m in caplog.messages)
+
+
+def test_repeated_statements_are_flagged(caplog):
+    with profiler.profile_queries() as stats:
+        for i in range(profiler.N_PLUS_ONE_THRESHOLD):
+            stats.record("SELECT * FROM clients WHERE id = ?", 0.001)
+        stats.record("SELECT 1", 0.001)
+    assert profiler.current_stats() is None
+    assert stats.repeated() == {
+        "SELECT * FROM clients WHERE id = ?": profiler.N_PLUS_ONE_THRESHOLD
+    }
+
+    with caplog.at_level(logging.WARNING, logger="uvicorn.error"):
+        profiler.report_request("GET", "/clients/clients", stats)
+    assert "possible N+1" in caplog.text
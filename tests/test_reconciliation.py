@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from app.models.client import Client
+from app.services.reconciliation_service import client_ranges, run_reconciliation
+
+
+def _seed(client, count):
+    for i in range(count):
+        client.post(
+            "/clients/add",
+            params={
+                "id": f"rc{i:02d}",
+                "name": "R",
+                "surname": "C",
+                "email": f"rc{i}@example.com",
+                "balance": "50.00",
+            },
+        )
+    client.post("/clients/rc00/rc01/transfer", params={"amount": "12.34"})
+    client.post("/clients/rc02/withdrawal", params={"amount": "0.10"})
+
+
+def test_client_ranges_cover_every_client(client, db_session):
+    _seed(client, 10)
+    ranges = client_ranges(db_session, 3)
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    assert [hi for _, hi in ranges[:-1]] == [lo for lo, _ in ranges[1:]]
+    assert len(ranges) == 3
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reconciliation_reports_mismatches(client, db_session, test_db, workers):
+    _seed(client, 10)
+    url = f"sqlite:///{test_db['path']}"
+
+    report = run_reconciliation(url, partitions=4, workers=workers)
+    assert report["clients"] == 10
+    assert report["transactions"] == 13
+    assert report["mismatch_count"] == 0
+
+    db_session.execute(
+        update(Client).where(Client.id == "rc07").values(_balance=Decimal("49.00"))
+    )
+    db_session.commit()
+
+    report = run_reconciliation(url, partitions=4, workers=workers)
+    assert report["mismatches"] == [
+        {
+            "client_id": "rc07",
+            "balance": "49.00",
+            "expected": "50.00",
+            "difference": "-1.00",
+        }
+    ]
@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from app.schemas.client import ClientOut
+
+CLIENT_FIELDS = {"id", "name", "surname", "email", "role", "created_at", "balance"}
+TRANSACTION_FIELDS = {
+    "transaction_id",
+    "client_id",
+    "type",
+    "amount",
+    "timestamp",
+    "transfer_group_id",
+    "is_reversed",
+    "reversal_of_id",
+    "reversed_by_id",
+}
+
+
+def test_client_responses_expose_balance_only(client, add_client):
+    assert set(add_client("rm1", "10.00").json()) == CLIENT_FIELDS
+
+    data = client.post("/clients/rm1/deposit", params={"amount": "2.50"}).json()
+    assert set(data) == CLIENT_FIELDS
+    assert data["balance"] == 12.5
+    assert data["role"] == "client"
+
+    data = client.get("/clients/rm1/personal_data").json()
+    assert "_balance" not in data and "version_id" not in data
+
+    (listed,) = client.get("/clients/clients").json()
+    assert listed == data
+
+
+def test_list_responses_are_built_from_rows(client, add_client):
+    add_client("rm2", "5.00")
+    add_client("rm3", "0.00")
+    client.post("/clients/rm2/rm3/transfer", params={"amount": "1.00"})
+
+    txs = client.get("/clients/rm2/transactions").json()
+    assert [t["type"] for t in txs] == ["deposit", "transfer_out"]
+    assert all(set(t) == TRANSACTION_FIELDS for t in txs)
+    assert len(client.get("/transactions/transactions").json()) == 3
+
+    persons = client.get("/persons/persons").json()
+    assert [p["id"] for p in persons] == ["rm2", "rm3"]
+    assert all("balance" not in p for p in persons)
+
+
+def test_client_out_accepts_group_commit_snapshots():
+    snapshot = {
+        "id": "rm4",
+        "name": "Resp",
+        "surname": "rm4",
+        "email": None,
+        "role": "client",
+        "created_at": None,
+        "_balance": Decimal("3.10"),
+        "version_id": 2,
+    }
+    assert ClientOut.model_validate(snapshot).balance == Decimal("3.10")
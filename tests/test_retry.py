@@ -0,0 +1,77 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.retry import (
+    get_conflict_metrics,
+    reset_conflict_metrics,
+    retry_on_conflict,
+)
+from app.models.client import Client
+from app.services.client_service import create_client, deposit
+
+
+class _FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _FakeAsyncSession(_FakeSession):
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def test_retry_recovers_from_stale_data():
+    reset_conflict_metrics()
+    retries = REGISTRY.get_sample_value(
+        "bank_version_conflicts_total", {"outcome": "retries"}
+    )
+    calls = []
+
+    @retry_on_conflict(base_delay=0)
+    def flaky(db):
+        calls.append(1)
+        if len(calls) < 3:
+            raise StaleDataError("conflict")
+        return "ok"
+
+    db = _FakeSession()
+    assert flaky(db) == "ok"
+    assert db.rollbacks == 2
+    assert get_conflict_metrics() == {"conflicts": 2, "retries": 2, "exhausted": 0}
+    assert (
+        REGISTRY.get_sample_value(
+            "bank_version_conflicts_total", {"outcome": "retries"}
+        )
+        == retries + 2
+    )
+
+
+def test_retry_gives_up_with_409():
+    reset_conflict_metrics()
+
+    @retry_on_conflict(attempts=3, base_delay=0)
+    async def always_stale(db):
+        raise StaleDataError("conflict")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(always_stale(_FakeAsyncSession()))
+
+    assert exc.value.status_code == 409
+    assert get_conflict_metrics() == {"conflicts": 3, "retries": 2, "exhausted": 1}
+
+
+def test_ledger_updates_bump_client_version(db_session):
+    create_client(db_session, "v1", "Vic", "V", "vic@example.com", Decimal("5.00"))
+    version = db_session.get(Client, "v1").version_id
+
+    deposit(db_session, "v1", Decimal("1.00"))
+
+    assert db_session.get(Client, "v1").version_id == version + 1
@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models.daily_rollup import DailyRollup
+from app.services.rollup_service import rebuild_rollups
+
+
+def _rollup_rows(db):
+    rows = db.execute(select(DailyRollup)).scalars().all()
+    return sorted(
+        (r.client_id, r.day, r.type, Decimal(str(r.amount)), r.count) for r in rows
+    )
+
+
+def test_rollups_track_writes_and_match_backfill(client, add_client, db_session):
+    add_client("ro1", "100.00")
+    add_client("ro2", "0.00")
+    client.post("/clients/ro1/deposit", params={"amount": "0.10"})
+    client.post("/clients/ro1/withdrawal", params={"amount": "20.00"})
+    client.post("/clients/ro1/ro2/transfer", params={"amount": "30.00"})
+
+    withdrawal_id = next(
+        t["transaction_id"]
+        for t in client.get("/clients/ro1/transactions").json()
+        if t["type"] == "withdrawal"
+    )
+    r = client.post(f"/transactions/transactions/{withdrawal_id}/reverse")
+    assert r.status_code == 200
+
+    incremental = _rollup_rows(db_session)
+    assert rebuild_rollups(db_session) == len(incremental)
+    db_session.expire_all()
+    assert _rollup_rows(db_session) == incremental
+
+    today = date.today()
+    assert ("ro1", today, "deposit", Decimal("120.10"), 3) in incremental
+    assert ("ro2", today, "transfer_in", Decimal("30.00"), 1) in incremental
+
+
+def test_daily_rollup_endpoints(client, add_client):
+    add_client("ro3", "50.00")
+    add_client("ro4", "5.00")
+    client.post("/clients/ro3/ro4/transfer", params={"amount": "10.00"})
+
+    r = client.get("/clients/ro3/rollups/daily")
+    assert r.status_code == 200
+    (bucket,) = r.json()
+    assert bucket["day"] == date.today().isoformat()
+    assert bucket["counts"] == {
+        "deposit": 1,
+        "withdrawal": 0,
+        "transfer_in": 0,
+        "transfer_out": 1,
+    }
+    assert Decimal(str(bucket["net"])) == Decimal("40.00")
+
+    r = client.get("/transactions/rollups/daily", params={"type": "deposit"})
+    (bucket,) = r.json()
+    assert bucket["client_id"] is None
+    assert Decimal(str(bucket["amounts"]["deposit"])) == Decimal("55.00")
+    assert bucket["transaction_count"] == 2
+
+    assert client.get("/clients/ghost/rollups/daily").status_code == 400
+    r = client.get("/transactions/rollups/daily", params={"type": "bogus"})
+    assert r.status_code == 400
+
+
+def test_deleting_client_drops_rollups(client, add_client, db_session):
+    add_client("ro5", "1.00")
+    assert client.delete("/clients/delete/ro5").status_code == 200
+    rows = db_session.execute(
+        select(DailyRollup).where(DailyRollup.client_id == "ro5")
+    ).all()
+    assert rows == []
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.core.database import Base
+from app.models.daily_rollup import DailyRollup
+from app.models.manager import Manager
+from app.models.transaction import TRANSACTION_COLUMNS, Transaction
+from app.services.reconciliation_service import reconcile_range
+from app.services.seed_service import SeedConfig, generate
+
+
+def _config(**overrides):
+    config = dict(
+        clients=50,
+        managers=3,
+        transactions=3_000,
+        seed=11,
+        mix={"deposit": 20, "withdrawal": 10, "transfer": 40, "reversal": 30},
+        chunk_size=500,
+    )
+    config.update(overrides)
+    return SeedConfig(**config)
+
+
+def test_seeded_history_is_consistent(test_db, db_session):
+    report = generate(test_db["engine"], _config())
+
+    assert report["transactions"] >= 3_000
+    assert db_session.scalar(select(func.count()).select_from(Manager)) == 3
+    assert reconcile_range(db_session, None, None)["mismatches"] == []
+    assert db_session.scalar(select(func.sum(DailyRollup.count))) == (
+        report["transactions"]
+    )
+
+    groups = db_session.execute(
+        select(
+            Transaction.transfer_group_id,
+            func.count(),
+            func.group_concat(Transaction.type),
+        )
+        .where(Transaction.transfer_group_id.is_not(None))
+        .group_by(Transaction.transfer_group_id)
+    ).all()
+    assert groups
+    for _, count, types in groups:
+        assert count == 2
+        assert sorted(types.split(",")) == ["transfer_in", "transfer_out"]
+
+    reversals = db_session.scalars(
+        select(Transaction).where(Transaction.reversal_of_id.is_not(None))
+    ).all()
+    assert reversals
+    for reversal in reversals:
+        original = db_session.get(Transaction, reversal.reversal_of_id)
+        assert original.is_reversed
+        assert original.reversed_by_id == reversal.transaction_id
+        assert original.amount == reversal.amount
+    # Some reversals were reversed again.
+    assert any(reversal.is_reversed for reversal in reversals)
+
+
+def test_same_seed_produces_same_history(test_db, db_session, tmp_path):
+    generate(test_db["engine"], _config(), derive=False)
+
+    other = create_engine(f"sqlite:///{tmp_path / 'other.sqlite3'}")
+    Base.metadata.create_all(bind=other)
+    try:
+        generate(other, _config(), derive=False)
+        stmt = select(*TRANSACTION_COLUMNS[:5]).order_by(Transaction.transaction_id)
+        with other.connect() as conn:
+            assert conn.execute(stmt).all() == db_session.execute(stmt).all()
+    finally:
+        other.dispose()
+
+
+def test_existing_prefix_is_rejected(test_db):
+    generate(test_db["engine"], _config(transactions=100), derive=False)
+
+    with pytest.raises(ValueError, match="already exist"):
+        generate(test_db["engine"], _config(transactions=100), derive=False)
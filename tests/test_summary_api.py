@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+from app.models.client import Client
+from app.services.summary_service import client_summary, summarize_transactions
+
+
+def test_client_summary_endpoint(client, add_client):
+    add_client("su1", "100.00")
+    add_client("su2", "0.00")
+    client.post("/clients/su1/withdrawal", params={"amount": "10.50"})
+    client.post("/clients/su1/su2/transfer", params={"amount": "20.00"})
+    client.post("/clients/su2/su1/transfer", params={"amount": "5.00"})
+
+    r = client.get("/clients/su1/summary")
+    assert r.status_code == 200
+    data = r.json()
+    assert Decimal(str(data["total_in"])) == Decimal("105.00")
+    assert Decimal(str(data["total_out"])) == Decimal("30.50")
+    assert Decimal(str(data["net"])) == Decimal("74.50")
+    assert data["counts"] == {
+        "deposit": 1,
+        "withdrawal": 1,
+        "transfer_in": 1,
+        "transfer_out": 1,
+    }
+    assert data["transaction_count"] == 4
+    assert data["last_activity"] is not None
+
+    assert client.get("/clients/ghost/summary").status_code == 400
+
+
+def test_all_client_summaries(client, add_client):
+    add_client("su3", "7.00")
+    add_client("su4", "0.00")
+
+    data = {s["client_id"]: s for s in client.get("/clients/summaries").json()}
+    assert Decimal(str(data["su3"]["net"])) == Decimal("7.00")
+    assert data["su4"]["transaction_count"] == 0
+    assert data["su4"]["last_activity"] is None
+
+
+def test_sql_summary_matches_python_summary(client, add_client, db_session):
+    add_client("su5", "12.30")
+    client.post("/clients/su5/deposit", params={"amount": "0.10"})
+    client.post("/clients/su5/withdrawal", params={"amount": "2.20"})
+
+    sql = client_summary(db_session, "su5")
+    py = summarize_transactions("su5", db_session.get(Client, "su5").transactions)
+    assert sql == py
+    assert sql["net"] == Decimal("10.20")
+
+
+def test_statement_pdf_still_renders(client, add_client):
+    add_client("su6", "3.00")
+    r = client.get("/clients/su6/statement")
+    assert r.status_code == 200
+    assert r.content.startswith(b"%PDF")
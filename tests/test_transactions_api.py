@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+
+def _collect(client, url, params):
+    ids, cursor = [], None
+    while True:
+        page_params = dict(params)
+        if cursor:
+            page_params["cursor"] = cursor
+        r = client.get(url, params=page_params)
+        assert r.status_code == 200
+        data = r.json()
+        ids.extend(item["transaction_id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def test_transactions_page_walks_whole_ledger(client, add_client):
+    add_client("p1", "100.00")
+    for i in range(1, 8):
+        client.post("/clients/p1/deposit", params={"amount": str(i)})
+
+    ids = _collect(client, "/transactions/page", {"limit": 3})
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 8
+
+    ids_asc = _collect(client, "/transactions/page", {"limit": 3, "sort_desc": False})
+    assert ids_asc == sorted(ids)
+
+
+def test_transactions_page_filters(client, add_client):
+    add_client("p2", "50.00")
+    add_client("p3", "0.00")
+    client.post("/clients/p2/withdrawal", params={"amount": "5.00"})
+    client.post("/clients/p2/p3/transfer", params={"amount": "20.00"})
+    client.post("/clients/p3/deposit", params={"amount": "1.00"})
+
+    r = client.get(
+        "/transactions/page",
+        params={"type": ["deposit", "withdrawal"], "amount_min": "2", "limit": 10},
+    )
+    items = r.json()["items"]
+    assert {(t["client_id"], t["type"]) for t in items} == {
+        ("p2", "deposit"),
+        ("p2", "withdrawal"),
+    }
+
+    r = client.get("/clients/p3/transactions/page")
+    assert [t["type"] for t in r.json()["items"]] == ["deposit", "transfer_in"]
+
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    r = client.get("/transactions/page", params={"date_from": tomorrow})
+    assert r.json() == {"items": [], "next_cursor": None}
+
+    r = client.get("/transactions/page", params={"is_reversed": True})
+    assert r.json()["items"] == []
+
+
+def test_transactions_page_rejects_bad_input(client):
+    assert (
+        client.get("/transactions/page", params={"cursor": "nope"}).status_code == 400
+    )
+    assert client.get("/transactions/page", params={"limit": 0}).status_code == 400
+    r = client.get("/transactions/page", params={"type": "refund"})
+    assert r.status_code == 400
+    assert client.get("/clients/ghost/transactions/page").status_code == 400